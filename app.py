@@ -1,10 +1,23 @@
+import os
+from contextlib import nullcontext
 import pandas as pd
 import streamlit as st
-import yfinance as yf
-import plotly.express as px
-import plotly.graph_objects as go
-import seaborn as sns
-from datetime import datetime, timedelta
+from core.backtest import FEE_BELI, FEE_JUAL, LOT, MODAL, MA_PERIODS as MA_BACKTEST
+from core.dataset import Dataset
+from core.dividends import STATISTIK, rebase, ringkasan_dividen
+from core.figure_cache import DEFAULT_MAX_BYTES as FIGURE_MAX_BYTES, DEFAULT_ROOT as FIGURE_ROOT, CachedFigure, FigureCache
+from core.live import (DEFAULT_CAPACITY as LIVE_CAPACITY, INTERVALS as LIVE_INTERVALS, LiveChart, LiveStream,
+                       replay_feed, yahoo_intraday_feed)
+from core.downsample import RESOLUSI, lttb, lttb_long, ohlc_buckets, sum_buckets, target_points
+from core.loader import MODE_THREAD
+from core.panel import FILL_FFILL
+from core.periode import PRESET, filter_tahun, rentang_periode, rentang_tahun
+from core.profiler import MESIN_PROFIL, PROFILER, jsonl_sink, prometheus_sink, pyinstrument_tersedia, span
+from core.quotes import QuoteService
+from core.rollup import NAMA_LEVEL, choose_level
+from core.statistik import ringkasan_emiten, ringkasan_harga
+from core.updater import HistoryUpdater
+from core.warmup import CacheWarmer
 
 st.set_page_config(page_title="Analisis Perbandingan Saham", page_icon="📈", layout="wide")
 
@@ -61,162 +74,232 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=300)  # Cache selama 5 menit
-def get_real_time_data(ticker):
-    """Mengambil data saham real-time dari Yahoo Finance"""
-    try:
-        stock = yf.Ticker(f"{ticker}.JK")  # Menambahkan .JK untuk saham Indonesia
-        
-        # Ambil data hari ini untuk harga terkini dan range harian
-        hist_day = stock.history(period='1d')
-        
-        # Ambil data 1 bulan untuk menghitung perubahan
-        hist_month = stock.history(period='1mo')
-        
-        if not hist_day.empty and not hist_month.empty:
-            current_price = hist_day['Close'].iloc[-1]
-            
-            # Ambil harga awal bulan untuk perhitungan perubahan
-            month_start_price = hist_month['Close'].iloc[0]
-            monthly_change = ((current_price - month_start_price) / month_start_price) * 100
-            
-            return {
-                'harga': current_price,
-                'perubahan': monthly_change,  # Perubahan dari awal bulan
-                'volume': hist_day['Volume'].iloc[-1],
-                'tertinggi': hist_day['High'].iloc[-1],  # menggunakan harga tertinggi hari ini
-                'terendah': hist_day['Low'].iloc[-1],    # menggunakan harga terendah hari ini
-                'sukses': True
-            }
-        
-        return {
-            'sukses': False,
-            'pesan': 'Data tidak tersedia'
-        }
-        
-    except Exception as e:
-        return {
-            'sukses': False,
-            'pesan': f"Gagal mengambil data untuk {ticker}: {str(e)}"
-        }
-
 # Fungsi helper untuk memformat angka ke format Rupiah
 def format_rupiah(value):
     return f"Rp {value:,.2f}"
 
-@st.cache_data
-def get_data_from_csv(nama):
-    """Membaca data dari file CSV"""
-    return pd.read_csv(nama)
-    
-def hitung_perubahan_harga(df, periode='D'):
+
+@st.cache_resource
+def get_dataset():
+    """
+    Dataset emiten dari registry (emiten.csv) dengan cache komputasi bersama untuk semua sesi
+
+    Pool pemuat paralel bisa diatur lewat environment variable LOADER_MODE
+    ('thread' atau 'process') dan LOADER_WORKERS.
+    """
+    workers = os.environ.get('LOADER_WORKERS')
+    return Dataset(workers=int(workers) if workers else None, mode=os.environ.get('LOADER_MODE', MODE_THREAD))
+
+@st.cache_resource
+def get_quote_service():
+    """Layanan harga real-time dengan cache TTL yang dipakai bersama semua sesi"""
+    return QuoteService(month_start_price=get_dataset().month_start_price)
+
+@st.cache_resource
+def get_figure_cache():
+    """
+    Cache JSON figure Plotly di disk yang dipakai bersama semua sesi
+
+    Lokasi dan batas ukurannya bisa diatur lewat environment variable
+    FIGURE_CACHE_DIR dan FIGURE_CACHE_MB.
+    """
+    mb = os.environ.get('FIGURE_CACHE_MB')
+    return FigureCache(os.environ.get('FIGURE_CACHE_DIR', FIGURE_ROOT),
+                       int(mb) * 1024 * 1024 if mb else FIGURE_MAX_BYTES)
+
+@st.cache_resource
+def get_live_stream(interval):
+    """
+    Stream bar intraday semua emiten (sekali per proses per interval), dipakai bersama semua sesi
+
+    Feed bawaan adalah Yahoo Finance; untuk pengujian offline, LIVE_REPLAY
+    berisi file CSV bar yang diputar ulang (LIVE_REPLAY_BARS bar per poll).
+    Kapasitas buffer dan jarak antar poll bisa diatur dengan LIVE_CAPACITY dan
+    LIVE_REFRESH (detik).
+    """
+    replay = os.environ.get('LIVE_REPLAY')
+    feed = replay_feed(replay, int(os.environ.get('LIVE_REPLAY_BARS', 1))) if replay else yahoo_intraday_feed(interval)
+    return LiveStream(feed, get_dataset().tickers, capacity=int(os.environ.get('LIVE_CAPACITY', LIVE_CAPACITY)),
+                      refresh=float(os.environ.get('LIVE_REFRESH', LIVE_INTERVALS[interval])))
+
+@st.cache_resource
+def get_cache_warmer():
+    """Worker background (sekali per proses) yang menghangatkan cache semua emiten dan periode preset"""
+    warmer = CacheWarmer(get_dataset())
+    warmer.start()
+    return warmer
+
+@st.cache_resource
+def get_profiler():
+    """
+    Profiler proses (span dari modul core dan dari dashboard)
+
+    Rekaman setiap rerun bisa diekspor terus-menerus lewat environment variable
+    PROFILER_JSONL (file JSONL, satu baris per rerun) dan PROFILER_PROM (file
+    teks Prometheus untuk textfile collector).
+    """
+    if os.environ.get('PROFILER_JSONL'):
+        PROFILER.sinks.append(jsonl_sink(os.environ['PROFILER_JSONL']))
+    if os.environ.get('PROFILER_PROM'):
+        PROFILER.sinks.append(prometheus_sink(os.environ['PROFILER_PROM']))
+    return PROFILER
+
+@st.cache_resource
+def start_history_updater():
+    """Updater histori di background (sekali per proses): hanya bar baru yang diambil dan ditambahkan"""
+    ds = get_dataset()
+    updater = HistoryUpdater(ds.store, {kode: ds.price_path(kode) for kode in ds.tickers},
+                             on_update=get_cache_warmer().trigger)
+    updater.start()
+    return updater
+
+HALAMAN_DEBUG = '🛠️ Debug Cache'
+HALAMAN_PERBANDINGAN = 'Comparasi Emiten'
+
+# Di atas jumlah ini, grafik korelasi bergulir hanya menampilkan pasangan satu emiten acuan
+MAKS_EMITEN_PASANGAN = 4
+
+VERSI_GRAFIK = 1  # naikkan jika tampilan grafik yang di-cache berubah agar JSON lama tidak dipakai
+
+
+def kolom_grid(jumlah, per_baris=4):
+    """Kolom-kolom untuk `jumlah` item, per_baris item per baris"""
+    kolom = []
+    for i in range(0, jumlah, per_baris):
+        kolom.extend(st.columns(per_baris)[:min(per_baris, jumlah - i)])
+    return kolom
+
+
+def render_tabs(key, daftar):
     """
-    Menghitung persentase perubahan harga berdasarkan periode yang dipilih
-    
+    Menampilkan tab dan hanya menjalankan isi tab yang sedang dibuka
+
     Parameters:
-    df : DataFrame dengan kolom 'Close' dan 'Date'
-    periode : string, salah satu dari ['D', 'W', 'M', 'Y'] untuk harian, mingguan, bulanan, tahunan
-    
-    Returns:
-    Series dengan persentase perubahan harga
+    key : kunci session state untuk tab yang aktif
+    daftar : list (judul tab, fungsi tanpa argumen yang menggambar isinya)
+
+    Berpindah tab memicu rerun, sehingga tab yang tersembunyi tidak pernah
+    memuat data atau menghitung apa pun.
     """
-    # Buat copy DataFrame dan set index
-    temp_df = df.copy()
-    temp_df.set_index('Date', inplace=True)
-    
-    # Pastikan index sudah dalam format datetime
-    temp_df.index = pd.to_datetime(temp_df.index)
-    
-    if periode == 'D':
-        return temp_df['Close'].pct_change() * 100
-    elif periode == 'W':
-        weekly = temp_df['Close'].resample('W').last()
-        return weekly.pct_change() * 100
-    elif periode == 'M':
-        monthly = temp_df['Close'].resample('M').last()
-        return monthly.pct_change() * 100
-    elif periode == 'Y':
-        yearly = temp_df['Close'].resample('Y').last()
-        return yearly.pct_change() * 100
-
-# Panel samping (Sidebar)
-with st.sidebar:
-    st.title('📊 Panel Kontrol Analisis')
-    st.markdown('---')
-
-    # Filter emiten
-    st.subheader('🏢 Pilihan Emiten')
-    list_emiten = ['Comparasi Emiten','ADRO', 'PTBA', 'ITMG', 'ANTM']
-    selected_option = st.selectbox('Detail Emiten', list_emiten)
-
-
-    # Filter periode waktu
-    st.subheader('⏱️ Periode Analisis')
-    filter_type = st.radio('Jenis Filter', ['Periode Preset', 'Rentang Tanggal Kustom'])
-    
-    if filter_type == 'Periode Preset':
-        date_options = {
-            'Semua Data': 'max',
-            '10 Tahun Terakhir': '10y',
-            '5 Tahun Terakhir': '5y',
-            '3 Tahun Terakhir': '3y',
-            '1 Tahun Terakhir': '1y',
-            '6 Bulan Terakhir': '6mo',
-            '3 Bulan Terakhir': '3mo',
-            '1 Bulan Terakhir': '1mo'
-        }
-        selected_period = st.selectbox('Pilih Periode', list(date_options.keys()))
-        period = date_options[selected_period]
-        custom_date_range = False
-    else:
-        st.markdown("##### Rentang Tanggal")
-        start_date = st.date_input('Mulai', value=pd.Timestamp('2003-01-01'))
-        end_date = st.date_input('Akhir', value=pd.Timestamp.now())
-        
-        if start_date > end_date:
-            st.error('Error: Tanggal akhir harus setelah tanggal mulai')
-            st.stop()
-        period = 'custom'
-        custom_date_range = True
-        selected_period = f"Periode {start_date.strftime('%d-%m-%Y')} hingga {end_date.strftime('%d-%m-%Y')}"
-
-    # Filter tampilan
-    st.subheader('📈 Pengaturan Grafik')
-    show_ma = st.checkbox('Tampilkan Moving Average', value=True)
-    if show_ma:
-        ma_periods = st.multiselect('Periode Moving Average', [5, 20, 50, 200], default=[20, 50])
-    
-    show_volume = st.checkbox('Tampilkan Volume', value=True)
-
-    
-    # Menampilkan metrik real-time untuk setiap saham
-    saham = [
-        ("ADRO", "Adaro Energy"), 
-        ("PTBA", "Bukit Asam"), 
-        ("ITMG", "Indo Tambangraya Megah"),
-        ("ANTM", "Aneka Tambang")
-    ]
-
-# Konten utama
-if selected_option == "Comparasi Emiten":
-    st.markdown("<h1 class='main-header'>📈 Dashboard Analisis Perbandingan Sektor Pertambangan</h1>", unsafe_allow_html=True)
+    tabs = st.tabs([judul for judul, _ in daftar], key=key, on_change='rerun')
+    for tab, (judul, render) in zip(tabs, daftar):
+        if tab.open:
+            with tab, span(f"render/tab {judul}"):
+                render()
 
-    # Menambahkan kartu harga real-time
+
+def tampilkan_grafik(fig, **kwargs):
+    """st.plotly_chart dengan span profiler untuk serialisasi figure"""
+    with span('render/plotly'):
+        st.plotly_chart(fig, **kwargs)
+
+
+def tampilkan_grafik_cache(opsi, kunci, buat, **kwargs):
+    """
+    Menampilkan figure dari buat(); untuk periode preset, JSON figure diambil
+    dari cache disk per (kunci, periode, rentang, resolusi) sehingga figure
+    (dan data grafiknya) hanya dibangun sekali per versi data
+
+    kunci harus memuat semua masukan figure selain periode dan resolusi,
+    termasuk versi data.
+    """
+    if opsi['period'] not in PRESET:
+        tampilkan_grafik(buat(), **kwargs)
+        return
+    kunci = (VERSI_GRAFIK, *kunci, opsi['period'], rentang_periode(opsi['period']), opsi['n_titik'])
+    tampilkan_grafik(get_figure_cache().get_or_build(kunci, buat), **kwargs)
+
+
+def pertahankan_widget(*keys, **awal):
+    """
+    Menjaga nilai widget di dalam tab tetap tersimpan saat tabnya ditutup
+
+    Streamlit menghapus state widget yang tidak digambar pada satu rerun;
+    menyalin ulang nilainya ke session state mencegah nilai kembali ke default.
+    Nilai awal widget (`awal`, key=nilai) diisi ke session state sekali saja;
+    widgetnya sendiri tidak boleh memberi index/value/default agar Streamlit
+    tidak memperingatkan nilai ganda.
+    """
+    for key, nilai in awal.items():
+        st.session_state.setdefault(key, nilai)
+    for key in (*keys, *awal):
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+
+def sidebar(ds):
+    """Panel kontrol; mengembalikan pilihan pengguna dalam bentuk dict"""
+    opsi = {'start_date': None, 'end_date': None, 'ma_periods': [], 'perbandingan': ds.tickers}
+    with st.sidebar:
+        st.title('📊 Panel Kontrol Analisis')
+        st.markdown('---')
+
+        # Filter emiten
+        st.subheader('🏢 Pilihan Emiten')
+        list_emiten = [HALAMAN_PERBANDINGAN, *ds.tickers]
+        if st.query_params.get('debug') == '1':
+            # Halaman debug hanya muncul dengan ?debug=1 di URL
+            list_emiten.append(HALAMAN_DEBUG)
+        opsi['emiten'] = st.selectbox('Detail Emiten', list_emiten)
+        if opsi['emiten'] == HALAMAN_PERBANDINGAN and len(ds.tickers) > 1:
+            opsi['perbandingan'] = st.multiselect('Emiten yang Dibandingkan', ds.tickers, default=ds.tickers,
+                                                  format_func=lambda kode: f"{kode} - {ds.name(kode)}")
+
+
+        # Filter periode waktu
+        st.subheader('⏱️ Periode Analisis')
+        filter_type = st.radio('Jenis Filter', ['Periode Preset', 'Rentang Tanggal Kustom'])
+
+        if filter_type == 'Periode Preset':
+            date_options = {
+                'Semua Data': 'max',
+                '10 Tahun Terakhir': '10y',
+                '5 Tahun Terakhir': '5y',
+                '3 Tahun Terakhir': '3y',
+                '1 Tahun Terakhir': '1y',
+                '6 Bulan Terakhir': '6mo',
+                '3 Bulan Terakhir': '3mo',
+                '1 Bulan Terakhir': '1mo'
+            }
+            selected_period = st.selectbox('Pilih Periode', list(date_options.keys()))
+            opsi['period'] = date_options[selected_period]
+        else:
+            st.markdown("##### Rentang Tanggal")
+            start_date = st.date_input('Mulai', value=pd.Timestamp('2003-01-01'))
+            end_date = st.date_input('Akhir', value=pd.Timestamp.now())
+
+            if start_date > end_date:
+                st.error('Error: Tanggal akhir harus setelah tanggal mulai')
+                st.stop()
+            opsi.update(period='custom', start_date=start_date, end_date=end_date)
+            selected_period = f"Periode {start_date.strftime('%d-%m-%Y')} hingga {end_date.strftime('%d-%m-%Y')}"
+        opsi['selected_period'] = selected_period
+
+        # Filter tampilan
+        st.subheader('📈 Pengaturan Grafik')
+        opsi['show_ma'] = st.checkbox('Tampilkan Moving Average', value=True)
+        if opsi['show_ma']:
+            opsi['ma_periods'] = st.multiselect('Periode Moving Average', [5, 20, 50, 200], default=[20, 50])
+
+        opsi['show_volume'] = st.checkbox('Tampilkan Volume', value=True)
+        resolusi = st.selectbox('Resolusi Grafik', list(RESOLUSI), help='Jumlah titik maksimum per garis pada grafik rentang panjang')
+        opsi['n_titik'] = target_points(opsi['period'], RESOLUSI[resolusi])
+    return opsi
+
+
+def render_kartu_harga(ds, tickers):
+    """Kartu harga real-time untuk setiap saham"""
     st.subheader("💰 Harga Saham Real-time")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    # Menampilkan metrik real-time untuk setiap saham
-    saham = [
-        ("ADRO", "Adaro Energy"), 
-        ("PTBA", "Bukit Asam"), 
-        ("ITMG", "Indo Tambangraya Megah"),
-        ("ANTM", "Aneka Tambang")
-    ]
+
+    # Ambil semua kuotasi sekaligus (satu batch, cache bersama)
+    with span('load/quotes'):
+        quotes = get_quote_service().get_quotes(tickers)
 
     # Display metric cards
-    for col, (kode, nama) in zip([col1, col2, col3, col4], saham):
+    for col, kode in zip(kolom_grid(len(tickers)), tickers):
+        nama = ds.name(kode)
         with col:
-            data = get_real_time_data(kode)
+            data = quotes[kode]
             if data['sukses']:
                 warna_perubahan = "green" if data['perubahan'] >= 0 else "red"
                 simbol_perubahan = "▲" if data['perubahan'] >= 0 else "▼"
@@ -255,514 +338,728 @@ if selected_option == "Comparasi Emiten":
     """, unsafe_allow_html=True)
 
 
-    # Tabs untuk analisis berbeda
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 Analisis Harga", "📊 Analisis Volume", "📉 Analisis Korelasi", "💰 Analisis Dividen"])
+def grafik_live(stream, kode, ma_periods):
+    """
+    Isi fragment mode live: hanya bagian ini yang dijalankan ulang secara
+    berkala, bukan seluruh halaman
 
-# Tab Analisis Harga
-    with tab1:
-        try:
-            df_antm = get_data_from_csv("antm_fix.csv")
-            df_itmg = get_data_from_csv("itmg_fix.csv")
-            df_adro = get_data_from_csv("adro_fix.csv")
-            df_ptba = get_data_from_csv("ptba_fix.csv")
-
-            for df in [df_ptba, df_itmg, df_antm, df_adro]:
-                df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_localize(None)
-                df['Date'] = pd.to_datetime(df['Date'])
-
-            # Filter data berdasarkan periode atau rentang tanggal yang dipilih
-            if period == 'custom':
-            # Filter untuk rentang tanggal kustom
-                df_list = [df_ptba, df_itmg, df_antm, df_adro]
-                filtered_dfs = []
-                
-                for df in df_list:
-                    mask = (df['Date'].dt.date >= start_date) & (df['Date'].dt.date <= end_date)
-                    filtered_dfs.append(df[mask])
-                
-                ptba, itmg, antm, adro = filtered_dfs
-            
-            elif period != 'max':
-                # Filter untuk periode preset
-                end_date = pd.Timestamp.now()
-                period_days = {
-                    '10y': 3650,
-                    '5y': 1825,
-                    '3y': 1095,
-                    '1y': 365,
-                    '6mo': 180,
-                    '3mo': 90,
-                    '1mo': 30
-                }
-                start_date = end_date - pd.Timedelta(days=period_days[period])
-                
-                ptba = df_ptba[df_ptba['Date'] >= start_date]
-                itmg = df_itmg[df_itmg['Date'] >= start_date]
-                antm = df_antm[df_antm['Date'] >= start_date]
-                adro = df_adro[df_adro['Date'] >= start_date]
-            else:
-                # Tampilkan semua data
-                ptba, itmg, antm, adro = df_ptba.copy(), df_itmg.copy(), df_antm.copy(), df_adro.copy()
-
-
-            st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            st.subheader('Perbandingan Harga Saham Pertambangan')
-            st.text("Grafik ini membandingkan harga ke-4 saham dalam rentang waktu yang dipilih")
-
-            # Perbandingan harga Close
-            chart_data = pd.DataFrame({
-                'Tanggal': adro['Date'],
-                'PTBA': ptba['Close'],
-                'ITMG': itmg['Close'],
-                'ANTM': antm['Close'],
-                'ADRO': adro['Close']
-            })
-
-            # Tambahkan Moving Average jika dipilih
-            if show_ma:
-                for period in ma_periods:
-                    for col in ['PTBA', 'ITMG', 'ANTM', 'ADRO']:
-                        chart_data[f'{col}_MA{period}'] = chart_data[col].rolling(window=period).mean()
-
-            fig = px.line(chart_data.melt(id_vars=['Tanggal'], var_name='Emiten', value_name='Harga'),
-                         x='Tanggal', y='Harga', color='Emiten',
-                         title=f'Perbandingan Harga Saham ({selected_period})')
-            # Menyesuaikan tampilan grafik
-            fig.update_layout(
-                yaxis_title="Harga (Rp)",
-                xaxis_title="Tanggal",
-                hovermode='x unified',
-                legend=dict(
-                    yanchor="top",
-                    y=0.99,
-                    xanchor="left",
-                    x=0.01
-                )
+    Figure disimpan di session state dan hanya ditambah bar baru sejak
+    pembaruan sebelumnya (LiveChart); tanpa bar baru figure dipakai apa adanya.
+    st.plotly_chart tetap mengirim figure utuh ke browser setiap kali fragment
+    berjalan, karena Streamlit tidak mendukung penambahan titik parsial.
+    """
+    with span('load/live'):
+        stream.poll_if_due()
+    indikator = [f'SMA{p}' for p in ma_periods] + ['VWAP']
+    chart = st.session_state.get('grafik_live')
+    if chart is None or chart.stream is not stream or chart.kode != kode or chart.indikator != [
+            nama for nama in indikator if nama in stream.columns]:
+        chart = st.session_state['grafik_live'] = LiveChart(stream, kode, indikator)
+    with span('compute/live_chart'):
+        chart.update()
+
+    if stream.last_error:
+        st.warning(f"Gagal mengambil bar intraday: {stream.last_error}")
+    if chart.seq == 0:
+        st.info(f"Belum ada bar intraday untuk {kode} (di luar jam bursa atau data belum tersedia)")
+        return
+    st.caption(f"Bar terakhir: {chart.last_time.replace('T', ' ')} · "
+               f"{len(chart)} bar di buffer · pembaruan tiap {stream.refresh:g} detik")
+    tampilkan_grafik(CachedFigure(chart.spec), width='stretch')
+
+
+def render_live(ds, opsi):
+    """Mode live: bar intraday dalam ring buffer dengan grafik yang memperbarui dirinya sendiri"""
+    col1, col2 = st.columns(2)
+    with col1:
+        kode = st.selectbox('Emiten Live', opsi['perbandingan'], key='live_emiten',
+                            format_func=lambda kode: f"{kode} - {ds.name(kode)}")
+    with col2:
+        interval = st.radio('Interval Bar', list(LIVE_INTERVALS), horizontal=True, key='live_interval')
+    stream = get_live_stream(interval)
+    # Fragment diperiksa lebih sering dari interval poll; poll_if_due yang membatasi permintaan ke feed
+    st.fragment(grafik_live, run_every=max(1.0, stream.refresh / 4))(stream, kode, opsi['ma_periods'])
+
+
+# ----------------------------------------------------------------------
+# Tampilan perbandingan emiten
+# ----------------------------------------------------------------------
+def tab_perbandingan_harga(ds, opsi, rentang):
+    """Tab Analisis Harga: harga Close dan moving average semua emiten"""
+    import plotly.express as px
+    tickers = opsi['perbandingan']
+    panel = ds.panel(tickers)
+
+    st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
+    st.subheader('Perbandingan Harga Saham Pertambangan')
+    st.text(f"Grafik ini membandingkan harga ke-{len(tickers)} saham dalam rentang waktu yang dipilih")
+
+    def buat():
+        # harga: harga diisi harga terakhir agar garis grafik tidak terputus
+        harga = panel.with_fill(FILL_FFILL).slice(*rentang)
+
+        # Perbandingan harga Close (sejajar per tanggal)
+        series = [harga.field('Close', tickers)]
+
+        # Tambahkan Moving Average jika dipilih (dihitung atas histori penuh lalu dipotong)
+        if opsi['show_ma']:
+            ma = ds.indicators.compute(panel.with_fill(FILL_FFILL), [('sma', p) for p in opsi['ma_periods']],
+                                       tickers=tickers, start=rentang[0], end=rentang[1])
+            for ma_period in opsi['ma_periods']:
+                series.append(ma[f'SMA{ma_period}'].add_suffix(f'_MA{ma_period}'))
+        chart_data = pd.concat(series, axis=1)
+
+        # Downsampling (LTTB) per garis sebelum dikirim ke browser
+        fig = px.line(lttb_long(chart_data, opsi['n_titik']), x='Tanggal', y='Harga', color='Emiten',
+                     title=f"Perbandingan Harga Saham ({opsi['selected_period']})")
+        # Menyesuaikan tampilan grafik
+        fig.update_layout(
+            yaxis_title="Harga (Rp)",
+            xaxis_title="Tanggal",
+            hovermode='x unified',
+            legend=dict(
+                yanchor="top",
+                y=0.99,
+                xanchor="left",
+                x=0.01
             )
-            st.plotly_chart(fig, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+        )
+        return fig
+
+    tampilkan_grafik_cache(opsi, ('perbandingan_harga', tuple(tickers), opsi['show_ma'], tuple(opsi['ma_periods']),
+                                  panel.version), buat, width='stretch')
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+def tab_perbandingan_volume(ds, opsi, rentang):
+    """Tab Analisis Volume: volume transaksi dan persentase perubahan harga"""
+    import plotly.express as px
+    n_titik = opsi['n_titik']
+    tickers = opsi['perbandingan']
+    panel = ds.panel(tickers)
+    harga = panel.with_fill(FILL_FFILL).slice(*rentang)
+
+    st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
+    st.subheader('Analisis Volume Transaksi')
+    st.text(f"Perbandingan volume transaksi ke-{len(tickers)} saham")
+
+    def buat_volume():
+        volume_data = sum_buckets(harga.field('Volume', tickers), n_titik)
+        hari_per_titik = max(1, round(len(harga) / max(len(volume_data), 1)))
+        judul_volume = 'Volume Transaksi Harian' if hari_per_titik == 1 else f'Volume Transaksi (total per ±{hari_per_titik} hari)'
+
+        return px.area(volume_data, labels={'Date': 'Tanggal', 'value': 'Volume', 'variable': 'Emiten'},
+                       title=judul_volume)
+
+    tampilkan_grafik_cache(opsi, ('perbandingan_volume', tuple(tickers), panel.version), buat_volume,
+                           width='stretch')
+
+    # Persentase perubahan harga, memakai level piramida yang sesuai dengan panjang periode
+    level = choose_level(len(harga), n_titik)
+    st.subheader(f'Persentase Perubahan Harga {NAMA_LEVEL[level]}')
+
+    def buat_perubahan():
+        _, price_changes = ds.price_changes(tickers, *rentang, n_titik)
+        return px.line(lttb_long(price_changes, n_titik, value_name='Perubahan (%)'),
+                       x='Tanggal', y='Perubahan (%)', color='Emiten')
+
+    tampilkan_grafik_cache(opsi, ('perbandingan_perubahan', tuple(tickers), panel.version), buat_perubahan,
+                           width='stretch')
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+def tab_perbandingan_korelasi(ds, opsi, rentang):
+    """Tab Analisis Korelasi: matriks korelasi, korelasi bergulir dan ringkasan statistik"""
+    import plotly.express as px
+    tickers = opsi['perbandingan']
+    panel = ds.panel(tickers)
+    # view: data mentah per tanggal (NaN jika emiten tidak diperdagangkan)
+    view = panel.slice(*rentang)
+
+    st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
+    st.subheader('Analisis Korelasi')
+
+    # Matriks korelasi log return harian (sejajar per tanggal)
+    tampilkan_grafik_cache(opsi, ('perbandingan_korelasi', tuple(tickers), panel.version), lambda: px.imshow(
+        ds.correlation.matrix(panel, *rentang),
+        labels=dict(x="Emiten", y="Emiten", color="Korelasi"),
+        color_continuous_scale="RdBu", zmin=-1, zmax=1,
+        title="Matriks Korelasi Return Harian (log return)"
+    ), width='stretch')
+
+    # Korelasi bergulir antar pasangan emiten
+    st.subheader('Korelasi Bergulir')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        window_korelasi = st.selectbox('Window (hari perdagangan)', [20, 60, 120, 250], key='window_korelasi')
+    with col2:
+        metode_korelasi = st.radio('Metode', ['Rolling', 'EWMA'], horizontal=True, key='metode_korelasi')
+    acuan = None
+    if len(tickers) > MAKS_EMITEN_PASANGAN:
+        # Jumlah pasangan tumbuh kuadratik; tampilkan pasangan satu emiten acuan saja
+        with col3:
+            acuan = st.selectbox('Emiten Acuan', tickers, key='acuan_korelasi')
+
+    def buat_bergulir():
+        rolling_corr = ds.correlation.rolling(panel, window_korelasi, *rentang,
+                                              method='ewm' if metode_korelasi == 'EWMA' else 'rolling')
+        if acuan is not None:
+            rolling_corr = rolling_corr[[pasangan for pasangan in rolling_corr.columns if acuan in pasangan.split('-')]]
+        fig_rolling = px.line(lttb_long(rolling_corr, opsi['n_titik'], var_name='Pasangan', value_name='Korelasi'),
+                              x='Tanggal', y='Korelasi', color='Pasangan',
+                              title=f"Korelasi {metode_korelasi} {window_korelasi} Hari ({opsi['selected_period']})")
+        return fig_rolling.update_yaxes(range=[-1, 1])
+
+    tampilkan_grafik_cache(opsi, ('perbandingan_korelasi_bergulir', tuple(tickers), window_korelasi, metode_korelasi,
+                                  acuan, panel.version), buat_bergulir, width='stretch')
+
+    # Tampilkan tabel korelasi OHLCV masing-masing emiten dengan orientasi horizontal
+    st.text("Correlation Matrices (Horizontal View)")
+    for col, kode in zip(kolom_grid(len(tickers)), tickers):
+        with col:
+            st.write(f"**{kode} Correlation Matrix**")
+            st.dataframe(ds.ohlcv_correlation(kode, *rentang))
 
-        except Exception as e:
-            st.error(f"Terjadi kesalahan dalam memproses data perbandingan: {e}")
-    
-    # Tab Analisis Volume
-    with tab2:
-        try:
-            st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            st.subheader('Analisis Volume Transaksi')
-            st.text("Perbandingan volume transaksi ke-4 saham")
-
-            volume_data = pd.DataFrame({
-                'Tanggal': ptba['Date'],
-                'PTBA': ptba['Volume'],
-                'ITMG': itmg['Volume'],
-                'ANTM': antm['Volume'],
-                'ADRO': adro['Volume']
-            })
-
-            fig_vol = px.area(volume_data.melt(id_vars=['Tanggal'], var_name='Emiten', value_name='Volume'),
-                         x='Tanggal', y='Volume', color='Emiten',
-                         title='Volume Transaksi Harian')
-            st.plotly_chart(fig_vol, use_container_width=True)
-
-            # Persentase perubahan harga
-            st.subheader('Persentase Perubahan Harga Harian')
-            for df, name in zip([ptba, itmg, antm, adro], ['PTBA', 'ITMG', 'ANTM', 'ADRO']):
-                df[f'{name}_Change'] = df['Close'].pct_change() * 100
-
-            price_changes = pd.DataFrame({
-                'Tanggal': adro['Date'],
-                'PTBA': ptba['PTBA_Change'],
-                'ITMG': itmg['ITMG_Change'],
-                'ANTM': antm['ANTM_Change'],
-                'ADRO': adro['ADRO_Change']
-            })
-
-            fig_changes = px.line(price_changes.melt(id_vars=['Tanggal'], var_name='Emiten', value_name='Perubahan (%)'),
-                                x='Tanggal', y='Perubahan (%)', color='Emiten')
-            st.plotly_chart(fig_changes, use_container_width=True)
-            st.markdown("</div>", unsafe_allow_html=True)
+    # Summary Insights
+    st.subheader("Ringkasan Statistik")
+    ringkasan = ringkasan_emiten(view, tickers).reset_index()
+    for col, kolom in zip(st.columns(3), ['Harga Tertinggi', 'Harga Terendah', 'Volume Rata-rata']):
+        with col:
+            st.write(f"**{kolom}**")
+            tampilkan_grafik(px.bar(ringkasan, x='Emiten', y=kolom, color='Emiten'))
 
-        except Exception as e:
-            st.error(f"Terjadi kesalahan dalam memproses data volume: {e}")
 
-    with tab3:
-        try:
-            st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            st.subheader('Analisis Korelasi')
-
-            # Matriks korelasi
-            correlation_data = pd.DataFrame({
-                'PTBA': ptba['Close'],
-                'ITMG': itmg['Close'],
-                'ANTM': antm['Close'],
-                'ADRO': adro['Close']
-            }).corr()
-
-            fig_corr = px.imshow(correlation_data,
-                               labels=dict(x="Emiten", y="Emiten", color="Korelasi"),
-                               color_continuous_scale="RdBu",
-                               title="Matriks Korelasi Harga Saham")
-            st.plotly_chart(fig_corr, use_container_width=True)
-
-            # Hitung matriks korelasi untuk masing-masing emiten
-            correlation_ptba = ptba[['Open', 'High', 'Low', 'Close', 'Volume']].corr()
-            correlation_antm = antm[['Open', 'High', 'Low', 'Close', 'Volume']].corr()
-            correlation_adro = adro[['Open', 'High', 'Low', 'Close', 'Volume']].corr()
-            correlation_itmg = itmg[['Open', 'High', 'Low', 'Close', 'Volume']].corr()
-
-            # Tampilkan tabel korelasi dengan orientasi horizontal
-            st.text("Correlation Matrices (Horizontal View)")
-
-            # Buat 4 kolom untuk tabel
-            col1, col2, col3, col4 = st.columns(4)
-            # Tabel korelasi di setiap kolom
+def tab_perbandingan_dividen(ds, opsi, rentang):
+    """Tab Analisis Dividen: total dividen, dividend yield dan statistiknya"""
+    import plotly.express as px
+    st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
+    st.subheader('Analisis Dividen')
+
+    try:
+        tickers = tuple(opsi['perbandingan'])
+        data_combined = ds.combined_dividends(tickers)
+
+        # Perbandingan Total Dividen
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig_div = px.bar(
+                data_combined,
+                x='Tahun',
+                y='Jumlah Dividen',
+                color='Emiten',
+                barmode='group',
+                title="Perbandingan Total Dividen per Emiten"
+            )
+            fig_div.update_layout(
+                yaxis_title="Jumlah Dividen (Rp)",
+                xaxis_title="Tahun"
+            )
+            tampilkan_grafik(fig_div, width='stretch')
+
+        with col2:
+            fig_yield = px.line(
+                data_combined,
+                x='Tahun',
+                y='Yield Percentage',
+                color='Emiten',
+                title="Tren Dividend Yield"
+            )
+            fig_yield.update_layout(
+                yaxis_title="Dividend Yield (%)",
+                xaxis_title="Tahun"
+            )
+            tampilkan_grafik(fig_yield, width='stretch')
+
+        # Deret harian dari event ex-date dan histori harga dalam rentang yang dipilih
+        ex_date = ds.ex_date_tickers(tickers)
+        tahunan = [kode for kode in ds.dividend_tickers(tickers) if kode not in ex_date]
+        if tahunan:
+            st.info(f"Yield TTM dan total return butuh event dividen per ex-date (kolom Tanggal dan Dividen); "
+                    f"{', '.join(tahunan)} hanya punya total dividen tahunan sehingga tidak ditampilkan.")
+        if ex_date:
+            col1, col2 = st.columns(2)
+
             with col1:
-                st.write("**PTBA Correlation Matrix**")
-                st.dataframe(correlation_ptba)
+                fig_ttm = px.line(
+                    lttb_long(ds.ttm_yield(ex_date, *rentang), opsi['n_titik'], value_name='Yield TTM (%)'),
+                    x='Tanggal', y='Yield TTM (%)', color='Emiten',
+                    title="Dividend Yield Trailing 12 Bulan"
+                )
+                tampilkan_grafik(fig_ttm, width='stretch')
 
             with col2:
-                st.write("**ANTM Correlation Matrix**")
-                st.dataframe(correlation_antm)
+                fig_tr = px.line(
+                    lttb_long(rebase(ds.total_return(ex_date, *rentang)), opsi['n_titik'], value_name='Total Return'),
+                    x='Tanggal', y='Total Return', color='Emiten',
+                    title="Total Return (dividen diinvestasikan kembali, awal rentang = 100)"
+                )
+                tampilkan_grafik(fig_tr, width='stretch')
 
-            with col3:
-                st.write("**ADRO Correlation Matrix**")
-                st.dataframe(correlation_adro)
+        # Statistik Dividen
+        st.subheader("Ringkasan Statistik Dividen")
+        # Salin karena kolom akan diformat menjadi teks di bawah
+        stats_df = ds.dividend_stats(tickers).copy()
 
-            with col4:
-                st.write("**ITMG Correlation Matrix**")
-                st.dataframe(correlation_itmg)
+        # Format currency columns
+        for col in ['Total Dividen', 'Rata-rata Dividen', 'Dividen Tertinggi']:
+            stats_df[col] = stats_df[col].apply(format_rupiah)
 
-            # Summary Insights
-            st.subheader("Ringkasan Statistik")
-            col1, col2, col3 = st.columns(3)
+        # Format percentage columns
+        for col in ['Rata-rata Yield', 'Yield Tertinggi', 'Rata-rata Pertumbuhan', 'Yield TTM']:
+            stats_df[col] = stats_df[col].apply(lambda x: '-' if pd.isna(x) else f"{x:.2f}%")
 
-            with col1:
-                st.write("**Harga Tertinggi**")
-                data_high = pd.DataFrame({
-                    'Emiten': ['PTBA', 'ITMG', 'ANTM', 'ADRO'],
-                    'Harga Tertinggi': [ptba['High'].max(), itmg['High'].max(),
-                                      antm['High'].max(), adro['High'].max()]
-                })
-                fig_high = px.bar(data_high, x='Emiten', y='Harga Tertinggi', color='Emiten')
-                st.plotly_chart(fig_high)
+        st.dataframe(stats_df, width='stretch')
 
-            with col2:
-                st.write("**Harga Terendah**")
-                data_low = pd.DataFrame({
-                    'Emiten': ['PTBA', 'ITMG', 'ANTM', 'ADRO'],
-                    'Harga Terendah': [ptba['Low'].min(), itmg['Low'].min(),
-                                     antm['Low'].min(), adro['Low'].min()]
-                })
-                fig_low = px.bar(data_low, x='Emiten', y='Harga Terendah', color='Emiten')
-                st.plotly_chart(fig_low)
-
-            with col3:
-                st.write("**Volume Rata-rata**")
-                data_volume = pd.DataFrame({
-                    'Emiten': ['PTBA', 'ITMG', 'ANTM', 'ADRO'],
-                    'Volume Rata-rata': [ptba['Volume'].mean(), itmg['Volume'].mean(),
-                                       antm['Volume'].mean(), adro['Volume'].mean()]
-                })
-                fig_volume = px.bar(data_volume, x='Emiten', y='Volume Rata-rata', color='Emiten')
-                st.plotly_chart(fig_volume)
+    except FileNotFoundError:
+        st.warning("File data dividen tidak ditemukan. Pastikan semua file CSV tersedia di folder dataset_dividen/")
+    except Exception as e:
+        st.error(f"Terjadi kesalahan dalam memproses data dividen: {str(e)}")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+def tab_perbandingan_risiko(ds, opsi, rentang):
+    """Tab Return & Risiko: total return, drawdown, volatilitas bergulir dan metrik risiko (semua dari cache)"""
+    import plotly.express as px
+    tickers = tuple(opsi['perbandingan'])
+
+    st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
+    st.subheader('Return & Risiko')
+    st.text("Dihitung dari indeks total return (dividen per ex-date diinvestasikan kembali) dalam rentang waktu yang dipilih")
+    tahunan = [kode for kode in ds.dividend_tickers(tickers) if kode not in ds.ex_date_tickers(tickers)]
+    if tahunan:
+        st.caption(f"{', '.join(tahunan)} hanya punya total dividen tahunan tanpa ex-date, sehingga memakai return harga saja")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig_tr = px.line(lttb_long(rebase(ds.total_return(tickers, *rentang)), opsi['n_titik'], value_name='Total Return'),
+                         x='Tanggal', y='Total Return', color='Emiten',
+                         title="Indeks Total Return (awal rentang = 100)")
+        tampilkan_grafik(fig_tr, width='stretch')
+    with col2:
+        fig_dd = px.line(lttb_long(ds.drawdown(tickers, *rentang), opsi['n_titik'], value_name='Drawdown (%)'),
+                         x='Tanggal', y='Drawdown (%)', color='Emiten',
+                         title="Drawdown dari Puncak Sebelumnya")
+        tampilkan_grafik(fig_dd, width='stretch')
+
+    window_volatilitas = st.selectbox('Window volatilitas (hari perdagangan)', [20, 60, 120, 250],
+                                      key='window_volatilitas')
+    fig_vol = px.line(lttb_long(ds.volatility(tickers, window_volatilitas, *rentang), opsi['n_titik'],
+                                value_name='Volatilitas (%)'),
+                      x='Tanggal', y='Volatilitas (%)', color='Emiten',
+                      title=f"Volatilitas Bergulir {window_volatilitas} Hari (disetahunkan)")
+    tampilkan_grafik(fig_vol, width='stretch')
+
+    st.subheader('Ringkasan Return & Risiko')
+    st.caption("Beta terhadap indeks sektor equal-weight dari emiten yang dipilih; Sharpe dan Sortino tanpa suku bunga bebas risiko")
+    # Salin karena kolom akan diformat menjadi teks di bawah
+    ringkasan = ds.performance_summary(tickers, *rentang).copy()
+    for col in ['Total Return (%)', 'CAGR (%)', 'Volatilitas (%)', 'Max Drawdown (%)']:
+        ringkasan[col] = ringkasan[col].apply(lambda x: f"{x:,.2f}%")
+    ringkasan['Durasi Drawdown (hari)'] = ringkasan['Durasi Drawdown (hari)'].apply(lambda x: f"{x:,.0f}")
+    for col in ['Sharpe', 'Sortino', 'Beta']:
+        ringkasan[col] = ringkasan[col].apply(lambda x: f"{x:.2f}")
+    st.dataframe(ringkasan, width='stretch')
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# (judul tab, fungsi render, pesan kesalahan)
+TAB_PERBANDINGAN = [
+    ("📈 Analisis Harga", tab_perbandingan_harga, "Terjadi kesalahan dalam memproses data perbandingan"),
+    ("📊 Analisis Volume", tab_perbandingan_volume, "Terjadi kesalahan dalam memproses data volume"),
+    ("📉 Analisis Korelasi", tab_perbandingan_korelasi, "Terjadi kesalahan dalam memproses analisis korelasi"),
+    ("💰 Analisis Dividen", tab_perbandingan_dividen, "Terjadi kesalahan dalam tab analisis dividen"),
+    ("⚖️ Return & Risiko", tab_perbandingan_risiko, "Terjadi kesalahan dalam memproses analisis return dan risiko"),
+]
+
+
+def render_perbandingan(ds, opsi):
+    st.markdown("<h1 class='main-header'>📈 Dashboard Analisis Perbandingan Sektor Pertambangan</h1>", unsafe_allow_html=True)
 
-        except Exception as e:
-            st.error(f"Terjadi kesalahan dalam memproses analisis korelasi: {e}")
+    if not opsi['perbandingan']:
+        st.warning("Pilih minimal satu emiten untuk dibandingkan")
+        st.stop()
+
+    # Menambahkan kartu harga real-time
+    render_kartu_harga(ds, opsi['perbandingan'])
+    if st.toggle('📡 Mode Live Intraday', key='mode_live', help='Grafik bar 1/5 menit yang diperbarui otomatis'):
+        render_live(ds, opsi)
+
+    # Filter data berdasarkan periode atau rentang tanggal yang dipilih
+    rentang = rentang_periode(opsi['period'], opsi['start_date'], opsi['end_date'])
 
-    with tab4:
+    def jalankan(render, pesan):
         try:
-            st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            st.subheader('Analisis Dividen')
-            
-            try:
-                # Load data dividen
-                data_dividen_adro = get_data_from_csv('dataset_dividen/Deviden Yield Percentage ADRO.csv')
-                data_dividen_itmg = get_data_from_csv('dataset_dividen/Deviden Yield Percentage ITMG.csv')
-                data_dividen_ptba = get_data_from_csv('dataset_dividen/Deviden Yield Percentage PTBA.csv')
-                data_dividen_antm = get_data_from_csv('dataset_dividen/Deviden Yield Percentage ANTM.csv')
-
-                # Gabungkan data
-                data_combined = pd.concat([
-                    data_dividen_adro.assign(Emiten='ADRO'),
-                    data_dividen_itmg.assign(Emiten='ITMG'),
-                    data_dividen_ptba.assign(Emiten='PTBA'),
-                    data_dividen_antm.assign(Emiten='ANTM')
-                ]).sort_values(by=['Tahun'])
-
-            # Perbandingan Total Dividen
+            render(ds, opsi, rentang)
+        except Exception as e:
+            st.error(f"{pesan}: {e}")
+
+    # Tabs untuk analisis berbeda (hanya tab yang dibuka yang dihitung)
+    render_tabs('tab_perbandingan', [
+        (judul, lambda render=render, pesan=pesan: jalankan(render, pesan))
+        for judul, render, pesan in TAB_PERBANDINGAN
+    ])
+
+
+# ----------------------------------------------------------------------
+# Halaman debug cache
+# ----------------------------------------------------------------------
+def render_debug(ds):
+    st.markdown("<h1 class='main-header'>🛠️ Debug Cache</h1>", unsafe_allow_html=True)
+    stats = ds.cache.stats()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric('Entri', stats['entri'])
+    col2.metric('Memori', f"{stats['memori_mb']:.1f} / {stats['batas_mb']:.0f} MB")
+    col3.metric('Hit', f"{stats['hit']:,}", f"{stats['hit_rate']:.0%} hit rate", delta_color='off')
+    col4.metric('Miss', f"{stats['miss']:,}")
+    col5.metric('Eviction', f"{stats['eviction']:,}")
+
+    entri = pd.DataFrame(ds.cache.entries(), columns=['Fungsi', 'Ukuran (byte)'])
+    if not entri.empty:
+        st.subheader('Pemakaian memori per fungsi')
+        st.dataframe(entri.groupby('Fungsi')['Ukuran (byte)'].agg(['count', 'sum']).rename(
+            columns={'count': 'Entri', 'sum': 'Total (byte)'}), width='stretch')
+    if ds.load_timings:
+        st.subheader('Waktu muat per emiten')
+        st.dataframe(pd.DataFrame.from_dict(ds.load_timings, orient='index').rename(columns={
+            'dibangun': 'Dibangun dari CSV', 'bangun_detik': 'Bangun (detik)',
+            'muat_detik': 'Muat (detik)', 'baris': 'Baris'}), width='stretch')
+    laporan = get_cache_warmer().last_report
+    if laporan is not None:
+        st.subheader('Pemanasan cache terakhir')
+        st.caption(f"{laporan['mulai']:%Y-%m-%d %H:%M:%S}, {laporan['detik']:.2f} detik")
+        if laporan['pesan']:
+            st.warning(f"Pemanasan cache gagal: {laporan['pesan']}")
+        st.dataframe(pd.Series(laporan['artefak'], name='Detik').rename_axis('Artefak').to_frame(),
+                     width='stretch')
+    grafik = get_figure_cache().stats()
+    st.subheader('Cache figure')
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Figure', grafik['entri'])
+    col2.metric('Disk', f"{grafik['memori_mb']:.1f} / {grafik['batas_mb']:.0f} MB")
+    col3.metric('Hit', f"{grafik['hit']:,}", f"{grafik['hit_rate']:.0%} hit rate", delta_color='off')
+    col4.metric('Eviction', f"{grafik['eviction']:,}")
+    if st.button('Kosongkan cache'):
+        ds.cache.invalidate()
+        get_figure_cache().clear()
+        st.rerun()
+
+
+def render_profiler(profiler):
+    """Panel profiler di sidebar (hanya muncul dengan ?profiler=1 di URL)"""
+    with st.sidebar.expander('⏱️ Profiler', expanded=True):
+        runs = profiler.runs()
+        if not runs:
+            st.caption('Belum ada rerun yang tercatat')
+        else:
+            st.caption(f"{len(runs)} rerun terakhir, rerun sebelumnya {runs[-1]['total'] * 1000:,.0f} ms "
+                       f"({runs[-1]['label']})")
+            stats = profiler.stage_stats()
+            tampil = stats.copy()
+            for kolom in ['Rerun', 'Panggilan']:
+                tampil[kolom] = stats[kolom].map(lambda x: f"{x:,.0f}")
+            for kolom in stats.columns[2:]:
+                tampil[kolom] = stats[kolom].map(lambda x: f"{x:,.1f}")
+            st.dataframe(tampil, width='stretch')
+            st.bar_chart(pd.Series([run['total'] * 1000 for run in runs], name='Rerun (ms)'), height=150)
+
+            col1, col2 = st.columns(2)
+            col1.download_button('Prometheus', profiler.to_prometheus(), 'dashboard.prom', mime='text/plain')
+            col2.download_button('JSONL', profiler.to_jsonl(), 'profiler.jsonl', mime='application/jsonl')
+
+        mesin = st.selectbox('Mesin profil', MESIN_PROFIL, key='mesin_profil',
+                             help=None if pyinstrument_tersedia() else 'pyinstrument tidak terpasang, cProfile dipakai')
+        if st.button('Profil rerun berikutnya'):
+            st.session_state['profil_berikutnya'] = mesin
+            st.rerun()
+        if profiler.last_profile is not None:
+            profil = profiler.last_profile
+            st.caption(f"Profil {profil['mesin']} {pd.Timestamp(profil['mulai'], unit='s'):%H:%M:%S} UTC")
+            st.code(profil['laporan'], language=None)
+
+
+# ----------------------------------------------------------------------
+# Tampilan detail satu emiten
+# ----------------------------------------------------------------------
+def data_grafik(ds, kode, df, n_titik):
+    """
+    Bar OHLCV untuk candlestick dan volume: level piramida yang muat di lebar
+    grafik, lalu diagregasi per bucket jika masih terlalu banyak
+    """
+    level = choose_level(len(df), n_titik)
+    if level != 'D':
+        df = ds.pyramid(kode).slice(level, df['Date'].iloc[0], df['Date'].iloc[-1])
+    return ohlc_buckets(df, n_titik)
+
+
+def tab_detail_teknikal(ds, kode, df, opsi):
+    """Tab Analisis Teknikal: candlestick dan moving average"""
+    import plotly.graph_objects as go
+
+    def buat():
+        df_chart = data_grafik(ds, kode, df, opsi['n_titik'])
+        fig = go.Figure()
+        fig.add_trace(go.Candlestick(
+            x=df_chart['Date'],
+            open=df_chart['Open'],
+            high=df_chart['High'],
+            low=df_chart['Low'],
+            close=df_chart['Close'],
+            name=kode
+        ))
+
+        if opsi['show_ma']:
+            ma = ds.indicators.compute(ds.ticker_panel(kode), [('sma', p) for p in opsi['ma_periods']],
+                                       start=df['Date'].iloc[0], end=df['Date'].iloc[-1])
+            for ma_period in opsi['ma_periods']:
+                if len(df) >= ma_period:  # Cek apakah cukup data untuk MA
+                    ma_series = lttb(ma[f'SMA{ma_period}'][kode], opsi['n_titik'])
+                    fig.add_trace(go.Scatter(
+                        x=ma_series.index,
+                        y=ma_series.to_numpy(),
+                        name=f'MA {ma_period}',
+                        line=dict(width=1)
+                    ))
+
+        fig.update_layout(
+            title=f"Grafik Harga {kode}",
+            yaxis_title="Harga (Rp)",
+            xaxis_title="Tanggal",
+            height=600
+        )
+        return fig
+
+    tampilkan_grafik_cache(opsi, ('detail_teknikal', kode, opsi['show_ma'], tuple(opsi['ma_periods']),
+                                  ds.version(kode)), buat, width='stretch')
+
+
+def tab_detail_volume(ds, kode, df, opsi):
+    """Tab Analisis Volume: volume transaksi harian (atau per bar piramida)"""
+    import plotly.graph_objects as go
+    if opsi['show_volume']:
+        st.subheader("Analisis Volume Transaksi")
+
+        def buat():
+            df_chart = data_grafik(ds, kode, df, opsi['n_titik'])
+            fig_vol = go.Figure()
+            fig_vol.add_trace(go.Bar(
+                x=df_chart['Date'],
+                y=df_chart['Volume'],
+                name="Volume"
+            ))
+            fig_vol.update_layout(
+                title=f"Volume Transaksi {kode}",
+                yaxis_title="Volume",
+                xaxis_title="Tanggal",
+                height=400
+            )
+            return fig_vol
+
+        tampilkan_grafik_cache(opsi, ('detail_volume', kode, ds.version(kode)), buat, width='stretch')
+
+
+def tab_detail_dividen(ds, kode, df, opsi):
+    """Tab Analisis Dividen: dividen dan yield dalam periode yang dipilih"""
+    import plotly.express as px
+    selected_period = opsi['selected_period']
+    st.subheader("Analisis Dividen")
+    try:
+        df_dividen = ds.dividends(kode)
+
+        if not df_dividen.empty:
+            # Filter berdasarkan periode yang dipilih
+            filtered_dividen = filter_tahun(df_dividen, rentang_tahun(opsi['period'], opsi['start_date'], opsi['end_date']))
+
+            if not filtered_dividen.empty:
                 col1, col2 = st.columns(2)
-                
                 with col1:
                     fig_div = px.bar(
-                        data_combined,
+                        filtered_dividen,
                         x='Tahun',
                         y='Jumlah Dividen',
-                        color='Emiten',
-                        barmode='group',
-                        title="Perbandingan Total Dividen per Emiten"
+                        title=f"Total Dividen {kode} ({selected_period})"
                     )
                     fig_div.update_layout(
                         yaxis_title="Jumlah Dividen (Rp)",
                         xaxis_title="Tahun"
                     )
-                    st.plotly_chart(fig_div, use_container_width=True)
+                    tampilkan_grafik(fig_div, width='stretch')
 
                 with col2:
-                    fig_yield = px.line(
-                        data_combined,
+                    fig_yield = px.bar(
+                        filtered_dividen,
                         x='Tahun',
                         y='Yield Percentage',
-                        color='Emiten',
-                        title="Tren Dividend Yield"
+                        title=f"Dividend Yield {kode} % ({selected_period})"
                     )
                     fig_yield.update_layout(
                         yaxis_title="Dividend Yield (%)",
                         xaxis_title="Tahun"
                     )
-                    st.plotly_chart(fig_yield, use_container_width=True)
-
-                # Statistik Dividen
-                st.subheader("Ringkasan Statistik Dividen")
-                
-                stats_data = []
-                for emiten in ['ADRO', 'ITMG', 'PTBA', 'ANTM']:
-                    df = data_combined[data_combined['Emiten'] == emiten]
-                    stats = {
-                        'Emiten': emiten,
-                        'Total Dividen': df['Jumlah Dividen'].sum(),
-                        'Rata-rata Dividen': df['Jumlah Dividen'].mean(),
-                        'Dividen Tertinggi': df['Jumlah Dividen'].max(),
-                        'Rata-rata Yield': df['Yield Percentage'].mean(),
-                        'Yield Tertinggi': df['Yield Percentage'].max()
-                    }
-                    stats_data.append(stats)
-                
-                stats_df = pd.DataFrame(stats_data)
-                
-                # Format currency columns
-                currency_cols = ['Total Dividen', 'Rata-rata Dividen', 'Dividen Tertinggi']
-                for col in currency_cols:
-                    stats_df[col] = stats_df[col].apply(lambda x: f"Rp {x:,.2f}")
-                
-                # Format percentage columns
-                pct_cols = ['Rata-rata Yield', 'Yield Tertinggi']
-                for col in pct_cols:
-                    stats_df[col] = stats_df[col].apply(lambda x: f"{x:.2f}%")
-                
-                st.dataframe(stats_df, use_container_width=True)
-
-            except FileNotFoundError:
-                st.warning("File data dividen tidak ditemukan. Pastikan semua file CSV tersedia di folder dataset_dividen/")
-            except Exception as e:
-                st.error(f"Terjadi kesalahan dalam memproses data dividen: {str(e)}")
-
-            st.markdown("</div>", unsafe_allow_html=True)
+                    tampilkan_grafik(fig_yield, width='stretch')
 
-        except Exception as e:
-            st.error(f"Terjadi kesalahan dalam tab analisis dividen: {str(e)}")
+                # Tampilkan statistik untuk periode yang dipilih
+                st.subheader(f"Statistik Dividen {selected_period}")
+                stats = ringkasan_dividen(filtered_dividen)
 
-else:
-    if selected_option in ["ADRO", "PTBA", "ITMG", "ANTM"]:
-        try:
-            # Load data
-            df = get_data_from_csv(f"{selected_option.lower()}_fix.csv")
-            df['Date'] = pd.to_datetime(df['Date'])
-            
-            # Filter berdasarkan periode yang dipilih
-            end_date = pd.Timestamp.now()
-            if period != 'max':
-                period_days = {
-                    '10y': 3600,
-                    '5y': 1825,
-                    '3y': 1095,
-                    '1y': 365,
-                    '6mo': 180,
-                    '3mo': 90,
-                    '1mo': 30
-                }
-                start_date = end_date - pd.Timedelta(days=period_days[period])
-                filtered_df = df[df['Date'] >= start_date].copy()
-                
-                # Cek apakah data tersedia untuk periode yang dipilih
-                if filtered_df.empty:
-                    earliest_date = df['Date'].min()
-                    latest_date = df['Date'].max()
-                    st.warning(f"""
-                    ⚠️ Tidak ada data untuk periode yang dipilih: {selected_period}
-                    
-                    Data {selected_option} tersedia untuk periode:
-                    - Tanggal awal: {earliest_date.strftime('%d %B %Y')}
-                    - Tanggal akhir: {latest_date.strftime('%d %B %Y')}
-                    
-                    Silakan pilih periode yang sesuai dengan rentang data yang tersedia.
-                    """)
-                    st.stop()
-                    
-                df = filtered_df
-                
-            st.info(f"Menampilkan data untuk periode: {selected_period}")
-
-            # Header dan metrics
-            st.markdown(f"<h1 class='main-header'>📊 Analisis Detail {selected_option}</h1>", unsafe_allow_html=True)
-            
-            # Metrics
-            col1, col2, col3, col4 = st.columns(4)
-            if len(df) > 0:  # Pastikan ada data sebelum menghitung metrik
-                metrics = {
-                    'Harga Terakhir': df['Close'].iloc[-1],
-                    'Volume Rata-rata': df['Volume'].mean(),
-                    'Harga Tertinggi': df['High'].max(),
-                    'Harga Terendah': df['Low'].min()
-                }
-                
-                for col, (label, value) in zip([col1, col2, col3, col4], metrics.items()):
+                # Tampilkan statistik dalam format yang lebih menarik
+                for col, label in zip(st.columns(5), STATISTIK):
                     with col:
-                        if 'Volume' in label:
-                            st.metric(label, f"{value:,.0f}")
-                        else:
-                            st.metric(label, f"Rp {value:,.2f}")
-
-                # Tabs untuk analisis detail
-                tab1, tab2, tab3 = st.tabs(["📈 Analisis Teknikal", "📊 Analisis Volume", "💰 Analisis Dividen"])
-
-                with tab1:
-                    fig = go.Figure()
-                    fig.add_trace(go.Candlestick(
-                        x=df['Date'],
-                        open=df['Open'],
-                        high=df['High'],
-                        low=df['Low'],
-                        close=df['Close'],
-                        name=selected_option
-                    ))
-
-                    if show_ma:
-                        for period in ma_periods:
-                            if len(df) >= period:  # Cek apakah cukup data untuk MA
-                                ma = df['Close'].rolling(window=period).mean()
-                                fig.add_trace(go.Scatter(
-                                    x=df['Date'],
-                                    y=ma,
-                                    name=f'MA {period}',
-                                    line=dict(width=1)
-                                ))
-
-                    fig.update_layout(
-                        title=f"Grafik Harga {selected_option}",
-                        yaxis_title="Harga (Rp)",
-                        xaxis_title="Tanggal",
-                        height=600
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-
-                with tab2:
-                    if show_volume:
-                        st.subheader("Analisis Volume Transaksi")
-                        fig_vol = go.Figure()
-                        fig_vol.add_trace(go.Bar(
-                            x=df['Date'],
-                            y=df['Volume'],
-                            name="Volume"
-                        ))
-                        fig_vol.update_layout(
-                            title=f"Volume Transaksi {selected_option}",
-                            yaxis_title="Volume",
-                            xaxis_title="Tanggal",
-                            height=400
-                        )
-                        st.plotly_chart(fig_vol, use_container_width=True)
-
-                with tab3:
-                    st.subheader("Analisis Dividen")
-                    try:
-                        df_dividen = get_data_from_csv(f'dataset_dividen/Deviden Yield Percentage {selected_option}.csv')
-                        
-                        if not df_dividen.empty:
-                            # Filter berdasarkan periode yang dipilih
-                            if period == 'custom':
-                                # Untuk rentang tanggal kustom
-                                start_year = pd.to_datetime(start_date).year
-                                end_year = pd.to_datetime(end_date).year
-                                filtered_dividen = df_dividen[
-                                    (df_dividen['Tahun'] >= start_year) & 
-                                    (df_dividen['Tahun'] <= end_year)
-                                ]
-                            elif period != 'max':
-                                # Untuk periode preset
-                                end_year = pd.Timestamp.now().year
-                                years_map = {
-                                    '10y': 10,
-                                    '5y': 5,
-                                    '3y': 3,
-                                    '1y': 1,
-                                    '6mo': 1,  # Untuk periode < 1 tahun, ambil data 1 tahun terakhir
-                                    '3mo': 1,
-                                    '1mo': 1
-                                }
-                                years_back = years_map.get(period, 0)
-                                start_year = end_year - years_back
-                                filtered_dividen = df_dividen[
-                                    (df_dividen['Tahun'] >= start_year)
-                                ]
-                            else:
-                                filtered_dividen = df_dividen.copy()
-
-                            if not filtered_dividen.empty:
-                                col1, col2 = st.columns(2)
-                                with col1:
-                                    fig_div = px.bar(
-                                        filtered_dividen,
-                                        x='Tahun',
-                                        y='Jumlah Dividen',
-                                        title=f"Total Dividen {selected_option} ({selected_period})"
-                                    )
-                                    fig_div.update_layout(
-                                        yaxis_title="Jumlah Dividen (Rp)",
-                                        xaxis_title="Tahun"
-                                    )
-                                    st.plotly_chart(fig_div, use_container_width=True)
-                                
-                                with col2:
-                                    fig_yield = px.bar(
-                                        filtered_dividen,
-                                        x='Tahun',
-                                        y='Yield Percentage',
-                                        title=f"Dividend Yield {selected_option} % ({selected_period})"
-                                    )
-                                    fig_yield.update_layout(
-                                        yaxis_title="Dividend Yield (%)",
-                                        xaxis_title="Tahun"
-                                    )
-                                    st.plotly_chart(fig_yield, use_container_width=True)
-
-                                # Tampilkan statistik untuk periode yang dipilih
-                                st.subheader(f"Statistik Dividen {selected_period}")
-                                stats = {
-                                    'Total Dividen': f"Rp {filtered_dividen['Jumlah Dividen'].sum():,.2f}",
-                                    'Rata-rata Dividen': f"Rp {filtered_dividen['Jumlah Dividen'].mean():,.2f}",
-                                    'Dividen Tertinggi': f"Rp {filtered_dividen['Jumlah Dividen'].max():,.2f}",
-                                    'Rata-rata Yield': f"{filtered_dividen['Yield Percentage'].mean():.2f}%",
-                                    'Yield Tertinggi': f"{filtered_dividen['Yield Percentage'].max():.2f}%"
-                                }
-                                
-                                # Tampilkan statistik dalam format yang lebih menarik
-                                col1, col2, col3, col4, col5 = st.columns(5)
-                                for col, (label, value) in zip(
-                                    [col1, col2, col3, col4, col5], 
-                                    stats.items()
-                                ):
-                                    with col:
-                                        st.metric(label=label, value=value)
-                            else:
-                                st.warning(f"Tidak ada data dividen untuk periode {selected_period}")
-                        else:
-                            st.warning("Data dividen tidak tersedia")
-                        
-                    except FileNotFoundError:
-                        st.warning(f"File data dividen untuk {selected_option} tidak ditemukan")
-                    except Exception as e:
-                        st.error(f"Terjadi kesalahan dalam memproses data dividen: {str(e)}")
+                        value = format_rupiah(stats[label]) if 'Dividen' in label else f"{stats[label]:.2f}%"
+                        st.metric(label=label, value=value)
+            else:
+                st.warning(f"Tidak ada data dividen untuk periode {selected_period}")
+        else:
+            st.warning("Data dividen tidak tersedia")
 
+    except FileNotFoundError:
+        st.warning(f"File data dividen untuk {kode} tidak ditemukan")
+    except Exception as e:
+        st.error(f"Terjadi kesalahan dalam memproses data dividen: {str(e)}")
+
+
+def tab_detail_backtest(ds, kode, df, opsi):
+    """Tab Backtest: kurva ekuitas satu strategi dibanding buy & hold, dan perbandingan semua strategi default"""
+    import plotly.express as px
+    st.subheader("Backtest Strategi")
+    rentang = rentang_periode(opsi['period'], opsi['start_date'], opsi['end_date'])
+
+    # Strategi dividen hanya bermakna dengan event ex-date (bukan total dividen tahunan)
+    strategi = ['MA Crossover', 'Dividen'] if kode in ds.ex_date_tickers([kode]) else ['MA Crossover']
+    if st.session_state.get('bt_jenis') not in strategi:
+        st.session_state.pop('bt_jenis', None)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        jenis = st.radio('Strategi', strategi, horizontal=True, key='bt_jenis')
+        if len(strategi) == 1:
+            st.caption('Strategi dividen butuh data dividen per ex-date')
+    if jenis == 'MA Crossover':
+        with col2:
+            cepat = st.selectbox('MA cepat', MA_BACKTEST[:-1], key='bt_cepat')
+        with col3:
+            lambat = st.selectbox('MA lambat', [p for p in MA_BACKTEST if p > cepat], key='bt_lambat')
+        spec = ('ma', cepat, lambat)
+    else:
+        with col2:
+            sebelum = st.number_input('Beli (hari sebelum ex-date)', min_value=1, max_value=60, key='bt_sebelum')
+        with col3:
+            sesudah = st.number_input('Jual (hari setelah ex-date)', min_value=0, max_value=60, key='bt_sesudah')
+        spec = ('dividen', int(sebelum), int(sesudah))
+
+    hasil = ds.backtest(kode, spec, *rentang)
+    acuan = ds.backtest(kode, ('hold',), *rentang)
+
+    ekuitas = pd.concat([hasil['ekuitas'], acuan['ekuitas']], axis=1)
+    fig = px.line(lttb_long(ekuitas, opsi['n_titik'], var_name='Strategi', value_name='Ekuitas (Rp)'),
+                  x='Tanggal', y='Ekuitas (Rp)', color='Strategi',
+                  title=f"Kurva Ekuitas {kode} ({opsi['selected_period']})")
+    tampilkan_grafik(fig, width='stretch')
+    st.caption(f"Modal {format_rupiah(MODAL)}, 1 lot = {LOT} lembar, biaya beli {FEE_BELI:.2%}, "
+               f"biaya jual {FEE_JUAL:.2%}; sinyal dieksekusi pada harga Open hari berikutnya")
+
+    stats = hasil['statistik']
+    for col, label in zip(st.columns(5), ['Total Return (%)', 'CAGR (%)', 'Max Drawdown (%)', 'Sharpe', 'Transaksi']):
+        with col:
+            value = stats[label]
+            if pd.isna(value):
+                teks = '-'
+            elif '%' in label:
+                teks = f"{value:.2f}%"
+            else:
+                teks = f"{value:,.2f}" if label == 'Sharpe' else f"{value:,}"
+            st.metric(label=label.replace(' (%)', ''), value=teks)
+
+    with st.expander(f"Daftar transaksi ({len(hasil['transaksi'])})"):
+        st.dataframe(hasil['transaksi'], width='stretch')
+
+    st.subheader("Perbandingan Semua Strategi")
+    # Salin karena kolom akan diformat menjadi teks di bawah
+    sweep_df = ds.backtest_sweep([kode], start=rentang[0], end=rentang[1]).droplevel('Emiten').copy()
+    for col in sweep_df.columns:
+        format_kolom = '{:,.0f}' if col == 'Transaksi' else '{:,.2f}'
+        sweep_df[col] = sweep_df[col].apply(lambda x: '-' if pd.isna(x) else format_kolom.format(x))
+    st.dataframe(sweep_df, width='stretch')
+
+
+TAB_DETAIL = [
+    ("📈 Analisis Teknikal", tab_detail_teknikal),
+    ("📊 Analisis Volume", tab_detail_volume),
+    ("💰 Analisis Dividen", tab_detail_dividen),
+    ("🧪 Backtest", tab_detail_backtest),
+]
+
+
+def render_detail(ds, kode, opsi):
+    period, selected_period, n_titik = opsi['period'], opsi['selected_period'], opsi['n_titik']
+
+    # Data dalam periode yang dipilih (binary search pada tanggal, tanpa salinan)
+    df = ds.prices_range(kode, *rentang_periode(period, opsi['start_date'], opsi['end_date']))
+
+    # Cek apakah data tersedia untuk periode yang dipilih
+    if df.empty:
+        semua = ds.prices(kode)
+        earliest_date = semua['Date'].iloc[0]
+        latest_date = semua['Date'].iloc[-1]
+        st.warning(f"""
+        ⚠️ Tidak ada data untuk periode yang dipilih: {selected_period}
+
+        Data {kode} tersedia untuk periode:
+        - Tanggal awal: {earliest_date.strftime('%d %B %Y')}
+        - Tanggal akhir: {latest_date.strftime('%d %B %Y')}
+
+        Silakan pilih periode yang sesuai dengan rentang data yang tersedia.
+        """)
+        st.stop()
+
+    st.info(f"Menampilkan data untuk periode: {selected_period}")
+
+    # Header dan metrics
+    st.markdown(f"<h1 class='main-header'>📊 Analisis Detail {kode}</h1>", unsafe_allow_html=True)
+
+    # Metrics
+    cols = st.columns(4)
+    if len(df) > 0:  # Pastikan ada data sebelum menghitung metrik
+        for col, (label, value) in zip(cols, ringkasan_harga(df).items()):
+            with col:
+                if 'Volume' in label:
+                    st.metric(label, f"{value:,.0f}")
+                else:
+                    st.metric(label, format_rupiah(value))
+
+        # Tabs untuk analisis detail (hanya tab yang dibuka yang dihitung)
+        render_tabs('tab_detail', [
+            (judul, lambda render=render: render(ds, kode, df, opsi))
+            for judul, render in TAB_DETAIL
+        ])
+
+
+# Setiap rerun dicatat profiler; satu rerun bisa diprofil penuh dari panel profiler
+profiler = get_profiler()
+mesin_profil = st.session_state.pop('profil_berikutnya', None)
+with profiler.rerun() as rekaman, profiler.capture(mesin_profil) if mesin_profil else nullcontext():
+    with span('load/dataset'):
+        ds = get_dataset()
+        start_history_updater()
+    pertahankan_widget('metode_korelasi', 'acuan_korelasi', 'bt_jenis', 'bt_cepat', 'bt_lambat',
+                       'mode_live', 'live_emiten', 'live_interval',
+                       window_korelasi=60, window_volatilitas=60, bt_sebelum=10, bt_sesudah=5)
+    with span('render/sidebar'):
+        opsi = sidebar(ds)
+    rekaman['label'] = opsi['emiten']
+    if st.query_params.get('profiler') == '1':
+        render_profiler(profiler)
+
+    # Konten utama
+    if opsi['emiten'] == HALAMAN_PERBANDINGAN:
+        render_perbandingan(ds, opsi)
+
+    elif opsi['emiten'] == HALAMAN_DEBUG:
+        render_debug(ds)
+
+    elif opsi['emiten'] in ds.registry:
+        try:
+            render_detail(ds, opsi['emiten'], opsi)
         except Exception as e:
             st.error(f"Terjadi kesalahan dalam memproses data: {str(e)}")
@@ -0,0 +1,117 @@
+"""
+Benchmark waktu import saat cold start dashboard.
+
+Menjalankan semua import level modul app.py (dibaca dari source-nya, tanpa
+menjalankan Streamlit) di interpreter baru, beberapa kali, lalu mencatat:
+
+- waktu import total (minimum dari beberapa pengulangan)
+- modul dengan waktu import kumulatif terbesar (python -X importtime)
+- modul berat yang seharusnya baru dimuat saat dibutuhkan (MODUL_TERTUNDA)
+  tetapi ikut termuat
+
+Contoh:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --json import.json
+    python -m benchmarks.bench_import --baseline import.json --toleransi 0.25
+
+Skrip keluar dengan kode 1 jika ada modul tertunda yang termuat, atau (dengan
+--baseline) jika waktu import lebih lambat dari baseline melebihi toleransi.
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'app.py')
+
+# Hanya boleh dimuat di jalur kode yang memakainya (grafik, kuotasi, profil, process pool)
+MODUL_TERTUNDA = ['plotly.express', 'yfinance', 'seaborn', 'matplotlib', 'scipy', 'cProfile',
+                  'concurrent.futures.process']
+
+PENGUKUR = """
+import sys, time
+t0 = time.perf_counter()
+{imports}
+detik = time.perf_counter() - t0
+print({{'detik': detik, 'modul': sorted(sys.modules)}})
+"""
+
+
+def app_imports(path=APP):
+    """Pernyataan import level modul di app.py sebagai source Python"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return '\n'.join(ast.get_source_segment(source, node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def run_fresh(imports, importtime=False):
+    """Menjalankan import di interpreter baru; mengembalikan (hasil pengukur, stderr)"""
+    opsi = ['-X', 'importtime'] if importtime else []
+    proses = subprocess.run([sys.executable, *opsi, '-c', PENGUKUR.format(imports=imports)], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return ast.literal_eval(proses.stdout.strip().splitlines()[-1]), proses.stderr
+
+
+def measure(imports, repeat):
+    """
+    Waktu import minimum dari `repeat` interpreter baru, modul yang termuat,
+    dan keluaran -X importtime dari satu interpreter tambahan (tidak ikut
+    diukur karena mencatat setiap import memperlambatnya)
+    """
+    hasil = [run_fresh(imports)[0] for _ in range(repeat)]
+    _, importtime = run_fresh(imports, importtime=True)
+    return min(h['detik'] for h in hasil), hasil[0]['modul'], importtime
+
+
+def slowest(importtime, n=15):
+    """Modul dengan waktu import kumulatif terbesar: list (modul, detik)"""
+    baris = []
+    for line in importtime.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, kumulatif, nama = line[len('import time:'):].split('|')
+        baris.append((nama.strip(), int(kumulatif) / 1e6))
+    return sorted(baris, key=lambda b: b[1], reverse=True)[:n]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='jumlah interpreter baru yang diukur')
+    parser.add_argument('--top', type=int, default=15, help='jumlah modul terlambat yang ditampilkan')
+    parser.add_argument('--json', help='simpan hasil ke file JSON')
+    parser.add_argument('--baseline', help='bandingkan dengan hasil JSON sebelumnya')
+    parser.add_argument('--toleransi', type=float, default=0.25, help='toleransi perlambatan (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    detik, modul, importtime = measure(app_imports(), args.repeat)
+    print(f"import app.py: {detik * 1000:.1f} ms ({len(modul)} modul)")
+    for nama, kumulatif in slowest(importtime, args.top):
+        print(f"  {nama:<50} {kumulatif * 1000:8.1f} ms")
+
+    gagal = False
+    termuat = [nama for nama in MODUL_TERTUNDA if nama in modul]
+    for nama in termuat:
+        print(f"TERMUAT {nama}: modul ini seharusnya baru dimuat saat dibutuhkan")
+        gagal = True
+
+    hasil = {'detik': detik, 'modul': len(modul), 'tertunda_termuat': termuat}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(hasil, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            lama = json.load(f)['detik']
+        if lama > 0 and detik > lama * (1 + args.toleransi):
+            print(f"REGRESI import app.py: {lama * 1000:.1f} ms -> {detik * 1000:.1f} ms")
+            gagal = True
+    return 1 if gagal else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
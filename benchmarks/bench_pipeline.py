@@ -0,0 +1,243 @@
+"""
+Benchmark pipeline data dashboard (tanpa UI).
+
+Menjalankan tahap-tahap pipeline di core/ secara headless dan mencatat
+waktu (minimum dari beberapa pengulangan) serta puncak memori (tracemalloc)
+per tahap:
+
+    csv_parse, store_build, store_build_paralel, store_load, panel_build, filter_periode,
+    perubahan_harga, moving_average, korelasi, dividen
+
+Dataset: CSV bawaan (skala 1) dan dataset sintetis yang diperbesar N kali
+pada jumlah baris dan/atau jumlah emiten.
+
+Contoh:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --scales 10 100 1000 --dimensi rows
+    python -m benchmarks.bench_pipeline --json hasil.json
+    python -m benchmarks.bench_pipeline --baseline hasil.json --toleransi 0.25
+
+Dengan --baseline, skrip keluar dengan kode 1 jika ada tahap yang lebih
+lambat dari baseline melebihi toleransi, sehingga bisa dipakai sebelum deploy.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.correlation import correlation_matrix, log_returns, rolling_correlation  # noqa: E402
+from core.dividends import read_dividend_events, statistik_dividen, total_return, ttm_yield, yearly_dividends  # noqa: E402
+from core.indicators import sma  # noqa: E402
+from core.loader import MODE_PROCESS, MODES, ensure_sources  # noqa: E402
+from core.panel import FILL_FFILL, build_panel  # noqa: E402
+from core.price_store import PriceStore, parse_price_csv  # noqa: E402
+from core.registry import DEFAULT_REGISTRY, load_registry  # noqa: E402
+from core.periode import PERIODE, rentang_periode  # noqa: E402
+from core.rollup import hitung_perubahan_harga  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MA_PERIODS = [5, 20, 50, 200]
+
+
+# ----------------------------------------------------------------------
+# Dataset
+# ----------------------------------------------------------------------
+def bundled_dataset():
+    """Dataset bawaan repo (registry emiten.csv): dict kode -> (path CSV harga, path CSV dividen)"""
+    registry = load_registry(os.path.join(ROOT, DEFAULT_REGISTRY))
+    return {kode: (emiten.harga, emiten.dividen) for kode, emiten in registry.items() if emiten.dividen}
+
+
+def synthetic_dataset(folder, n_tickers, n_rows, seed=0):
+    """
+    Membuat CSV harga dan dividen sintetis (random walk) dengan skema yang sama
+    seperti *_fix.csv dan dataset_dividen/
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end='2024-05-31', periods=n_rows)
+    hasil = {}
+    for i in range(n_tickers):
+        kode = f"S{i:04d}"
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+        spread = np.abs(rng.normal(0, 0.01, n_rows)) * close
+        df = pd.DataFrame({
+            'Date': dates.strftime('%Y-%m-%d'),
+            'Open': np.round(close + rng.normal(0, 0.005, n_rows) * close),
+            'High': np.round(close + spread),
+            'Low': np.round(close - spread),
+            'Close': np.round(close),
+            'Volume': rng.integers(1_000, 100_000_000, n_rows),
+        })
+        for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
+            df[f'{col}_normalized'] = (df[col] - df[col].min()) / (df[col].max() - df[col].min())
+        path = os.path.join(folder, f"{kode.lower()}_fix.csv")
+        df.to_csv(path, index=False)
+
+        tahun = np.arange(dates[0].year, dates[-1].year + 1)
+        dividen = pd.DataFrame({'Tahun': tahun, 'Jumlah Dividen': np.round(rng.uniform(0, 100, len(tahun)), 2)})
+        div_path = os.path.join(folder, f"Deviden Yield Percentage {kode}.csv")
+        dividen.to_csv(div_path, index=False)
+        hasil[kode] = (path, div_path)
+    return hasil
+
+
+# ----------------------------------------------------------------------
+# Tahap pipeline
+# ----------------------------------------------------------------------
+def stages(dataset, store_root, workers=None, mode=MODE_PROCESS):
+    """Daftar (nama tahap, fungsi) dengan state yang dibagi antar tahap"""
+    state = {}
+
+    def csv_parse():
+        state['frames'] = {kode: parse_price_csv(path) for kode, (path, _) in dataset.items()}
+
+    def store_build():
+        store = PriceStore(store_root)
+        for path, _ in dataset.values():
+            store.build(path)
+
+    def store_build_paralel():
+        sources = {kode: path for kode, (path, _) in dataset.items()}
+        ensure_sources(PriceStore(store_root), sources, workers, mode, force=True)
+
+    def store_load():
+        store = PriceStore(store_root)
+        state['frames'] = {kode: store.load(path) for kode, (path, _) in dataset.items()}
+
+    def panel_build():
+        state['panel'] = build_panel(state['frames']).with_fill(FILL_FFILL).with_fill('none')
+
+    def filter_periode():
+        panel = state['panel']
+        akhir = panel.index[-1]
+        store = PriceStore(store_root)
+        for period in PERIODE:
+            rentang = rentang_periode(period, now=akhir)
+            panel.slice(*rentang).field('Close')
+            for path, _ in dataset.values():
+                store.load_range(path, *rentang)
+
+    def perubahan_harga():
+        for df in state['frames'].values():
+            for periode in ['D', 'W', 'M', 'Y']:
+                hitung_perubahan_harga(df, periode)
+
+    def moving_average():
+        close = state['panel'].with_fill(FILL_FFILL).arrays['Close']
+        for window in MA_PERIODS:
+            sma(close, window)
+
+    def korelasi():
+        ret = log_returns(state['panel'])
+        correlation_matrix(ret)
+        if ret.shape[1] <= 50:  # jumlah pasangan tumbuh kuadratik; ribuan emiten tidak muat di memori
+            rolling_correlation(ret, 60)
+
+    def dividen():
+        panel = state['panel']
+        events = {kode: read_dividend_events(div) for kode, (_, div) in dataset.items()}
+        statistik_dividen(yearly_dividends(panel, events), ttm_yield(panel, events))
+        total_return(panel, events)
+
+    return [
+        ('csv_parse', csv_parse),
+        ('store_build', store_build),
+        ('store_build_paralel', store_build_paralel),
+        ('store_load', store_load),
+        ('panel_build', panel_build),
+        ('filter_periode', filter_periode),
+        ('perubahan_harga', perubahan_harga),
+        ('moving_average', moving_average),
+        ('korelasi', korelasi),
+        ('dividen', dividen),
+    ]
+
+
+def measure(fn, repeat):
+    """Waktu minimum (detik) dari `repeat` kali jalan dan puncak memori (byte) satu kali jalan"""
+    waktu = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        waktu.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(waktu), peak
+
+
+def run_dataset(nama, dataset, repeat, workers=None, mode=MODE_PROCESS):
+    hasil = []
+    with tempfile.TemporaryDirectory() as store_root:
+        for stage, fn in stages(dataset, store_root, workers, mode):
+            detik, peak = measure(fn, repeat)
+            hasil.append({'dataset': nama, 'tahap': stage, 'detik': detik, 'peak_mb': peak / 2**20})
+            print(f"{nama:<22} {stage:<20} {detik * 1000:10.2f} ms {peak / 2**20:10.2f} MB", flush=True)
+    return hasil
+
+
+def compare(hasil, baseline_path, toleransi):
+    """Membandingkan dengan baseline JSON; mengembalikan daftar regresi"""
+    with open(baseline_path) as f:
+        baseline = {(r['dataset'], r['tahap']): r for r in json.load(f)}
+    regresi = []
+    for r in hasil:
+        lama = baseline.get((r['dataset'], r['tahap']))
+        if lama and lama['detik'] > 0 and r['detik'] > lama['detik'] * (1 + toleransi):
+            regresi.append((r['dataset'], r['tahap'], lama['detik'], r['detik']))
+    return regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='*', default=[10, 100],
+                        help='faktor skala dataset sintetis (default: 10 100)')
+    parser.add_argument('--dimensi', choices=['rows', 'tickers', 'both'], default='both',
+                        help='dimensi yang diperbesar: jumlah baris, jumlah emiten, atau keduanya (terpisah)')
+    parser.add_argument('--repeat', type=int, default=3, help='jumlah pengulangan per tahap')
+    parser.add_argument('--workers', type=int, help='jumlah worker untuk store_build_paralel (default: jumlah CPU)')
+    parser.add_argument('--mode', choices=MODES, default=MODE_PROCESS, help='jenis pool untuk store_build_paralel')
+    parser.add_argument('--tanpa-bawaan', action='store_true', help='lewati dataset CSV bawaan')
+    parser.add_argument('--json', help='simpan hasil ke file JSON')
+    parser.add_argument('--baseline', help='bandingkan dengan hasil JSON sebelumnya')
+    parser.add_argument('--toleransi', type=float, default=0.25, help='toleransi perlambatan (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    hasil = []
+    if not args.tanpa_bawaan:
+        hasil += run_dataset('bawaan', bundled_dataset(), args.repeat, args.workers, args.mode)
+
+    base_tickers, base_rows = 4, 4500  # kira-kira ukuran dataset bawaan
+    dimensi = ['rows', 'tickers'] if args.dimensi == 'both' else [args.dimensi]
+    for scale in args.scales:
+        for dim in dimensi:
+            n_tickers = base_tickers * scale if dim == 'tickers' else base_tickers
+            n_rows = base_rows * scale if dim == 'rows' else base_rows
+            with tempfile.TemporaryDirectory() as folder:
+                dataset = synthetic_dataset(folder, n_tickers, n_rows)
+                hasil += run_dataset(f"{dim}x{scale} ({n_tickers}x{n_rows})", dataset, args.repeat, args.workers, args.mode)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(hasil, f, indent=2)
+
+    if args.baseline:
+        regresi = compare(hasil, args.baseline, args.toleransi)
+        for dataset, tahap, lama, baru in regresi:
+            print(f"REGRESI {dataset} {tahap}: {lama * 1000:.2f} ms -> {baru * 1000:.2f} ms")
+        return 1 if regresi else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
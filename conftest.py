@@ -0,0 +1,34 @@
+"""Fixture bersama untuk tests/ (pytest menambahkan folder ini ke sys.path sehingga `core` bisa diimpor)"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def harga_adro():
+    """Histori harga ADRO bawaan repo (DataFrame 'Date' + OHLCV)"""
+    from core.price_store import parse_price_csv
+
+    return parse_price_csv(os.path.join(ROOT, 'adro_fix.csv'))
+
+
+@pytest.fixture
+def ohlcv_sintetis():
+    """Factory OHLCV random walk: ohlcv_sintetis(n, tanggal=None, seed=0)"""
+    def buat(n, tanggal=None, seed=0):
+        rng = np.random.default_rng(seed)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        spread = np.abs(rng.normal(0, 0.01, n)) * close
+        return pd.DataFrame({
+            'Date': pd.bdate_range('2020-01-01', periods=n) if tanggal is None else pd.DatetimeIndex(tanggal),
+            'Open': close + rng.normal(0, 0.005, n) * close,
+            'High': close + spread,
+            'Low': close - spread,
+            'Close': close,
+            'Volume': rng.integers(1_000, 1_000_000, n).astype(np.float64),
+        })
+    return buat
@@ -0,0 +1 @@
+"""Modul inti (tanpa UI) untuk dashboard analisis saham pertambangan"""
@@ -0,0 +1,276 @@
+"""
+Backtest strategi MA crossover dan dividen atas histori harga tersimpan.
+
+Aturan simulasi (long-only, satu emiten per backtest):
+- sinyal dihitung dari Close hari t dan dieksekusi pada Open hari t+1
+  (Close jika Open kosong), sehingga tidak ada lookahead
+- ukuran posisi: seluruh kas dibelikan kelipatan lot BEI (100 lembar)
+  setelah biaya beli; sisa kas tidak berbunga
+- biaya beli/jual dalam persen nilai transaksi (pajak jual termasuk biaya jual)
+- dividen diterima tunai jika saham dipegang pada hari sebelum ex-date;
+  hanya event ex-date sebenarnya yang dipakai (total dividen tahunan tanpa
+  tanggal ex-date diabaikan, lihat core.dividends)
+
+Sinyal, posisi, arus dividen dan kurva ekuitas dihitung vektor per hari;
+yang diiterasi hanya daftar transaksi (puluhan per backtest) karena jumlah
+lot bergantung pada kas hasil transaksi sebelumnya. Sweep parameter untuk
+banyak emiten dijalankan paralel per emiten (lihat sweep).
+
+Spesifikasi strategi berupa tuple:
+    ('hold',)                      beli di hari pertama dan tahan
+    ('ma', cepat, lambat)          long selama SMA cepat > SMA lambat
+    ('dividen', sebelum, sesudah)  long dari `sebelum` hari perdagangan sebelum
+                                   ex-date hingga `sesudah` hari setelahnya
+                                   (hanya bermakna untuk data event ex-date,
+                                   lihat STRATEGI_DIVIDEN)
+
+CLI (sweep semua emiten di registry):
+    python -m core.backtest --workers 4 --mode process
+"""
+import math
+import time
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from core.indicators import sma
+from core.loader import MODE_PROCESS, executor
+from core.performance import HARI_PER_TAHUN
+from core.periode import range_slice
+
+LOT = 100                   # lembar per lot di BEI
+FEE_BELI = 0.0015           # 0.15%
+FEE_JUAL = 0.0025           # 0.15% + PPh final 0.1%
+MODAL = 100_000_000         # Rp
+
+MA_PERIODS = (5, 20, 50, 200)
+STRATEGI_DEFAULT = (
+    ('hold',),
+    *(('ma', cepat, lambat) for cepat, lambat in combinations(MA_PERIODS, 2)),
+)
+# Ditambahkan ke sweep hanya untuk emiten dengan event ex-date
+STRATEGI_DIVIDEN = (
+    ('dividen', 10, 5),
+    ('dividen', 20, 5),
+)
+
+KOLOM_STATISTIK = ['Total Return (%)', 'CAGR (%)', 'Max Drawdown (%)', 'Sharpe', 'Transaksi',
+                   'Win Rate (%)', 'Exposure (%)', 'Biaya (Rp)', 'Dividen (Rp)', 'Ekuitas Akhir (Rp)']
+KOLOM_TRANSAKSI = ['Beli', 'Jual', 'Lembar', 'Harga Beli', 'Harga Jual', 'Dividen', 'Laba/Rugi', 'Return (%)']
+
+
+def label(spec):
+    """Nama strategi untuk tampilan, mis. 'MA 20/50'"""
+    jenis = spec[0]
+    if jenis == 'hold':
+        return 'Buy & Hold'
+    if jenis == 'ma':
+        return f"MA {spec[1]}/{spec[2]}"
+    if jenis == 'dividen':
+        return f"Dividen -{spec[1]}/+{spec[2]}"
+    raise ValueError(f"Strategi tidak dikenal: {spec}")
+
+
+def dividend_array(dates, events):
+    """
+    Dividen per saham pada hari perdagangan pertama >= ex-date (array sepanjang
+    dates); event tanpa ex-date sebenarnya dan event di luar rentang histori
+    harga diabaikan, sama seperti core.dividends.event_matrix
+    """
+    div = np.zeros(len(dates))
+    if events is None or events.empty or not len(dates):
+        return div
+    if 'Ex-date' in events:
+        events = events[events['Ex-date'].astype(bool)]
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    ex = events['Date'].to_numpy(dtype='datetime64[ns]')
+    posisi = np.searchsorted(dates, ex)
+    ada = (posisi < len(dates)) & (ex >= dates[0])
+    np.add.at(div, posisi[ada], events['Dividen'].to_numpy(dtype=np.float64)[ada])
+    return div
+
+
+def positions(spec, close, dividen):
+    """
+    Posisi (bool) yang dipegang pada tiap hari, sudah digeser ke hari eksekusi:
+    True pada hari t berarti saham dibeli/dipegang sejak Open hari t
+    """
+    n = len(close)
+    jenis = spec[0]
+    if jenis == 'hold':
+        return np.ones(n, dtype=bool)
+    if jenis == 'ma':
+        _, cepat, lambat = spec
+        if cepat >= lambat:
+            raise ValueError(f"MA cepat harus lebih kecil dari MA lambat: {spec}")
+        with np.errstate(invalid='ignore'):
+            sinyal = sma(close, cepat)[:, 0] > sma(close, lambat)[:, 0]
+        return np.r_[False, sinyal[:-1]]
+    if jenis == 'dividen':
+        _, sebelum, sesudah = spec
+        if sebelum < 1:
+            raise ValueError(f"Saham harus dibeli paling lambat sehari sebelum ex-date: {spec}")
+        ex = np.flatnonzero(dividen > 0)
+        penanda = np.zeros(n + 1)
+        np.add.at(penanda, np.clip(ex - sebelum, 0, n), 1)
+        np.add.at(penanda, np.clip(ex + sesudah, 0, n), -1)
+        return np.cumsum(penanda)[:n] > 0
+    raise ValueError(f"Strategi tidak dikenal: {spec}")
+
+
+def simulate(dates, open_, close, dividen, held, modal=MODAL, lot=LOT, fee_beli=FEE_BELI, fee_jual=FEE_JUAL):
+    """
+    Menjalankan posisi `held` dengan lot, biaya dan dividen
+
+    Returns:
+    (ekuitas harian, DataFrame transaksi); posisi yang masih terbuka di akhir
+    dinilai dengan Close terakhir tanpa biaya jual
+    """
+    n = len(close)
+    harga = np.where(np.isfinite(open_) & (open_ > 0), open_, close)
+    sebelumnya = np.r_[False, held[:-1]]
+    masuk = np.flatnonzero(held & ~sebelumnya)
+    keluar = np.flatnonzero(~held & sebelumnya)
+    if len(keluar) < len(masuk):
+        keluar = np.r_[keluar, n]
+
+    lembar = np.zeros(n)
+    arus_kas = np.zeros(n)
+    transaksi = []
+    kas = modal
+    for i, j in zip(masuk, keluar):
+        jumlah = math.floor(kas / (harga[i] * lot * (1 + fee_beli))) * lot
+        if jumlah <= 0:
+            continue
+        beli = jumlah * harga[i] * (1 + fee_beli)
+        # dividen dengan ex-date di (i, j]: saham masih dipegang pada hari sebelumnya
+        div = jumlah * dividen[i + 1:min(j, n - 1) + 1]
+        harga_jual = harga[j] if j < n else close[-1]
+        jual = jumlah * harga_jual * ((1 - fee_jual) if j < n else 1.0)
+
+        lembar[i:j] = jumlah
+        arus_kas[i] -= beli
+        arus_kas[i + 1:i + 1 + len(div)] += div
+        if j < n:
+            arus_kas[j] += jual
+        kas += jual + div.sum() - beli
+        transaksi.append((dates[i], dates[j] if j < n else pd.NaT, jumlah, harga[i], harga_jual,
+                          div.sum(), jual + div.sum() - beli, (jual + div.sum()) / beli * 100 - 100))
+
+    ekuitas = modal + np.cumsum(arus_kas) + lembar * close
+    return ekuitas, pd.DataFrame(transaksi, columns=KOLOM_TRANSAKSI)
+
+
+def statistik(dates, ekuitas, transaksi, held, modal=MODAL, fee_beli=FEE_BELI, fee_jual=FEE_JUAL):
+    """Ringkasan hasil backtest (dict, lihat KOLOM_STATISTIK)"""
+    if not len(ekuitas):
+        return dict.fromkeys(KOLOM_STATISTIK, np.nan)
+    hari = (pd.Timestamp(dates[-1]) - pd.Timestamp(dates[0])).days
+    total = ekuitas[-1] / modal
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ret = np.diff(ekuitas) / ekuitas[:-1]
+        sharpe = ret.mean() / ret.std(ddof=1) * np.sqrt(HARI_PER_TAHUN) if len(ret) > 1 else np.nan
+    nilai_beli = (transaksi['Lembar'] * transaksi['Harga Beli']).sum()
+    nilai_jual = (transaksi['Lembar'] * transaksi['Harga Jual'])[transaksi['Jual'].notna()].sum()
+    return {
+        'Total Return (%)': (total - 1) * 100,
+        'CAGR (%)': (total ** (365.25 / hari) - 1) * 100 if hari > 0 and total > 0 else np.nan,
+        'Max Drawdown (%)': (ekuitas / np.maximum.accumulate(ekuitas) - 1).min() * 100,
+        'Sharpe': sharpe if np.isfinite(sharpe) else np.nan,
+        'Transaksi': len(transaksi),
+        'Win Rate (%)': (transaksi['Laba/Rugi'] > 0).mean() * 100 if len(transaksi) else np.nan,
+        'Exposure (%)': held.mean() * 100,
+        'Biaya (Rp)': nilai_beli * fee_beli + nilai_jual * fee_jual,
+        'Dividen (Rp)': transaksi['Dividen'].sum(),
+        'Ekuitas Akhir (Rp)': ekuitas[-1],
+    }
+
+
+def run_backtest(dates, open_, close, dividen, spec, start=None, end=None,
+                 modal=MODAL, lot=LOT, fee_beli=FEE_BELI, fee_jual=FEE_JUAL):
+    """
+    Backtest satu strategi pada satu emiten
+
+    Sinyal dihitung atas histori penuh (agar MA sudah terbentuk di awal
+    rentang) lalu disimulasikan hanya dalam rentang [start, end].
+
+    Parameters:
+    dates, open_, close : array histori harian emiten (terurut)
+    dividen : dividen per saham per hari (lihat dividend_array)
+    spec : spesifikasi strategi (lihat docstring modul)
+
+    Returns:
+    dict dengan 'ekuitas' (Series), 'posisi' (Series bool), 'transaksi' dan 'statistik'
+    """
+    dates = pd.DatetimeIndex(dates)
+    close = np.asarray(close, dtype=np.float64)
+    held = positions(spec, close, dividen)
+    # posisi yang sudah aktif di awal rentang dibuka pada hari pertama rentang
+    s = range_slice(dates, start, end)
+    dates, held = dates[s], held[s]
+    open_, close, dividen = np.asarray(open_, dtype=np.float64)[s], close[s], dividen[s]
+
+    ekuitas, transaksi = simulate(dates, open_, close, dividen, held, modal, lot, fee_beli, fee_jual)
+    return {
+        'ekuitas': pd.Series(ekuitas, index=dates, name=label(spec)),
+        'posisi': pd.Series(held, index=dates, name=label(spec)),
+        'transaksi': transaksi,
+        'statistik': statistik(dates, ekuitas, transaksi, held, modal, fee_beli, fee_jual),
+    }
+
+
+def _sweep_ticker(kode, dates, open_, close, dividen, specs, start, end, opsi):
+    # Fungsi level modul agar bisa dikirim ke process pool
+    return [
+        {'Emiten': kode, 'Strategi': label(spec),
+         **run_backtest(dates, open_, close, dividen, spec, start, end, **opsi)['statistik']}
+        for spec in specs
+    ]
+
+
+def sweep(data, specs=STRATEGI_DEFAULT, start=None, end=None, max_workers=None, mode=MODE_PROCESS, **opsi):
+    """
+    Menjalankan semua strategi untuk semua emiten, paralel per emiten
+
+    Parameters:
+    data : dict kode -> (dates, open, close, dividen) sebagai array NumPy
+    specs : daftar spesifikasi strategi
+    mode : 'process' atau 'thread' (lihat core.loader)
+    opsi : modal, lot, fee_beli, fee_jual
+
+    Returns:
+    DataFrame statistik (lihat KOLOM_STATISTIK) dengan index (Emiten, Strategi)
+    """
+    specs = list(specs)
+    if len(data) <= 1:
+        baris = [b for kode, arr in data.items() for b in _sweep_ticker(kode, *arr, specs, start, end, opsi)]
+    else:
+        with executor(mode, min(len(data), max_workers or len(data))) as pool:
+            futures = [pool.submit(_sweep_ticker, kode, *arr, specs, start, end, opsi) for kode, arr in data.items()]
+            baris = [b for future in futures for b in future.result()]
+    if not baris:
+        return pd.DataFrame(columns=KOLOM_STATISTIK,
+                            index=pd.MultiIndex.from_tuples([], names=['Emiten', 'Strategi']))
+    return pd.DataFrame(baris).set_index(['Emiten', 'Strategi'])[KOLOM_STATISTIK]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core.dataset import Dataset
+    from core.loader import MODES
+    from core.registry import DEFAULT_REGISTRY
+
+    parser = argparse.ArgumentParser(description='Sweep backtest semua strategi default untuk semua emiten di registry')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--mode', choices=MODES, default=MODE_PROCESS)
+    args = parser.parse_args()
+
+    ds = Dataset(args.registry)
+    t0 = time.perf_counter()
+    hasil = ds.backtest_sweep(workers=args.workers, mode=args.mode)
+    with pd.option_context('display.width', 200, 'display.max_rows', None, 'display.float_format', '{:,.2f}'.format):
+        print(hasil)
+    print(f"{len(hasil)} backtest dalam {time.perf_counter() - t0:.3f} s ({args.mode})")
@@ -0,0 +1,146 @@
+"""
+Cache komputasi bersama (lintas sesi) dengan batas memori LRU.
+
+Kunci cache sebaiknya memuat (nama fungsi, himpunan emiten, rentang tanggal,
+versi data) sehingga hasil otomatis tidak terpakai lagi ketika data berubah.
+Nilai dikembalikan apa adanya tanpa pickle/salin (seperti st.cache_resource),
+jadi hasil yang disimpan harus diperlakukan sebagai read-only.
+
+Jumlah hit/miss/eviction dicatat untuk ditampilkan di halaman debug; waktu
+komputasi setiap miss dicatat profiler sebagai tahap 'compute/<nama fungsi>'.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.profiler import span
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(value, _depth=0):
+    """Perkiraan ukuran objek di memori (byte)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        size = value.memory_usage(index=True, deep=False)
+        return int(size.sum() if isinstance(size, pd.Series) else size)
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if _depth > 4:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v, _depth + 1) for v in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v, _depth + 1) for v in value)
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + estimate_size(vars(value), _depth + 1)
+    return sys.getsizeof(value)
+
+
+class ComputeCache:
+    """
+    Cache LRU dengan batas total memori
+
+    Parameters:
+    max_bytes : batas total ukuran nilai yang disimpan
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (nilai, ukuran)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._inflight = {}         # key -> Event, agar komputasi yang sama tidak jalan berulang
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            lama = self._data.pop(key, None)
+            if lama is not None:
+                self._bytes -= lama[1]
+            if size > self.max_bytes:
+                return value  # terlalu besar untuk disimpan
+            self._data[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                _, (_, ukuran) = self._data.popitem(last=False)
+                self._bytes -= ukuran
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Mengambil nilai dari cache atau menghitungnya sekali
+
+        Jika beberapa sesi meminta kunci yang sama bersamaan, hanya satu yang
+        menghitung; yang lain menunggu hasilnya.
+        """
+        sentinel = object()
+        while True:
+            with self._lock:
+                value = self.get(key, sentinel)
+                if value is not sentinel:
+                    return value
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            event.wait()
+        try:
+            with span(f"compute/{key[0] if isinstance(key, tuple) else key}"):
+                value = compute()
+            return self.put(key, value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def invalidate(self, predicate=None):
+        """Menghapus entri (semua, atau yang kuncinya memenuhi predicate)"""
+        with self._lock:
+            for key in [k for k in self._data if predicate is None or predicate(k)]:
+                _, ukuran = self._data.pop(key)
+                self._bytes -= ukuran
+
+    def stats(self):
+        """Ringkasan metrik cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entri': len(self._data),
+                'memori_mb': self._bytes / (1024 * 1024),
+                'batas_mb': self.max_bytes / (1024 * 1024),
+                'hit': self.hits,
+                'miss': self.misses,
+                'eviction': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def entries(self):
+        """Daftar (nama fungsi, ukuran byte) per entri, dari yang paling lama dipakai"""
+        with self._lock:
+            return [(key[0] if isinstance(key, tuple) else key, size) for key, (_, size) in self._data.items()]
@@ -0,0 +1,183 @@
+"""
+Engine korelasi berbasis log return pada panel yang sejajar per tanggal.
+
+- Matriks korelasi (pairwise complete) dihitung dengan perkalian matriks,
+  tanpa loop Python per pasangan emiten.
+- Korelasi bergulir memakai jumlah kumulatif (running sums) untuk semua
+  pasangan sekaligus, sehingga biayanya O(n) per pasangan berapa pun window-nya.
+- Varian EWMA memakai rata-rata berbobot eksponensial pandas (ewm) untuk
+  semua pasangan sekaligus, tanpa loop Python per hari.
+
+Hasil disimpan di ComputeCache per (jenis, emiten, window, rentang, versi).
+"""
+import numpy as np
+import pandas as pd
+
+from core.cache import ComputeCache
+from core.panel import FILL_FFILL, FILL_NONE
+from core.periode import range_slice
+
+
+def log_returns(panel):
+    """
+    Log return harian per emiten (DataFrame tanggal x emiten)
+
+    Return dihitung antar hari perdagangan emiten itu sendiri: hari tanpa
+    transaksi bernilai NaN, dan return hari berikutnya dihitung dari harga
+    terakhir sebelum jeda.
+    """
+    raw = panel.with_fill(FILL_NONE).arrays['Close']
+    filled = panel.with_fill(FILL_FFILL).arrays['Close']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logp = np.log(filled)
+    ret = np.diff(logp, axis=0, prepend=np.nan)
+    ret[np.isnan(raw)] = np.nan
+    return pd.DataFrame(ret, index=panel.index, columns=panel.tickers)
+
+
+def _pair_sums(x, valid):
+    """Jumlah-jumlah per pasangan (hanya baris yang valid di kedua emiten)"""
+    m = valid.astype(np.float64)
+    n = m.T @ m
+    sx = x.T @ m            # sx[i, j] = jumlah x_i saat i dan j valid
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+    return n, sx, sxx, sxy
+
+
+def _corr_from_sums(n, sx, sy, sxx, syy, sxy, min_periods):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        corr = cov / np.sqrt(var)
+    corr[(n < min_periods) | ~(var > 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(returns, min_periods=2):
+    """
+    Matriks korelasi Pearson pairwise-complete (setara DataFrame.corr())
+
+    Parameters:
+    returns : DataFrame tanggal x emiten (boleh berisi NaN)
+    """
+    x = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    x = np.where(valid, x, 0.0)
+    n, sx, sxx, sxy = _pair_sums(x, valid)
+    corr = _corr_from_sums(n, sx, sx.T, sxx, sxx.T, sxy, min_periods)
+    np.fill_diagonal(corr, 1.0)
+    return pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
+
+
+def _pairs(returns):
+    """Indeks dan label semua pasangan emiten (segitiga atas), serta data return yang sudah dibersihkan"""
+    tickers = list(returns.columns)
+    iu, ju = np.triu_indices(len(tickers), k=1)
+    labels = [f"{tickers[i]}-{tickers[j]}" for i, j in zip(iu, ju)]
+    x = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    return iu, ju, labels, np.where(valid, x, 0.0), valid.astype(np.float64)
+
+
+def rolling_correlation(returns, window, min_periods=None):
+    """
+    Korelasi bergulir semua pasangan emiten dengan running sums
+
+    Setiap jumlah (n, Σx, Σy, Σx², Σy², Σxy) dihitung dengan cumsum lalu
+    dikurangi cumsum window sebelumnya, untuk semua pasangan sekaligus.
+
+    min_periods : jumlah minimum observasi bersama (kedua emiten
+    diperdagangkan) dalam window; default window // 2 seperti
+    core.performance.rolling_volatility, agar satu hari libur salah satu
+    emiten tidak mengosongkan `window` baris berikutnya
+
+    Returns:
+    DataFrame tanggal x pasangan ('A-B')
+    """
+    min_periods = max(2, window // 2 if min_periods is None else min_periods)
+    iu, ju, labels, x, m = _pairs(returns)
+    xi, xj, mi, mj = x[:, iu], x[:, ju], m[:, iu], m[:, ju]
+
+    def bergulir(a):
+        cs = np.cumsum(a, axis=0)
+        cs[window:] -= cs[:-window].copy()
+        return cs
+
+    corr = _corr_from_sums(
+        bergulir(mi * mj), bergulir(xi * mj), bergulir(xj * mi),
+        bergulir(xi * xi * mj), bergulir(xj * xj * mi), bergulir(xi * xj), min_periods,
+    )
+    return pd.DataFrame(corr, index=returns.index, columns=labels)
+
+
+def ewm_correlation(returns, span):
+    """
+    Korelasi berbobot eksponensial (EWMA) semua pasangan emiten
+
+    Rata-rata berbobot x, y, x², y² dan xy dihitung dengan ewm().mean()
+    pandas (berjalan di C) untuk semua pasangan sekaligus. Hari ketika salah
+    satu emiten tidak diperdagangkan dilewati (ignore_na) sehingga tidak
+    mengubah bobot pasangan tersebut. Korelasi baru ditampilkan setelah
+    `span` observasi bersama. Untuk pasangan tanpa data kosong hasilnya setara
+    Series.ewm(span=span).corr() pandas (adjust=True).
+
+    Returns:
+    DataFrame tanggal x pasangan ('A-B')
+    """
+    iu, ju, labels, x, m = _pairs(returns)
+    pm = m[:, iu] * m[:, ju]
+    xi = np.where(pm > 0, x[:, iu], np.nan)
+    xj = np.where(pm > 0, x[:, ju], np.nan)
+
+    def rata(a):
+        return pd.DataFrame(a).ewm(span=span, ignore_na=True).mean().to_numpy()
+
+    ex, ey = rata(xi), rata(xj)
+    corr = _corr_from_sums(np.ones_like(ex), ex, ey, rata(xi * xi), rata(xj * xj), rata(xi * xj), 0.0)
+    corr[np.cumsum(pm, axis=0) < span] = np.nan
+    return pd.DataFrame(corr, index=returns.index, columns=labels)
+
+
+class CorrelationEngine:
+    """
+    Korelasi return dengan cache per (jenis, emiten, parameter, rentang, isi panel)
+
+    Korelasi bergulir/EWMA dihitung atas histori penuh lalu dipotong ke
+    rentang yang diminta, sehingga nilai awal rentang tetap memakai data
+    sebelumnya. Kunci cache memakai panel.key (bukan versi saja), jadi panel
+    hasil slice() tidak membaca hasil histori penuh.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ComputeCache()
+
+    def returns(self, panel):
+        return self.cache.get_or_compute(
+            ('korelasi_return', tuple(panel.tickers), panel.key), lambda: log_returns(panel)
+        )
+
+    def matrix(self, panel, start=None, end=None):
+        """Matriks korelasi log return dalam rentang [start, end]"""
+        def hitung():
+            ret = self.returns(panel)
+            return correlation_matrix(ret.iloc[range_slice(ret.index, start, end)])
+        return self.cache.get_or_compute(
+            ('korelasi_matriks', tuple(panel.tickers), start, end, panel.key), hitung
+        )
+
+    def rolling(self, panel, window, start=None, end=None, method='rolling'):
+        """
+        Korelasi bergulir ('rolling') atau EWMA ('ewm') per pasangan
+
+        Returns:
+        DataFrame tanggal x pasangan ('A-B')
+        """
+        def penuh():
+            ret = self.returns(panel)
+            return ewm_correlation(ret, window) if method == 'ewm' else rolling_correlation(ret, window)
+
+        full = self.cache.get_or_compute(
+            ('korelasi_bergulir', method, tuple(panel.tickers), window, panel.key), penuh
+        )
+        return full.iloc[range_slice(full.index, start, end)]
@@ -0,0 +1,313 @@
+"""
+Akses data dashboard tanpa UI: harga, panel, piramida, dividen dan engine analisis.
+
+Dataset menyatukan price store dan cache komputasi sehingga pipeline yang
+sama bisa dipakai dari Streamlit, benchmark, maupun job batch:
+
+    ds = Dataset()                      # emiten dari emiten.csv
+    panel = ds.panel()
+    ma = ds.indicators.compute(panel, [('sma', 20)], start='2020-01-01')
+    korelasi = ds.correlation.matrix(panel, start='2020-01-01')
+
+Rentang tanggal diberikan lewat start/end dengan panel penuh, sehingga
+indikator dan korelasi bergulir di awal rentang tetap memakai histori
+sebelumnya; panel.slice() hanya untuk menampilkan potongan data.
+
+Semua hasil disimpan di ComputeCache dengan kunci yang memuat versi data,
+jadi otomatis dihitung ulang ketika price store diperbarui. Hasil dipakai
+bersama (tanpa salinan) dan harus diperlakukan sebagai read-only.
+"""
+import os
+
+import pandas as pd
+
+from core.backtest import STRATEGI_DEFAULT, STRATEGI_DIVIDEN, dividend_array, run_backtest, sweep
+from core.cache import ComputeCache
+from core.correlation import CorrelationEngine
+from core.dividends import KOLOM_EVENT, KOLOM_TAHUNAN, DividendEngine, read_dividend_events
+from core.indicators import IndicatorEngine
+from core.loader import MODE_PROCESS, MODE_THREAD, ensure_sources, load_panel
+from core.panel import FILL_FFILL, combine_versions
+from core.performance import KOLOM_RINGKASAN, PerformanceEngine
+from core.price_store import PriceStore
+from core.registry import DEFAULT_REGISTRY, load_registry
+from core.rollup import build_pyramid, choose_level, hitung_perubahan_harga
+from core.statistik import korelasi_ohlcv
+
+
+class Dataset:
+    """
+    Data harga dan dividen sekumpulan emiten beserta hasil analisis yang di-cache
+
+    Parameters:
+    registry : dict kode -> Emiten (lihat core.registry) atau path file registry
+    store : PriceStore (default: .price_store di direktori kerja)
+    cache : ComputeCache bersama (default: cache baru)
+    workers, mode : ukuran dan jenis pool ('thread' atau 'process') untuk
+        memuat banyak emiten sekaligus (lihat core.loader)
+    """
+
+    def __init__(self, registry=DEFAULT_REGISTRY, store=None, cache=None, workers=None, mode=MODE_THREAD):
+        self.registry = load_registry(registry) if isinstance(registry, str) else dict(registry)
+        self.tickers = list(self.registry)
+        self.store = store if store is not None else PriceStore()
+        self.cache = cache if cache is not None else ComputeCache()
+        self.workers = workers
+        self.mode = mode
+        self.load_timings = {}  # kode -> waktu bangun/muat terakhir (lihat core.loader.load_prices)
+        self.indicators = IndicatorEngine(cache=self.cache)
+        self.correlation = CorrelationEngine(cache=self.cache)
+        self.dividend = DividendEngine(cache=self.cache)
+        self.performance = PerformanceEngine(cache=self.cache)
+
+    def name(self, kode):
+        return self.registry[kode].nama
+
+    def price_path(self, kode):
+        return self.registry[kode].harga
+
+    def dividend_path(self, kode):
+        """Path CSV dividen, atau None jika emiten tidak punya data dividen"""
+        return self.registry[kode].dividen
+
+    def cached(self, nama, kunci, fungsi):
+        """
+        Mengambil hasil komputasi dari cache bersama, atau menghitungnya sekali
+
+        kunci sebaiknya memuat emiten, rentang tanggal dan versi data.
+        """
+        return self.cache.get_or_compute((nama, *kunci), fungsi)
+
+    def version(self, kode):
+        return self.store.version(self.price_path(kode))
+
+    def prices(self, kode):
+        """Data harian satu emiten dari price store (tanpa parsing CSV ulang)"""
+        return self.store.load(self.price_path(kode))
+
+    def prices_range(self, kode, start=None, end=None):
+        """Data harian satu emiten dalam rentang [start, end] (potongan tanpa salinan)"""
+        return self.store.load_range(self.price_path(kode), start, end)
+
+    def panel(self, tickers=None):
+        """
+        Panel harga beberapa emiten yang diselaraskan per tanggal, dibangun sekali per versi data
+
+        CSV yang belum ada di price store (atau berubah) di-parse paralel
+        sebelum versi data dibaca, lalu semua emiten dimuat paralel.
+        """
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        sources = {kode: self.price_path(kode) for kode in tickers}
+        bangun = ensure_sources(self.store, sources, self.workers, self.mode)
+        versi = combine_versions([self.version(kode) for kode in tickers])
+
+        def hitung():
+            panel, timings = load_panel(self.store, sources, self.workers, self.mode)
+            for kode, detik in bangun.items():
+                if detik:
+                    timings[kode].update(dibangun=True, bangun_detik=detik)
+            self.load_timings.update(timings)
+            return panel
+
+        return self.cached('panel', (tickers, versi), hitung)
+
+    def ticker_panel(self, kode):
+        """Panel satu emiten (kalender perdagangan emiten itu sendiri) untuk tampilan detail"""
+        return self.panel([kode])
+
+    def pyramid(self, kode):
+        """Piramida OHLCV harian/mingguan/bulanan/tahunan satu emiten, dibangun sekali per versi data"""
+        versi = self.version(kode)
+        return self.cached('piramida', (kode, versi), lambda: build_pyramid(self.prices(kode), versi))
+
+    def dividend_version(self, kode):
+        """Versi file dividen (waktu modifikasi dan ukuran), agar cache ikut basi ketika file diganti"""
+        info = os.stat(self.dividend_path(kode))
+        return f"{info.st_mtime_ns}-{info.st_size}"
+
+    def dividend_events(self, kode):
+        """Event dividen mentah (kolom 'Date', 'Dividen', 'Ex-date'); kosong jika emiten tidak punya data dividen"""
+        if self.dividend_path(kode) is None:
+            return pd.DataFrame(columns=KOLOM_EVENT)
+        return self.cached('dividen_event', (kode, self.dividend_version(kode)),
+                           lambda: read_dividend_events(self.dividend_path(kode)))
+
+    def dividend_tickers(self, tickers=None):
+        """Emiten yang punya data dividen di registry"""
+        tickers = self.tickers if tickers is None else tickers
+        return tuple(kode for kode in tickers if self.dividend_path(kode) is not None)
+
+    def ex_date_tickers(self, tickers=None):
+        """Emiten yang data dividennya berupa event ex-date (bukan hanya total tahunan)"""
+        return tuple(kode for kode in self.dividend_tickers(tickers)
+                     if self.dividend_events(kode)['Ex-date'].astype(bool).any())
+
+    def _dividend_input(self, tickers, end=None):
+        # (panel, events, versi dividen) untuk DividendEngine; end membuang harga dan event sesudahnya
+        events = {kode: self.dividend_events(kode) for kode in tickers}
+        panel = self.panel(tickers)
+        versi = combine_versions([self.dividend_version(kode) for kode in tickers])
+        if end is not None:
+            end = pd.Timestamp(end)
+            panel = panel.slice(None, end)
+            events = {kode: df[df['Date'] <= end] for kode, df in events.items()}
+            versi = combine_versions([versi, str(end)])
+        return panel, events, versi
+
+    def combined_dividends(self, tickers=None, end=None):
+        """
+        Dividen tahunan emiten (yang punya data dividen) dalam satu tabel dengan kolom 'Emiten'
+
+        end : hanya memakai event dan harga sampai tanggal ini (mis. laporan untuk tanggal lampau)
+        """
+        tickers = self.dividend_tickers(tickers)
+        if not tickers:
+            return pd.DataFrame(columns=[*KOLOM_TAHUNAN, 'Emiten'])
+        return self.dividend.yearly(*self._dividend_input(tickers, end))
+
+    def dividends(self, kode):
+        """
+        Dividen tahunan satu emiten dengan 'Rata-rata Close', 'Yield Percentage'
+        dan 'Pertumbuhan Dividen' dari histori harga
+
+        Emiten tanpa data dividen di registry menghasilkan tabel kosong.
+        """
+        gabungan = self.combined_dividends([kode])
+        return gabungan[gabungan['Emiten'] == kode].drop(columns='Emiten').reset_index(drop=True)
+
+    def dividend_stats(self, tickers=None, end=None):
+        """
+        Tabel statistik dividen per emiten termasuk yield TTM terakhir (lihat core.dividends.statistik_dividen)
+
+        end : hanya memakai event dan harga sampai tanggal ini
+        """
+        tickers = self.dividend_tickers(tickers)
+        if not tickers:
+            return pd.DataFrame(columns=['Emiten'])
+        return self.dividend.stats(*self._dividend_input(tickers, end))
+
+    def ttm_yield(self, tickers=None, start=None, end=None):
+        """Dividend yield trailing 12 bulan (%) harian emiten yang punya event ex-date (tanggal x emiten)"""
+        tickers = self.ex_date_tickers(tickers)
+        if not tickers:
+            return pd.DataFrame()
+        return self.dividend.ttm_yield(*self._dividend_input(tickers), start, end)
+
+    def _total_return_input(self, tickers):
+        # (panel, events, versi dividen); emiten tanpa event ex-date memakai harga saja
+        dividen = self.ex_date_tickers(tickers)
+        events = {kode: self.dividend_events(kode) for kode in dividen}
+        return self.panel(tickers), events, combine_versions([self.dividend_version(kode) for kode in dividen])
+
+    def total_return(self, tickers=None, start=None, end=None):
+        """
+        Indeks total return harian (dividen diinvestasikan kembali), 1.0 pada hari
+        perdagangan pertama tiap emiten; emiten tanpa event ex-date (tidak punya
+        data dividen atau hanya dividen tahunan) memakai harga saja
+        """
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        if not tickers:
+            return pd.DataFrame()
+        return self.dividend.total_return(*self._total_return_input(tickers), start, end)
+
+    def _performance_input(self, tickers):
+        # (panel, indeks total return histori penuh, versi harga + dividen) untuk PerformanceEngine
+        panel, events, versi = self._total_return_input(tickers)
+        return panel, self.dividend.total_return(panel, events, versi), combine_versions([panel.version, versi])
+
+    def performance_summary(self, tickers=None, start=None, end=None):
+        """Metrik return dan risiko per emiten dalam rentang [start, end] (lihat core.performance.ringkasan_performa)"""
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        if not tickers:
+            return pd.DataFrame(columns=KOLOM_RINGKASAN)
+        return self.performance.summary(*self._performance_input(tickers), start, end)
+
+    def drawdown(self, tickers=None, start=None, end=None):
+        """Drawdown total return (%) terhadap puncak sejak awal rentang (tanggal x emiten)"""
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        if not tickers:
+            return pd.DataFrame()
+        return self.performance.drawdown(*self._performance_input(tickers), start, end)
+
+    def volatility(self, tickers=None, window=60, start=None, end=None):
+        """Volatilitas bergulir total return yang disetahunkan (%), dihitung atas histori penuh"""
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        if not tickers:
+            return pd.DataFrame()
+        return self.performance.volatility(*self._performance_input(tickers), window, start, end)
+
+    def _backtest_input(self, kode):
+        # (dates, open, close, dividen per hari) dari histori penuh satu emiten
+        dividen = self.dividend_path(kode) is not None
+        versi = (self.version(kode), self.dividend_version(kode) if dividen else None)
+
+        def hitung():
+            df = self.prices(kode)
+            events = self.dividend_events(kode) if dividen else None
+            dates = df['Date'].to_numpy()
+            return dates, df['Open'].to_numpy(), df['Close'].to_numpy(), dividend_array(dates, events)
+
+        return versi, self.cached('backtest_data', (kode, *versi), hitung)
+
+    def backtest(self, kode, spec, start=None, end=None):
+        """
+        Backtest satu strategi pada satu emiten dalam rentang [start, end] (lihat core.backtest.run_backtest)
+
+        Strategi dividen butuh event ex-date; emiten yang hanya punya total
+        dividen tahunan menghasilkan ValueError.
+        """
+        if spec[0] == 'dividen' and kode not in self.ex_date_tickers([kode]):
+            raise ValueError(f"Strategi dividen butuh event dividen per ex-date; {kode} hanya punya dividen tahunan")
+        versi, data = self._backtest_input(kode)
+        return self.cached('backtest', (kode, spec, start, end, *versi), lambda: run_backtest(*data, spec, start, end))
+
+    def backtest_sweep(self, tickers=None, specs=None, start=None, end=None, workers=None, mode=MODE_PROCESS):
+        """
+        Statistik semua strategi x emiten, paralel per emiten (lihat core.backtest.sweep)
+
+        specs default: STRATEGI_DEFAULT, ditambah STRATEGI_DIVIDEN jika semua
+        emiten punya event ex-date
+        """
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        if specs is None:
+            ex_date = len(self.ex_date_tickers(tickers)) == len(tickers)
+            specs = STRATEGI_DEFAULT + STRATEGI_DIVIDEN if tickers and ex_date else STRATEGI_DEFAULT
+        masukan = {kode: self._backtest_input(kode) for kode in tickers}
+        versi = combine_versions([str(v) for v, _ in masukan.values()])
+        return self.cached('backtest_sweep', (tickers, tuple(specs), start, end, versi), lambda: sweep(
+            {kode: data for kode, (_, data) in masukan.items()}, specs, start, end,
+            workers or self.workers, mode
+        ))
+
+    def price_changes(self, tickers=None, start=None, end=None, max_points=0):
+        """
+        Persentase perubahan harga dalam rentang [start, end] pada level
+        piramida paling rinci yang muat dalam max_points titik (0 = harian)
+
+        Returns:
+        (level, DataFrame tanggal x emiten)
+        """
+        tickers = tuple(self.tickers if tickers is None else tickers)
+        panel = self.panel(tickers)
+        harga = panel.with_fill(FILL_FFILL).slice(start, end)
+        level = choose_level(len(harga), max_points)
+        if level == 'D':
+            return level, harga.field('Close', tickers).pct_change() * 100
+        view = panel.slice(start, end)
+        return level, pd.concat({
+            kode: hitung_perubahan_harga(view.ticker(kode), level, self.pyramid(kode))
+            for kode in tickers
+        }, axis=1, sort=True).rename_axis('Date')
+
+    def ohlcv_correlation(self, kode, start=None, end=None):
+        """Matriks korelasi antar kolom OHLCV satu emiten dalam rentang [start, end]"""
+        return self.cached('korelasi_ohlcv', (kode, start, end, self.version(kode)),
+                           lambda: korelasi_ohlcv(self.prices_range(kode, start, end)))
+
+    def month_start_price(self, kode, awal_bulan):
+        """Harga penutupan hari perdagangan pertama sejak awal_bulan, diambil dari histori tersimpan"""
+        df = self.prices(kode)
+        i = df['Date'].searchsorted(awal_bulan)
+        if i >= len(df):
+            return None
+        return float(df['Close'].iloc[i])
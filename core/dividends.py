@@ -0,0 +1,244 @@
+"""
+Analitik dividen dari event dividen mentah dan histori harga.
+
+Sumber dividen hanya dipakai untuk event (ex-date dan dividen per saham).
+'Rata-rata Close', yield tahunan, yield trailing 12 bulan (TTM), pertumbuhan
+dividen dan indeks total return semuanya dihitung dari panel harga, sehingga
+selalu konsisten dengan data harga yang tampil di grafik. Perhitungan
+dilakukan sekaligus untuk semua emiten pada array 2D panel (tanggal x emiten),
+tanpa loop Python per emiten.
+
+Format CSV dividen yang diterima:
+- event   : kolom 'Tanggal' (ex-date) dan 'Dividen' (Rp per saham)
+- tahunan : kolom 'Tahun' dan 'Jumlah Dividen' (format dataset_dividen/);
+  setiap tahun dianggap satu event pada 31 Desember. Kolom turunan di file
+  tersebut ('Rata-rata Close', 'Yield Percentage') diabaikan.
+
+Event dari format tahunan ditandai 'Ex-date' = False: tanggal ex-date dan
+penyesuaian split-nya tidak diketahui, sehingga harga tidak pernah turun pada
+tanggal tersebut dan jumlah nominalnya tidak sebanding dengan harga yang
+sudah disesuaikan. Event seperti ini hanya dipakai untuk dividen tahunan;
+yield TTM dan indeks total return hanya memakai event ex-date.
+
+Hasil disimpan di ComputeCache per (jenis, emiten, versi harga, versi dividen).
+"""
+import numpy as np
+import pandas as pd
+
+from core.cache import ComputeCache
+from core.panel import FILL_FFILL, FILL_NONE
+from core.periode import range_slice
+
+STATISTIK = ['Total Dividen', 'Rata-rata Dividen', 'Dividen Tertinggi', 'Rata-rata Yield', 'Yield Tertinggi']
+
+KOLOM_EVENT = ['Date', 'Dividen', 'Ex-date']
+KOLOM_TAHUNAN = ['Tahun', 'Jumlah Dividen', 'Rata-rata Close', 'Yield Percentage', 'Pertumbuhan Dividen']
+
+
+def read_dividend_events(path):
+    """Membaca CSV dividen (format event atau tahunan) menjadi event terurut dengan kolom 'Date' dan 'Dividen'"""
+    df = pd.read_csv(path)
+    if {'Tanggal', 'Dividen'} <= set(df.columns):
+        tanggal, jumlah, ex_date = pd.to_datetime(df['Tanggal']), df['Dividen'], True
+    elif {'Tahun', 'Jumlah Dividen'} <= set(df.columns):
+        tanggal, jumlah = pd.to_datetime(df['Tahun'].astype(int).astype(str) + '-12-31'), df['Jumlah Dividen']
+        ex_date = False
+    else:
+        raise ValueError(f"Format CSV dividen tidak dikenal (butuh 'Tanggal'/'Dividen' atau 'Tahun'/'Jumlah Dividen'): {path}")
+    events = pd.DataFrame({'Date': tanggal, 'Dividen': pd.to_numeric(jumlah, errors='coerce'), 'Ex-date': ex_date})
+    events = events[events['Dividen'] > 0]
+    return events.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def combine_events(events):
+    """Menggabungkan event {kode: DataFrame} menjadi satu tabel dengan kolom 'Emiten'"""
+    frames = [df.assign(Emiten=kode) for kode, df in events.items() if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=[*KOLOM_EVENT, 'Emiten'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def ex_date_events(events):
+    """Hanya event dengan ex-date sebenarnya (bukan total tahunan); emiten tanpa event seperti itu dibuang"""
+    hasil = {kode: df[df['Ex-date'].astype(bool)] for kode, df in events.items()}
+    return {kode: df for kode, df in hasil.items() if not df.empty}
+
+
+def event_matrix(panel, events):
+    """
+    Dividen per saham sebagai array (tanggal x emiten)
+
+    Setiap event ditempatkan pada tanggal panel pertama >= ex-date; event di
+    luar rentang histori harga diabaikan.
+    """
+    div = np.zeros((len(panel), len(panel.tickers)))
+    gabungan = combine_events({kode: events[kode] for kode in panel.tickers if kode in events})
+    if gabungan.empty or not len(panel):
+        return div
+    baris = panel.index.searchsorted(pd.DatetimeIndex(gabungan['Date']))
+    kolom = pd.Index(panel.tickers).get_indexer(gabungan['Emiten'])
+    ada = (baris < len(panel)) & (gabungan['Date'].to_numpy() >= panel.index[0].to_datetime64())
+    np.add.at(div, (baris[ada], kolom[ada]), gabungan['Dividen'].to_numpy(dtype=np.float64)[ada])
+    return div
+
+
+def average_close_by_year(panel):
+    """Rata-rata Close per tahun kalender (DataFrame tahun x emiten), hanya dari hari perdagangan"""
+    close = panel.with_fill(FILL_NONE).arrays['Close']
+    if not len(panel):
+        return pd.DataFrame(columns=panel.tickers, dtype=np.float64)
+    tahun = panel.index.year.to_numpy()
+    awal = np.flatnonzero(np.r_[True, tahun[1:] != tahun[:-1]])
+    valid = ~np.isnan(close)
+    jumlah = np.add.reduceat(np.where(valid, close, 0.0), awal, axis=0)
+    n = np.add.reduceat(valid.astype(np.int64), awal, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rata = np.where(n > 0, jumlah / n, np.nan)
+    return pd.DataFrame(rata, index=pd.Index(tahun[awal], name='Tahun'), columns=panel.tickers)
+
+
+def yearly_dividends(panel, events):
+    """
+    Dividen tahunan semua emiten panel
+
+    Returns:
+    DataFrame dengan kolom KOLOM_TAHUNAN + 'Emiten', satu baris per emiten per
+    tahun yang ada pembayaran dividennya, terurut per tahun. 'Pertumbuhan
+    Dividen' (%) dibandingkan tahun kalender sebelumnya (NaN jika tahun
+    sebelumnya tidak membagikan dividen).
+    """
+    gabungan = combine_events({kode: events[kode] for kode in panel.tickers if kode in events})
+    if gabungan.empty:
+        return pd.DataFrame(columns=[*KOLOM_TAHUNAN, 'Emiten'])
+    tahunan = (gabungan.assign(Tahun=gabungan['Date'].dt.year)
+               .groupby(['Emiten', 'Tahun'], sort=False)['Dividen'].sum()
+               .rename('Jumlah Dividen').reset_index())
+
+    rata = average_close_by_year(panel)
+    i = rata.index.get_indexer(tahunan['Tahun'])
+    j = pd.Index(panel.tickers).get_indexer(tahunan['Emiten'])
+    tahunan['Rata-rata Close'] = np.where(i >= 0, rata.to_numpy()[i, j], np.nan)
+    tahunan['Yield Percentage'] = tahunan['Jumlah Dividen'] / tahunan['Rata-rata Close'] * 100
+
+    per_tahun = tahunan.set_index(['Emiten', 'Tahun'])['Jumlah Dividen']
+    sebelumnya = per_tahun.reindex(pd.MultiIndex.from_arrays([tahunan['Emiten'], tahunan['Tahun'] - 1])).to_numpy()
+    tahunan['Pertumbuhan Dividen'] = (tahunan['Jumlah Dividen'] / sebelumnya - 1) * 100
+
+    urutan = pd.Index(panel.tickers).get_indexer(tahunan['Emiten'])
+    tahunan = tahunan.iloc[np.lexsort((urutan, tahunan['Tahun'].to_numpy()))]
+    return tahunan[[*KOLOM_TAHUNAN, 'Emiten']].reset_index(drop=True)
+
+
+def ttm_yield(panel, events):
+    """
+    Dividend yield trailing 12 bulan (%) per hari: dividen dengan ex-date dalam
+    (t - 1 tahun, t] dibagi harga Close hari t (DataFrame tanggal x emiten)
+
+    Hanya event ex-date yang dipakai; emiten yang hanya punya dividen tahunan
+    bernilai NaN.
+    """
+    events = ex_date_events(events)
+    close = panel.with_fill(FILL_FFILL).arrays['Close']
+    kumulatif = np.cumsum(event_matrix(panel, events), axis=0)
+    lalu = panel.index.searchsorted(panel.index - pd.DateOffset(years=1), side='right') - 1
+    sebelum = np.where((lalu >= 0)[:, None], kumulatif[np.maximum(lalu, 0)], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hasil = (kumulatif - sebelum) / close * 100
+    hasil[:, [kode not in events for kode in panel.tickers]] = np.nan
+    return pd.DataFrame(hasil, index=panel.index, columns=panel.tickers)
+
+
+def total_return(panel, events):
+    """
+    Indeks total return (dividen diinvestasikan kembali pada ex-date), bernilai
+    1.0 pada hari perdagangan pertama tiap emiten (DataFrame tanggal x emiten)
+
+    Hanya event ex-date yang dipakai; emiten yang hanya punya dividen tahunan
+    memakai return harga saja.
+    """
+    close = panel.with_fill(FILL_FFILL).arrays['Close']
+    div = event_matrix(panel, ex_date_events(events))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gross = (close[1:] + div[1:]) / close[:-1]
+    gross = np.where(np.isfinite(gross), gross, 1.0)
+    indeks = np.vstack([np.ones((min(len(panel), 1), close.shape[1])), np.cumprod(gross, axis=0)])
+    indeks[np.isnan(close)] = np.nan
+    return pd.DataFrame(indeks, index=panel.index, columns=panel.tickers)
+
+
+def rebase(df, nilai=100.0):
+    """Menormalkan setiap kolom ke `nilai` pada data valid pertamanya (mis. indeks total return dalam satu rentang)"""
+    arr = df.to_numpy(dtype=np.float64)
+    if not arr.size:
+        return df.copy()
+    pertama = np.argmax(~np.isnan(arr), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame(arr / arr[pertama, np.arange(arr.shape[1])] * nilai, index=df.index, columns=df.columns)
+
+
+def ringkasan_dividen(df):
+    """Statistik dividen (dict angka) untuk satu emiten"""
+    return {
+        'Total Dividen': df['Jumlah Dividen'].sum(),
+        'Rata-rata Dividen': df['Jumlah Dividen'].mean(),
+        'Dividen Tertinggi': df['Jumlah Dividen'].max(),
+        'Rata-rata Yield': df['Yield Percentage'].mean(),
+        'Yield Tertinggi': df['Yield Percentage'].max()
+    }
+
+
+def statistik_dividen(tahunan, ttm=None):
+    """
+    Tabel statistik dividen per emiten dari dividen tahunan (lihat yearly_dividends)
+
+    ttm : yield TTM (lihat ttm_yield); jika diberikan, nilai terakhirnya
+    ditambahkan sebagai kolom 'Yield TTM' (NaN untuk emiten tanpa event ex-date)
+    """
+    g = tahunan.groupby('Emiten', sort=False)
+    stats = pd.DataFrame({
+        'Total Dividen': g['Jumlah Dividen'].sum(),
+        'Rata-rata Dividen': g['Jumlah Dividen'].mean(),
+        'Dividen Tertinggi': g['Jumlah Dividen'].max(),
+        'Rata-rata Yield': g['Yield Percentage'].mean(),
+        'Yield Tertinggi': g['Yield Percentage'].max(),
+        'Rata-rata Pertumbuhan': g['Pertumbuhan Dividen'].mean(),
+    })
+    if ttm is not None:
+        stats = stats.reindex(ttm.columns).dropna(how='all')
+        stats['Yield TTM'] = ttm.ffill().iloc[-1].reindex(stats.index) if len(ttm) else np.nan
+    return stats.rename_axis('Emiten').reset_index()
+
+
+class DividendEngine:
+    """
+    Analitik dividen dengan cache per (jenis, emiten, isi panel, versi dividen)
+
+    events adalah dict kode -> event dividen (lihat read_dividend_events) dan
+    version adalah versi gabungan sumber dividennya. Deret harian (yield TTM,
+    total return) dihitung atas histori penuh lalu dipotong ke rentang yang
+    diminta.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ComputeCache()
+
+    def _cached(self, nama, panel, version, fungsi):
+        return self.cache.get_or_compute((nama, tuple(panel.tickers), panel.key, version), fungsi)
+
+    def yearly(self, panel, events, version):
+        """Dividen tahunan dengan yield dan pertumbuhan (lihat yearly_dividends)"""
+        return self._cached('dividen_tahunan', panel, version, lambda: yearly_dividends(panel, events))
+
+    def ttm_yield(self, panel, events, version, start=None, end=None):
+        full = self._cached('dividen_ttm', panel, version, lambda: ttm_yield(panel, events))
+        return full.iloc[range_slice(full.index, start, end)]
+
+    def total_return(self, panel, events, version, start=None, end=None):
+        full = self._cached('total_return', panel, version, lambda: total_return(panel, events))
+        return full.iloc[range_slice(full.index, start, end)]
+
+    def stats(self, panel, events, version):
+        """Tabel statistik dividen per emiten termasuk yield TTM terakhir"""
+        return self._cached('statistik_dividen', panel, version, lambda: statistik_dividen(
+            self.yearly(panel, events, version), self.ttm_yield(panel, events, version)
+        ))
@@ -0,0 +1,157 @@
+"""
+Downsampling data grafik di sisi server sebelum dikirim ke Plotly.
+
+Grafik rentang panjang (misalnya 'Semua Data' 20 tahun) tidak perlu
+mengirim setiap titik harian ke browser; jumlah titik cukup mendekati lebar
+grafik dalam piksel.
+
+- Garis: Largest-Triangle-Three-Buckets (LTTB) yang mempertahankan bentuk visual
+- Candlestick: agregasi OHLC per bucket (open pertama, high maks, low min, close terakhir)
+- Volume: jumlah per bucket
+"""
+import numpy as np
+import pandas as pd
+
+from core.profiler import traced
+
+# Pilihan resolusi di sidebar: label -> jumlah titik (None = otomatis, 0 = tanpa downsampling)
+RESOLUSI = {
+    'Otomatis': None,
+    'Rendah (500 titik)': 500,
+    'Sedang (1000 titik)': 1000,
+    'Tinggi (2000 titik)': 2000,
+    'Penuh (tanpa downsampling)': 0,
+}
+
+# Resolusi otomatis per periode preset; periode pendek ditampilkan penuh
+RESOLUSI_PERIODE = {
+    'max': 800,
+    '10y': 1000,
+    '5y': 1200,
+    '3y': 1500,
+    'custom': 1200,
+}
+
+
+def target_points(period, resolusi=None):
+    """
+    Menentukan jumlah titik maksimum untuk grafik
+
+    Parameters:
+    period : kode periode ('max', '10y', ..., 'custom')
+    resolusi : jumlah titik pilihan pengguna (None = otomatis, 0 = penuh)
+
+    Returns:
+    jumlah titik maksimum, atau 0 jika tidak perlu downsampling
+    """
+    if resolusi is not None:
+        return resolusi
+    return RESOLUSI_PERIODE.get(period, 0)
+
+
+def _bucket_edges(n, n_out):
+    """Batas bucket dengan jumlah anggota (hampir) sama"""
+    return np.linspace(0, n, n_out + 1).astype(np.int64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indeks titik terpilih menurut algoritma LTTB
+
+    Parameters:
+    x, y : array 1D (x numerik dan terurut), tanpa NaN
+    n_out : jumlah titik keluaran (>= 3)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Titik pertama dan terakhir selalu dipertahankan; sisanya dibagi n_out-2 bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Rata-rata bucket berikutnya sebagai titik ketiga segitiga
+        nlo, nhi = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        if nhi <= nlo:
+            nlo, nhi = n - 1, n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def lttb(series, n_out):
+    """Downsampling satu Series (index tanggal) dengan LTTB; NaN dibuang dulu"""
+    series = series.dropna()
+    if not n_out or len(series) <= n_out:
+        return series
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.asarray(series.index, dtype=np.float64)
+    idx = lttb_indices(x, series.to_numpy(), n_out)
+    return series.iloc[idx]
+
+
+@traced('compute/lttb_long')
+def lttb_long(df, n_out, index_name='Tanggal', var_name='Emiten', value_name='Harga'):
+    """
+    Downsampling tiap kolom DataFrame lebar secara terpisah lalu
+    menggabungkannya ke format panjang untuk px.line
+
+    Returns:
+    DataFrame dengan kolom [index_name, var_name, value_name]
+    """
+    parts = []
+    for col in df.columns:
+        s = lttb(df[col], n_out)
+        parts.append(pd.DataFrame({index_name: s.index, var_name: col, value_name: s.to_numpy()}))
+    if not parts:
+        return pd.DataFrame(columns=[index_name, var_name, value_name])
+    return pd.concat(parts, ignore_index=True)
+
+
+def ohlc_buckets(df, n_out, date_col='Date'):
+    """
+    Agregasi OHLCV per bucket untuk candlestick
+
+    Parameters:
+    df : DataFrame dengan kolom Date, Open, High, Low, Close (dan opsional Volume)
+    n_out : jumlah bucket maksimum
+
+    Returns:
+    DataFrame dengan kolom yang sama, satu baris per bucket (tanggal = awal bucket)
+    """
+    n = len(df)
+    if not n_out or n <= n_out:
+        return df
+    starts = _bucket_edges(n, n_out)[:-1]
+    ends = np.append(starts[1:], n) - 1
+    hasil = {
+        date_col: df[date_col].to_numpy()[starts],
+        'Open': df['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+        'Close': df['Close'].to_numpy()[ends],
+    }
+    if 'Volume' in df:
+        # Jumlahkan dalam uint64 agar volume uint32 dari price store tidak overflow
+        hasil['Volume'] = np.add.reduceat(df['Volume'].to_numpy(), starts, dtype=np.uint64)
+    return pd.DataFrame(hasil)
+
+
+def sum_buckets(df, n_out):
+    """
+    Menjumlahkan DataFrame lebar (index tanggal) per bucket, dengan bucket
+    yang sama untuk semua kolom (cocok untuk volume dan area bertumpuk)
+    """
+    n = len(df)
+    if not n_out or n <= n_out:
+        return df
+    starts = _bucket_edges(n, n_out)[:-1]
+    values = np.add.reduceat(np.nan_to_num(df.to_numpy(dtype=np.float64)), starts, axis=0)
+    return pd.DataFrame(values, index=df.index[starts], columns=df.columns)
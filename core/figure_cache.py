@@ -0,0 +1,178 @@
+"""
+Cache figure Plotly (JSON) di disk dengan batas ukuran.
+
+Untuk periode preset dan pilihan moving average yang tetap, figure tampilan
+perbandingan dan detail hanya bergantung pada kunci (tampilan, emiten,
+rentang, pilihan grafik, versi data). Membangun figure dengan px.line /
+go.Candlestick lalu menserialisasinya adalah bagian besar waktu CPU satu
+rerun, jadi JSON figure disimpan sekali per kunci dan dipakai ulang oleh
+semua sesi dan setelah restart.
+
+Figure dari cache dikembalikan sebagai CachedFigure: spesifikasi yang sudah
+tervalidasi saat pertama dibangun, yang diteruskan ke st.plotly_chart apa
+adanya tanpa validasi dan konstruksi ulang objek Plotly.
+
+Kunci sebaiknya memuat versi data sehingga entri lama tidak pernah terbaca
+lagi; entri yang paling lama tidak dipakai dihapus saat total ukuran file
+melebihi max_bytes.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from plotly.basedatatypes import BaseFigure
+
+from core.profiler import span
+
+DEFAULT_ROOT = '.figure_cache'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class CachedFigure(BaseFigure):
+    """
+    Figure read-only dari spesifikasi JSON yang sudah tervalidasi
+
+    Hanya to_dict()/to_plotly_json() yang didukung; konstruksi BaseFigure
+    sengaja dilewati karena itulah biaya yang dihindari.
+
+    Bergantung pada detail internal, bukan API publik: st.plotly_chart
+    meneruskan figure ke plotly.tools.return_figure_from_figure_or_data, yang
+    untuk instance BaseFigure hanya memanggil to_dict() dan menganggapnya sudah
+    tervalidasi (dict biasa akan divalidasi ulang lewat Figure(**spec)).
+    Perilaku ini diuji terhadap versi Streamlit/Plotly terpasang di
+    tests/test_figure_cache.py; jika tes itu gagal setelah upgrade, kembalikan
+    dict spesifikasi saja dan terima biaya validasinya (diukur sekitar 85 ms
+    per grafik perbandingan, dibanding ±2 ms lewat CachedFigure).
+
+    Atribut Plotly lain (data, layout, update_layout, ...) tidak
+    tersedia dan menghasilkan AttributeError yang menjelaskan hal ini. Spec
+    tetap diserialisasi ulang oleh Streamlit (tanpa validasi); JSON di disk
+    tidak bisa diteruskan apa adanya karena st.plotly_chart menerima figure.
+    """
+
+    def __init__(self, spec):  # BaseFigure.__init__ sengaja tidak dipanggil
+        self._spec = spec
+
+    def __getattr__(self, name):
+        # Dipanggil untuk semua atribut BaseFigure yang belum dibangun (layout, data, update_layout, ...)
+        raise AttributeError(
+            f"CachedFigure hanya mendukung to_dict()/to_plotly_json(), bukan '{name}'; "
+            f"gunakan go.Figure(fig.to_dict()) untuk mengubah figure"
+        )
+
+    def to_dict(self):
+        return self._spec
+
+    def to_plotly_json(self):
+        return self._spec
+
+
+class FigureCache:
+    """
+    root : folder file JSON (satu file per kunci)
+    max_bytes : batas total ukuran file; entri yang paling lama tidak
+    dipakai (mtime) dihapus lebih dulu
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._sizes = {entry.path: entry.stat().st_size for entry in os.scandir(root)
+                       if entry.name.endswith('.json')}
+        self._bytes = sum(self._sizes.values())
+
+    def path(self, key):
+        return os.path.join(self.root, hashlib.sha1(repr(key).encode()).hexdigest() + '.json')
+
+    def get(self, key):
+        """Spesifikasi figure (dict) untuk kunci, atau None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                spec = json.loads(f.read())
+            os.utime(path)  # tanda terakhir dipakai untuk eviction
+        except (OSError, ValueError):
+            return None
+        return spec
+
+    def put(self, key, fig):
+        """Menyimpan JSON figure (tulis atomik) lalu menghapus entri lama jika melebihi batas"""
+        path = self.path(key)
+        data = fig.to_json(validate=False).encode()
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._bytes += len(data) - self._sizes.get(path, 0)
+            self._sizes[path] = len(data)
+            if self._bytes > self.max_bytes:
+                self._evict(keep=path)
+        return json.loads(data)
+
+    def _evict(self, keep):
+        def mtime(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+
+        for path in sorted(self._sizes, key=mtime):
+            if self._bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._bytes -= self._sizes.pop(path)
+            self.evictions += 1
+
+    def get_or_build(self, key, build):
+        """
+        Figure untuk kunci dari cache, atau dibangun dengan build() lalu disimpan
+
+        Returns:
+        CachedFigure
+        """
+        with span('load/figure_cache'):
+            spec = self.get(key)
+        if spec is not None:
+            with self._lock:
+                self.hits += 1
+            return CachedFigure(spec)
+        with self._lock:
+            self.misses += 1
+        with span('compute/figure'):
+            spec = self.put(key, build())
+        return CachedFigure(spec)
+
+    def clear(self):
+        with self._lock:
+            for path in self._sizes:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entri': len(self._sizes),
+                'memori_mb': self._bytes / 1024 / 1024,
+                'batas_mb': self.max_bytes / 1024 / 1024,
+                'hit': self.hits,
+                'miss': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'eviction': self.evictions,
+            }
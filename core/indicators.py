@@ -0,0 +1,410 @@
+"""
+Engine indikator teknikal yang vektor.
+
+Semua fungsi bekerja pada array 2D (n_tanggal x n_emiten) sehingga satu
+panggilan menghitung indikator untuk semua emiten sekaligus. Rata-rata
+bergerak dan Bollinger memakai cumsum (O(n) berapa pun ukuran window),
+sedangkan EMA/RSI/ATR memakai ewm pandas yang berjalan di C.
+
+Hasil disimpan per (emiten, versi data, kebijakan pengisian, indikator)
+sehingga rerun berikutnya tinggal membaca. Untuk data live, kelas Rolling*
+menyimpan state O(1) sehingga satu bar baru memperbarui indikator tanpa
+menghitung ulang seluruh histori.
+
+Spesifikasi indikator berupa tuple:
+    ('sma', window)  ('ema', span)  ('rsi', period)
+    ('bollinger', window, k)  ('atr', period)  ('vwap',)
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.cache import ComputeCache
+from core.periode import range_slice
+
+
+# ----------------------------------------------------------------------
+# Fungsi batch (array 2D, sumbu 0 = waktu)
+# ----------------------------------------------------------------------
+def _as_2d(x):
+    x = np.asarray(x, dtype=np.float64)
+    return x[:, None] if x.ndim == 1 else x
+
+
+def _rolling_sum(x, window):
+    """Jumlah bergerak berbasis cumsum; NaN jika ada nilai kosong di dalam window"""
+    valid = ~np.isnan(x)
+    zero = np.where(valid, x, 0.0)
+    cs = np.cumsum(zero, axis=0)
+    cnt = np.cumsum(valid, axis=0)
+    total = cs.copy()
+    total[window:] -= cs[:-window]
+    n_valid = cnt.copy()
+    n_valid[window:] -= cnt[:-window]
+    total[n_valid < window] = np.nan
+    return total
+
+
+def sma(x, window):
+    """Simple moving average (setara rolling(window).mean())"""
+    x = _as_2d(x)
+    # Kurangi rata-rata kolom dulu agar cumsum tidak kehilangan presisi
+    offset = np.nanmean(x, axis=0) if len(x) else np.zeros(x.shape[1])
+    offset = np.nan_to_num(offset)
+    return _rolling_sum(x - offset, window) / window + offset
+
+
+def rolling_std(x, window):
+    """Standar deviasi bergerak (ddof=0) memakai cumsum x dan x^2"""
+    x = _as_2d(x)
+    offset = np.nan_to_num(np.nanmean(x, axis=0)) if len(x) else np.zeros(x.shape[1])
+    d = x - offset
+    mean = _rolling_sum(d, window) / window
+    var = _rolling_sum(d * d, window) / window - mean * mean
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def ema(x, span):
+    """Exponential moving average (adjust=False), dimulai dari nilai valid pertama"""
+    return pd.DataFrame(_as_2d(x)).ewm(span=span, adjust=False, min_periods=span).mean().to_numpy()
+
+
+def _wilder(x, period):
+    return pd.DataFrame(x).ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean().to_numpy()
+
+
+def rsi(close, period=14):
+    """Relative Strength Index dengan smoothing Wilder"""
+    close = _as_2d(close)
+    delta = np.diff(close, axis=0, prepend=np.nan)
+    gain = _wilder(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), period)
+    loss = _wilder(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hasil = 100.0 - 100.0 / (1.0 + gain / loss)
+    hasil[(loss == 0) & (gain > 0)] = 100.0
+    return hasil
+
+
+def bollinger(close, window=20, k=2.0):
+    """Bollinger Bands: (tengah, atas, bawah)"""
+    mid = sma(close, window)
+    sd = rolling_std(close, window)
+    return mid, mid + k * sd, mid - k * sd
+
+
+def true_range(high, low, close):
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    prev = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+    return tr
+
+
+def atr(high, low, close, period=14):
+    """Average True Range dengan smoothing Wilder"""
+    return _wilder(true_range(high, low, close), period)
+
+
+def vwap(high, low, close, volume, window=None):
+    """VWAP kumulatif (atau bergerak jika window diberikan) dari harga tipikal"""
+    typical = (_as_2d(high) + _as_2d(low) + _as_2d(close)) / 3.0
+    volume = _as_2d(volume)
+    pv = typical * volume
+    if window is None:
+        pv_sum = np.cumsum(np.nan_to_num(pv), axis=0)
+        v_sum = np.cumsum(np.nan_to_num(volume), axis=0)
+    else:
+        pv_sum = _rolling_sum(pv, window)
+        v_sum = _rolling_sum(volume, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hasil = pv_sum / v_sum
+    hasil[np.isnan(typical)] = np.nan
+    return hasil
+
+
+def label(spec):
+    """Nama kolom keluaran untuk sebuah spesifikasi indikator"""
+    nama, *params = spec
+    if nama == 'bollinger':
+        dasar = f"BB{params[0]}"
+        return [f"{dasar}_tengah", f"{dasar}_atas", f"{dasar}_bawah"]
+    return [nama.upper() + ''.join(str(p) for p in params)]
+
+
+def compute_arrays(arrays, spec):
+    """
+    Menghitung satu indikator untuk semua kolom sekaligus
+
+    Parameters:
+    arrays : dict field -> array 2D (Open/High/Low/Close/Volume)
+    spec : tuple spesifikasi indikator
+
+    Returns:
+    dict label -> array 2D
+    """
+    nama, *params = spec
+    close = arrays['Close']
+    if nama == 'sma':
+        hasil = [sma(close, *params)]
+    elif nama == 'ema':
+        hasil = [ema(close, *params)]
+    elif nama == 'rsi':
+        hasil = [rsi(close, *params)]
+    elif nama == 'bollinger':
+        hasil = list(bollinger(close, *params))
+    elif nama == 'atr':
+        hasil = [atr(arrays['High'], arrays['Low'], close, *params)]
+    elif nama == 'vwap':
+        hasil = [vwap(arrays['High'], arrays['Low'], close, arrays['Volume'], *params)]
+    else:
+        raise ValueError(f"Indikator tidak dikenal: {nama}")
+    return dict(zip(label(spec), hasil))
+
+
+# ----------------------------------------------------------------------
+# Engine dengan memo per (emiten, isi panel, indikator)
+# ----------------------------------------------------------------------
+class IndicatorEngine:
+    """
+    Menghitung dan menyimpan indikator untuk panel harga
+
+    Emiten yang belum ada di memo dihitung bersama dalam satu pass batch;
+    yang sudah ada langsung dibaca.
+
+    Parameters:
+    cache : ComputeCache untuk memo (bisa dibagi dengan komputasi lain);
+        kuncinya ('indikator', kode, panel.key, spec), sehingga panel hasil
+        slice() tidak memakai memo histori penuh
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ComputeCache()
+
+    def _get(self, key):
+        return self.cache.get(('indikator', *key))
+
+    def _put(self, key, value):
+        self.cache.put(('indikator', *key), value)
+
+    def compute(self, panel, specs, tickers=None, start=None, end=None):
+        """
+        Menghitung indikator untuk emiten di panel
+
+        Indikator selalu dihitung atas histori penuh panel (agar nilai awal
+        rentang tidak terpotong), lalu dipotong ke [start, end]. Untuk rentang
+        tertentu, berikan panel penuh beserta start/end, bukan panel.slice():
+        indikator panel yang sudah dipotong dimulai dari periode warm-up (NaN).
+
+        Parameters:
+        panel : Panel (lihat core.panel)
+        specs : list tuple spesifikasi indikator
+        tickers : emiten yang dihitung (default semua emiten panel)
+        start, end : batas rentang tanggal hasil (opsional)
+
+        Returns:
+        dict label -> DataFrame (tanggal x emiten)
+        """
+        tickers = list(tickers) if tickers is not None else panel.tickers
+        posisi = range_slice(panel.index, start, end)
+        index = panel.index[posisi]
+
+        hasil = {}
+        for spec in specs:
+            spec = tuple(spec)
+            keys = {kode: (kode, panel.key, spec) for kode in tickers}
+            cached = {kode: self._get(key) for kode, key in keys.items()}
+            missing = [kode for kode, value in cached.items() if value is None]
+            if missing:
+                cols = [panel.tickers.index(kode) for kode in missing]
+                arrays = {name: arr[:, cols] for name, arr in panel.arrays.items()}
+                batch = compute_arrays(arrays, spec)
+                for j, kode in enumerate(missing):
+                    value = {lbl: arr[:, j] for lbl, arr in batch.items()}
+                    self._put(keys[kode], value)
+                    cached[kode] = value
+            for lbl in label(spec):
+                data = np.column_stack([cached[kode][lbl][posisi] for kode in tickers]) if tickers \
+                    else np.empty((len(index), 0))
+                hasil[lbl] = pd.DataFrame(data, index=index, columns=tickers, copy=False)
+        return hasil
+
+    def clear(self):
+        self.cache.invalidate(lambda key: key[0] == 'indikator')
+
+
+# ----------------------------------------------------------------------
+# State bergulir O(1) per bar untuk data live
+# ----------------------------------------------------------------------
+class RollingSMA:
+    def __init__(self, window):
+        self.window = window
+        self._buf = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, bar):
+        x = bar['Close']
+        if len(self._buf) == self.window:
+            self._sum -= self._buf[0]
+        self._buf.append(x)
+        self._sum += x
+        return self._sum / self.window if len(self._buf) == self.window else math.nan
+
+
+class RollingEMA:
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = math.nan
+        self._n = 0
+
+    def update(self, bar):
+        x = bar['Close']
+        self.value = x if self._n == 0 else self.alpha * x + (1 - self.alpha) * self.value
+        self._n += 1
+        return self.value if self._n >= self.span else math.nan
+
+
+class RollingRSI:
+    def __init__(self, period=14):
+        self.period = period
+        self._prev = None
+        self._gain = self._loss = math.nan
+        self._n = 0
+
+    def update(self, bar):
+        x = bar['Close']
+        if self._prev is None:
+            self._prev = x
+            return math.nan
+        delta, self._prev = x - self._prev, x
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        a = 1.0 / self.period
+        if self._n == 0:
+            self._gain, self._loss = gain, loss
+        else:
+            self._gain = a * gain + (1 - a) * self._gain
+            self._loss = a * loss + (1 - a) * self._loss
+        self._n += 1
+        if self._n < self.period:
+            return math.nan
+        if self._loss == 0:
+            return 100.0 if self._gain > 0 else math.nan
+        return 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+
+
+class RollingBollinger:
+    def __init__(self, window=20, k=2.0):
+        self.window = window
+        self.k = k
+        self._buf = deque(maxlen=window)
+        self._sum = self._sumsq = 0.0
+
+    def update(self, bar):
+        x = bar['Close']
+        if len(self._buf) == self.window:
+            old = self._buf[0]
+            self._sum -= old
+            self._sumsq -= old * old
+        self._buf.append(x)
+        self._sum += x
+        self._sumsq += x * x
+        if len(self._buf) < self.window:
+            return (math.nan, math.nan, math.nan)
+        mean = self._sum / self.window
+        sd = math.sqrt(max(self._sumsq / self.window - mean * mean, 0.0))
+        return (mean, mean + self.k * sd, mean - self.k * sd)
+
+
+class RollingATR:
+    def __init__(self, period=14):
+        self.period = period
+        self._prev_close = None
+        self.value = math.nan
+        self._n = 0
+
+    def update(self, bar):
+        high, low = bar['High'], bar['Low']
+        # Bar pertama tidak punya close sebelumnya: TR = High - Low, sama dengan true_range()
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = bar['Close']
+        a = 1.0 / self.period
+        self.value = tr if self._n == 0 else a * tr + (1 - a) * self.value
+        self._n += 1
+        return self.value if self._n >= self.period else math.nan
+
+
+class RollingVWAP:
+    per_sesi = True     # dihitung ulang dari nol setiap sesi (lihat IndicatorState.mulai_sesi)
+
+    def __init__(self):
+        self._pv = self._v = 0.0
+
+    def reset(self):
+        self._pv = self._v = 0.0
+
+    def update(self, bar):
+        typical = (bar['High'] + bar['Low'] + bar['Close']) / 3.0
+        self._pv += typical * bar['Volume']
+        self._v += bar['Volume']
+        return self._pv / self._v if self._v else math.nan
+
+
+_ROLLING = {
+    'sma': RollingSMA,
+    'ema': RollingEMA,
+    'rsi': RollingRSI,
+    'bollinger': RollingBollinger,
+    'atr': RollingATR,
+    'vwap': RollingVWAP,
+}
+
+
+class IndicatorState:
+    """
+    Kumpulan state indikator untuk satu emiten; update(bar) O(1) per indikator
+
+    Parameters:
+    specs : list tuple spesifikasi indikator (format sama dengan IndicatorEngine)
+    """
+
+    def __init__(self, specs):
+        self.specs = [tuple(spec) for spec in specs]
+        self._states = [_ROLLING[spec[0]](*spec[1:]) for spec in self.specs]
+
+    @classmethod
+    def from_history(cls, specs, df):
+        """Membuat state lalu memanaskannya dengan histori (sekali, O(n))"""
+        state = cls(specs)
+        for bar in df[['Open', 'High', 'Low', 'Close', 'Volume']].to_dict('records'):
+            state.update(bar)
+        return state
+
+    def mulai_sesi(self):
+        """
+        Memulai sesi perdagangan baru untuk data intraday: indikator yang
+        berjangkar sesi (VWAP) dihitung ulang dari nol, yang lain tetap berlanjut
+        """
+        for state in self._states:
+            if getattr(state, 'per_sesi', False):
+                state.reset()
+
+    def update(self, bar):
+        """
+        Memproses satu bar baru
+
+        Parameters:
+        bar : dict/Series dengan Open, High, Low, Close, Volume
+
+        Returns:
+        dict label -> nilai indikator terbaru
+        """
+        hasil = {}
+        for spec, state in zip(self.specs, self._states):
+            value = state.update(bar)
+            values = value if isinstance(value, tuple) else (value,)
+            hasil.update(zip(label(spec), values))
+        return hasil
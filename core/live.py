@@ -0,0 +1,355 @@
+"""
+Mode live: bar intraday (1m/5m) per emiten dalam ring buffer berukuran tetap.
+
+Setiap poll hanya bar yang lebih baru dari bar terakhir di buffer yang
+diambil dari feed, diteruskan ke state indikator bergulir (O(1) per bar, lihat
+IndicatorState) lalu ditulis bersama nilai indikatornya ke RingBuffer. VWAP
+dimulai ulang pada bar pertama setiap tanggal (sesi bursa baru). Buffer
+menimpa bar terlama, sehingga memori tetap berapa pun lamanya stream
+berjalan; pembaca cukup meminta bar sejak nomor urut terakhir yang sudah
+dilihatnya (LiveStream.since).
+
+Feed berupa callable `fetch(tickers, since)` -> dict kode -> DataFrame dengan
+kolom 'Date' dan OHLCV, berisi bar yang sudah selesai setelah `since` (dict
+kode -> Timestamp atau None):
+
+- yahoo_intraday_feed: bar intraday Yahoo Finance
+- replay_feed: memutar ulang file CSV bar (kolom Date, Kode, OHLCV) beberapa
+  bar per poll, untuk pengujian offline
+
+Headless:
+
+    python -m core.live --rekam bar.csv --interval 1m      # simpan bar hari ini
+    python -m core.live --replay bar.csv --poll 100
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.indicators import IndicatorState, label
+from core.profiler import traced
+
+logger = logging.getLogger(__name__)
+
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+INTERVALS = {'1m': 60, '5m': 300}       # interval bar -> detik
+DEFAULT_INTERVAL = '1m'
+DEFAULT_CAPACITY = 2000                 # bar per emiten (±5 hari bursa bar 1 menit)
+DEFAULT_SPECS = [('sma', 5), ('sma', 20), ('sma', 50), ('vwap',)]
+ZONA_WAKTU = 'Asia/Jakarta'
+
+
+def yahoo_intraday_feed(interval=DEFAULT_INTERVAL, period='5d'):
+    """
+    Feed bar intraday Yahoo Finance (semua emiten dalam satu batch download)
+
+    Bar yang masih terbentuk (waktu mulai + interval belum lewat) tidak
+    dikirim, karena state indikator tidak bisa merevisi bar yang sudah masuk.
+    """
+    from core.quotes import yahoo_fetcher
+
+    durasi = pd.Timedelta(seconds=INTERVALS[interval])
+
+    def fetch(tickers, since):
+        # Histori beberapa hari hanya diminta saat buffer masih kosong
+        frames = yahoo_fetcher(tickers, period=period if any(since.get(kode) is None for kode in tickers) else '1d',
+                               interval=interval)
+        sekarang = pd.Timestamp.now(tz=ZONA_WAKTU).tz_localize(None)
+        hasil = {}
+        for kode, df in frames.items():
+            df = df.reset_index().rename(columns={'Datetime': 'Date'})
+            df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_convert(ZONA_WAKTU).dt.tz_localize(None)
+            df = df[df['Date'] + durasi <= sekarang]
+            if since.get(kode) is not None:
+                df = df[df['Date'] > since[kode]]
+            hasil[kode] = df[['Date', *OHLCV]].dropna(subset=['Close'])
+        return hasil
+    return fetch
+
+
+def replay_feed(path, bars_per_poll=1):
+    """
+    Feed yang memutar ulang file CSV bar (kolom Date, Kode, OHLCV) dengan
+    `bars_per_poll` bar per emiten setiap poll; setelah file habis feed tidak
+    mengirim bar lagi
+    """
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Kode'] = df['Kode'].str.upper()
+    per_emiten = {kode: grup[['Date', *OHLCV]].sort_values('Date').reset_index(drop=True)
+                  for kode, grup in df.groupby('Kode')}
+    posisi = {kode: 0 for kode in per_emiten}
+
+    def fetch(tickers, since):
+        hasil = {}
+        for kode in tickers:
+            if kode not in per_emiten:
+                continue
+            bars = per_emiten[kode]
+            if since.get(kode) is not None:
+                # Lanjut dari bar terakhir di buffer (mis. setelah stream dibuat ulang)
+                posisi[kode] = max(posisi[kode], int(bars['Date'].searchsorted(since[kode], side='right')))
+            hasil[kode] = bars.iloc[posisi[kode]:posisi[kode] + bars_per_poll]
+            posisi[kode] += len(hasil[kode])
+        return hasil
+    return fetch
+
+
+class RingBuffer:
+    """
+    Buffer bar berukuran tetap: waktu (int64 ns) dan nilai float64 per kolom
+
+    Setiap bar mendapat nomor urut (0, 1, 2, ...); setelah `capacity` bar,
+    bar terlama ditimpa. `count` adalah jumlah bar yang pernah ditambahkan,
+    sekaligus nomor urut bar berikutnya.
+    """
+
+    def __init__(self, capacity, columns):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full((capacity, len(self.columns)), np.nan)
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.values.nbytes
+
+    def last_time(self):
+        """Waktu bar terakhir (Timestamp) atau None jika kosong"""
+        return pd.Timestamp(self.times[(self.count - 1) % self.capacity]) if self.count else None
+
+    def append(self, waktu, row):
+        i = self.count % self.capacity
+        self.times[i] = pd.Timestamp(waktu).value
+        self.values[i] = row
+        self.count += 1
+
+    def since(self, seq=0):
+        """
+        Bar dengan nomor urut >= seq yang masih ada di buffer, terlama lebih dulu
+
+        Returns:
+        DataFrame (index 'Date', kolom `columns`)
+        """
+        start = max(seq, self.count - self.capacity)
+        posisi = np.arange(start, self.count) % self.capacity
+        return pd.DataFrame(self.values[posisi], columns=self.columns,
+                            index=pd.DatetimeIndex(self.times[posisi].astype('datetime64[ns]'), name='Date'))
+
+
+class LiveStream:
+    """
+    Bar intraday semua emiten dalam ring buffer, dengan indikator inkremental
+
+    Parameters:
+    fetch : feed, callable(tickers, since) -> dict kode -> DataFrame bar baru
+    tickers : emiten yang diikuti
+    specs : spesifikasi indikator (format sama dengan IndicatorEngine)
+    capacity : jumlah bar per emiten yang disimpan
+    refresh : jarak minimum antar poll (detik); poll_if_due() dari banyak
+        sesi digabung menjadi satu permintaan ke feed per periode ini
+    clock : sumber waktu (bisa diganti saat pengujian)
+    """
+
+    def __init__(self, fetch, tickers, specs=DEFAULT_SPECS, capacity=DEFAULT_CAPACITY, refresh=INTERVALS['1m'],
+                 clock=time.monotonic):
+        self.fetch = fetch
+        self.tickers = list(tickers)
+        self.specs = [tuple(spec) for spec in specs]
+        self.refresh = refresh
+        self.clock = clock
+        self.last_poll = None       # waktu clock poll terakhir
+        self.last_error = None
+        self.capacity = capacity
+        columns = OHLCV + [nama for spec in self.specs for nama in label(spec)]
+        self._buffers = {kode: RingBuffer(capacity, columns) for kode in self.tickers}
+        self._states = {kode: IndicatorState(self.specs) for kode in self.tickers}
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    @property
+    def columns(self):
+        return self._buffers[self.tickers[0]].columns if self.tickers else OHLCV
+
+    def ingest(self, kode, bars):
+        """Menambahkan bar (DataFrame kolom 'Date' dan OHLCV) yang lebih baru dari bar terakhir emiten"""
+        buffer, state = self._buffers[kode], self._states[kode]
+        n = 0
+        with self._lock:
+            terakhir = buffer.last_time()
+            for bar in bars[['Date', *OHLCV]].to_dict('records'):
+                if terakhir is not None and bar['Date'] <= terakhir:
+                    continue
+                if terakhir is not None and bar['Date'].normalize() != terakhir.normalize():
+                    state.mulai_sesi()
+                indikator = state.update(bar)
+                buffer.append(bar['Date'], [bar[kolom] for kolom in OHLCV] + list(indikator.values()))
+                terakhir = bar['Date']
+                n += 1
+        return n
+
+    @traced('load/live_poll')
+    def poll(self):
+        """
+        Mengambil bar baru dari feed untuk semua emiten
+
+        Returns:
+        dict kode -> jumlah bar baru
+        """
+        with self._lock:
+            since = {kode: buffer.last_time() for kode, buffer in self._buffers.items()}
+        self.last_poll = self.clock()
+        try:
+            frames = self.fetch(self.tickers, since)
+            self.last_error = None
+        except Exception as e:
+            logger.warning("Gagal mengambil bar intraday: %s", e)
+            self.last_error = str(e)
+            return {}
+        return {kode: self.ingest(kode, df) for kode, df in frames.items() if kode in self._buffers}
+
+    def poll_if_due(self):
+        """poll() jika poll terakhir lebih lama dari `refresh` detik; sesi lain yang datang bersamaan tidak menunggu"""
+        if self.last_poll is not None and self.clock() - self.last_poll < self.refresh:
+            return {}
+        if not self._poll_lock.acquire(blocking=False):
+            return {}
+        try:
+            return self.poll()
+        finally:
+            self._poll_lock.release()
+
+    def seq(self, kode):
+        """Nomor urut bar berikutnya untuk emiten (berubah hanya jika ada bar baru)"""
+        with self._lock:
+            return self._buffers[kode].count
+
+    def since(self, kode, seq=0):
+        """Bar emiten dengan nomor urut >= seq yang masih di buffer; (DataFrame, nomor urut berikutnya)"""
+        with self._lock:
+            buffer = self._buffers[kode]
+            return buffer.since(seq), buffer.count
+
+    def frame(self, kode):
+        """Semua bar emiten di buffer (DataFrame index 'Date', kolom OHLCV dan indikator)"""
+        return self.since(kode)[0]
+
+    def nbytes(self):
+        with self._lock:
+            return sum(buffer.nbytes for buffer in self._buffers.values())
+
+
+class LiveChart:
+    """
+    Spesifikasi figure Plotly (dict) bar intraday satu emiten yang hanya
+    ditambah bar baru sejak pembaruan sebelumnya
+
+    Candlestick ditambah satu garis per kolom indikator. Setiap kolom trace
+    disimpan di deque sepanjang kapasitas ring buffer, jadi update() hanya
+    menambahkan bar baru (O(bar baru)) dan ukurannya tetap.
+
+    Streamlit tidak punya API untuk menambah titik ke grafik yang sudah tampil
+    (seperti Plotly.extendTraces), sehingga st.plotly_chart tetap mengirim
+    figure utuh setiap kali fragment berjalan. Yang dihindari adalah membangun
+    ulang figure dari seluruh buffer dan memvalidasinya (lihat CachedFigure);
+    spec hanya disusun ulang jika ada bar baru.
+    """
+
+    def __init__(self, stream, kode, indikator=()):
+        self.stream = stream
+        self.kode = kode
+        self.indikator = [nama for nama in indikator if nama in stream.columns]
+        self.seq = 0
+        capacity = stream.capacity
+        self._kolom = [{'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'}] + \
+                      [{'y': nama} for nama in self.indikator]
+        self._x = deque(maxlen=capacity)
+        self._nilai = [{kunci: deque(maxlen=capacity) for kunci in kolom} for kolom in self._kolom]
+        self._trace = [{'type': 'candlestick', 'name': kode}] + \
+                      [{'type': 'scatter', 'mode': 'lines', 'name': nama, 'line': {'width': 1}}
+                       for nama in self.indikator]
+        self._layout = {'title': {'text': f"Bar Intraday {kode}"}, 'yaxis': {'title': {'text': 'Harga (Rp)'}},
+                        'xaxis': {'rangeslider': {'visible': False}}, 'height': 500,
+                        # zoom pengguna dipertahankan saat data bertambah
+                        'uirevision': kode}
+        self._spec = None
+
+    def update(self):
+        """Menambahkan bar baru dari stream; True jika ada bar baru"""
+        delta, seq = self.stream.since(self.kode, self.seq)
+        if delta.empty:
+            return False
+        self._x.extend(delta.index.strftime('%Y-%m-%dT%H:%M:%S'))
+        for nilai, kolom in zip(self._nilai, self._kolom):
+            for kunci, nama in kolom.items():
+                nilai[kunci].extend(delta[nama].astype(object).where(delta[nama].notna(), None))
+        self.seq = seq
+        self._spec = None
+        return True
+
+    @property
+    def last_time(self):
+        """Waktu bar terakhir di grafik (string ISO) atau None"""
+        return self._x[-1] if self._x else None
+
+    def __len__(self):
+        return len(self._x)
+
+    @property
+    def spec(self):
+        """Figure sebagai dict (disusun ulang hanya setelah ada bar baru)"""
+        if self._spec is None:
+            x = list(self._x)
+            self._spec = {
+                'data': [{**trace, 'x': x, **{kunci: list(d) for kunci, d in nilai.items()}}
+                         for trace, nilai in zip(self._trace, self._nilai)],
+                'layout': self._layout,
+            }
+        return self._spec
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+
+    from core.registry import DEFAULT_REGISTRY, load_registry
+
+    parser = argparse.ArgumentParser(description='Menjalankan stream bar intraday tanpa UI')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY)
+    parser.add_argument('--interval', choices=list(INTERVALS), default=DEFAULT_INTERVAL)
+    parser.add_argument('--replay', help='file CSV bar (Date, Kode, OHLCV) yang diputar ulang')
+    parser.add_argument('--rekam', help='simpan bar intraday Yahoo terbaru ke file CSV untuk --replay')
+    parser.add_argument('--poll', type=int, default=10, help='jumlah poll')
+    parser.add_argument('--bar', type=int, default=10, help='bar per poll saat --replay')
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY)
+    args = parser.parse_args()
+
+    tickers = list(load_registry(args.registry))
+    if args.rekam:
+        frames = yahoo_intraday_feed(args.interval)(tickers, {})
+        bar = pd.concat([df.assign(Kode=kode) for kode, df in frames.items()], ignore_index=True)
+        bar[['Date', 'Kode', *OHLCV]].to_csv(args.rekam, index=False)
+        print(f"{len(bar)} bar ditulis ke {os.path.abspath(args.rekam)}")
+    else:
+        feed = replay_feed(args.replay, args.bar) if args.replay else yahoo_intraday_feed(args.interval)
+        stream = LiveStream(feed, tickers, capacity=args.capacity, refresh=0)
+        t0 = time.perf_counter()
+        total = 0
+        for _ in range(args.poll):
+            total += sum(stream.poll().values())
+        detik = time.perf_counter() - t0
+        for kode in tickers:
+            df = stream.frame(kode)
+            if not df.empty:
+                print(f"{kode:<6} {len(df):6d} bar, terakhir {df.index[-1]}: "
+                      + ', '.join(f"{kolom} {nilai:,.2f}" for kolom, nilai in df.iloc[-1].items()))
+        print(f"{total} bar dalam {detik:.3f} s ({detik / max(total, 1) * 1e6:.1f} µs/bar), "
+              f"buffer {stream.nbytes() / 1024:.0f} KB")
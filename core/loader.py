@@ -0,0 +1,161 @@
+"""
+Pemuatan histori harga banyak emiten secara paralel.
+
+Dua tahap per emiten:
+
+1. bangun : parsing CSV, parsing tanggal dan penulisan ke price store, hanya
+   untuk sumber yang belum ada atau berubah. Tahap ini yang berat (CPU),
+   jadi bisa dijalankan di thread pool atau process pool.
+2. muat   : memory-map kolom dari store lalu validasi (murah, selalu di thread).
+
+Hasilnya panel gabungan plus catatan waktu per emiten, sehingga waktu cold
+start halaman perbandingan mengikuti jumlah core, bukan jumlah emiten.
+
+CLI (mengukur waktu muat registry):
+    python -m core.loader --workers 8 --mode process
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core.panel import FIELDS, FILL_NONE, build_panel, combine_versions
+from core.price_store import PriceStore
+from core.profiler import traced
+
+MODE_THREAD = 'thread'
+MODE_PROCESS = 'process'
+MODES = (MODE_THREAD, MODE_PROCESS)
+
+
+def default_workers():
+    return min(32, os.cpu_count() or 1)
+
+
+def executor(mode, max_workers=None):
+    """Thread pool atau process pool sesuai mode (dipakai juga untuk sweep backtest)"""
+    if mode not in MODES:
+        raise ValueError(f"Mode loader tidak dikenal: {mode} (pilih {', '.join(MODES)})")
+    if mode == MODE_PROCESS:
+        # multiprocessing hanya dimuat jika process pool benar-benar dipakai
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=max_workers or default_workers())
+    return ThreadPoolExecutor(max_workers=max_workers or default_workers())
+
+
+def _build_source(root, source, force):
+    # Fungsi level modul agar bisa dikirim ke process pool
+    store = PriceStore(root)
+    t0 = time.perf_counter()
+    if force:
+        store.build(source)
+    else:
+        store.ensure(source)
+    return time.perf_counter() - t0
+
+
+def validate_prices(kode, df):
+    """Memastikan data harga bisa dipakai: tidak kosong, tanggal terurut naik dan unik"""
+    if df.empty:
+        raise ValueError(f"{kode}: data harga kosong")
+    dates = df['Date'].to_numpy()
+    if len(dates) > 1 and not (np.diff(dates) > np.timedelta64(0, 'ns')).all():
+        raise ValueError(f"{kode}: kolom Date tidak terurut atau ada tanggal ganda")
+    if df['Close'].isna().all():
+        raise ValueError(f"{kode}: kolom Close kosong")
+
+
+def ensure_sources(store, sources, max_workers=None, mode=MODE_THREAD, force=False):
+    """
+    Membangun entri price store yang belum ada atau sudah usang secara paralel
+
+    Parameters:
+    store : PriceStore
+    sources : dict kode -> path CSV harga
+    mode : 'thread' atau 'process'
+    force : bangun ulang semua sumber meskipun masih segar
+
+    Returns:
+    dict kode -> detik pembangunan (0.0 untuk sumber yang tidak perlu dibangun)
+    """
+    basi = {kode: path for kode, path in sources.items() if force or not store.is_fresh(path)}
+    waktu = {kode: 0.0 for kode in sources}
+    if not basi:
+        return waktu
+    if len(basi) == 1:
+        (kode, path), = basi.items()
+        waktu[kode] = _build_source(store.root, path, force)
+        return waktu
+    with executor(mode, min(len(basi), max_workers or default_workers())) as pool:
+        futures = {kode: pool.submit(_build_source, store.root, path, force) for kode, path in basi.items()}
+        for kode, future in futures.items():
+            waktu[kode] = future.result()
+    return waktu
+
+
+def load_prices(store, sources, max_workers=None, mode=MODE_THREAD, force=False):
+    """
+    Memuat data harga banyak emiten secara paralel
+
+    Returns:
+    (frames, timings): frames dict kode -> DataFrame (memory-map, read-only);
+    timings dict kode -> {'dibangun', 'bangun_detik', 'muat_detik', 'baris'}
+    """
+    bangun = ensure_sources(store, sources, max_workers, mode, force)
+
+    def muat(kode):
+        t0 = time.perf_counter()
+        df = store.load(sources[kode])
+        validate_prices(kode, df)
+        return df, time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=min(len(sources), max_workers or default_workers()) or 1) as pool:
+        hasil = dict(zip(sources, pool.map(muat, sources)))
+
+    frames = {kode: df for kode, (df, _) in hasil.items()}
+    timings = {
+        kode: {
+            'dibangun': bangun[kode] > 0,
+            'bangun_detik': bangun[kode],
+            'muat_detik': detik,
+            'baris': len(frames[kode]),
+        }
+        for kode, (_, detik) in hasil.items()
+    }
+    return frames, timings
+
+
+@traced('load/panel')
+def load_panel(store, sources, max_workers=None, mode=MODE_THREAD, fields=FIELDS, fill=FILL_NONE, force=False):
+    """
+    Memuat banyak emiten secara paralel lalu menyusunnya menjadi satu panel
+
+    Returns:
+    (panel, timings), lihat load_prices
+    """
+    frames, timings = load_prices(store, sources, max_workers, mode, force)
+    versi = combine_versions([store.version(path) for path in sources.values()])
+    return build_panel(frames, fields=fields, version=versi, fill=fill), timings
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core.registry import DEFAULT_REGISTRY, load_registry
+
+    parser = argparse.ArgumentParser(description='Mengukur waktu muat paralel semua emiten di registry')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--mode', choices=MODES, default=MODE_THREAD)
+    parser.add_argument('--rebuild', action='store_true', help='bangun ulang price store semua emiten')
+    args = parser.parse_args()
+
+    store = PriceStore()
+    sources = {kode: emiten.harga for kode, emiten in load_registry(args.registry).items()}
+    t0 = time.perf_counter()
+    panel, timings = load_panel(store, sources, args.workers, args.mode, force=args.rebuild)
+    for kode, t in timings.items():
+        print(f"{kode:<8} {'bangun' if t['dibangun'] else 'cache ':<7} {t['bangun_detik'] * 1000:9.1f} ms "
+              f"{t['muat_detik'] * 1000:8.1f} ms {t['baris']:>7} baris")
+    print(f"total {time.perf_counter() - t0:.3f} s untuk {len(timings)} emiten, {len(panel)} tanggal")
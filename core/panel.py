@@ -0,0 +1,185 @@
+"""
+Panel multi-emiten yang diselaraskan berdasarkan tanggal.
+
+Semua emiten ditempatkan pada satu kalender perdagangan gabungan (union dari
+semua tanggal) sehingga perbandingan antar emiten selalu sejajar per tanggal,
+bukan per posisi baris. Data disimpan sebagai array 2D (tanggal x emiten) per
+field, dan pemotongan rentang tanggal memakai binary search pada index yang
+sudah terurut sehingga hasilnya berupa view tanpa salinan.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from core.periode import range_slice
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+KOLOM_VOLUME = 'Volume'
+
+# Kebijakan pengisian tanggal yang kosong (emiten tidak diperdagangkan)
+FILL_NONE = 'none'      # biarkan NaN
+FILL_FFILL = 'ffill'    # harga diisi harga terakhir, volume diisi 0
+
+
+class Panel:
+    """
+    Panel harga: dict field -> array 2D (n_tanggal x n_emiten)
+
+    Attributes:
+    index : DatetimeIndex terurut (kalender gabungan)
+    tickers : list kode emiten (urutan kolom)
+    version : string versi data (gabungan versi tiap sumber)
+    fill : kebijakan pengisian yang dipakai panel ini
+    """
+
+    def __init__(self, index, tickers, arrays, version='', fill=FILL_NONE, base=None):
+        self.index = index
+        self.tickers = list(tickers)
+        self.arrays = arrays
+        self.version = version
+        self.fill = fill
+        self._base = base       # panel mentah (fill='none') asal panel ini
+        self._filled = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def fields(self):
+        return list(self.arrays)
+
+    @property
+    def key(self):
+        """
+        Kunci cache untuk isi panel: versi, kebijakan pengisian dan rentang tanggal
+
+        Panel hasil slice() memakai versi yang sama dengan panel asalnya, jadi
+        hasil yang dihitung dari isi panel harus memakai kunci ini, bukan versi saja.
+        """
+        if not len(self.index):
+            return (self.version, self.fill, None, None, 0)
+        return (self.version, self.fill, self.index[0], self.index[-1], len(self.index))
+
+    def field(self, name, tickers=None):
+        """DataFrame (tanggal x emiten) untuk satu field, tanpa menyalin data"""
+        arr = self.arrays[name]
+        if tickers is None:
+            return pd.DataFrame(arr, index=self.index, columns=self.tickers, copy=False)
+        cols = [self.tickers.index(t) for t in tickers]
+        return pd.DataFrame(arr[:, cols], index=self.index, columns=list(tickers), copy=False)
+
+    def ticker(self, kode, dropna=True):
+        """DataFrame OHLCV satu emiten dengan kolom 'Date' seperti format CSV asli"""
+        j = self.tickers.index(kode)
+        df = pd.DataFrame({'Date': self.index})
+        for name, arr in self.arrays.items():
+            df[name] = arr[:, j]
+        if dropna and 'Close' in self.arrays:
+            df = df[~np.isnan(self.arrays['Close'][:, j])].reset_index(drop=True)
+        return df
+
+    def slice(self, start=None, end=None):
+        """
+        Memotong panel pada rentang tanggal [start, end] (inklusif)
+
+        Memakai searchsorted pada index terurut (O(log n)); array hasilnya
+        adalah view dari array panel asli.
+        """
+        posisi = range_slice(self.index, start, end)
+        arrays = {name: arr[posisi] for name, arr in self.arrays.items()}
+        base = self._base.slice(start, end) if self._base is not None else None
+        return Panel(self.index[posisi], self.tickers, arrays, self.version, self.fill, base)
+
+    def with_fill(self, fill):
+        """
+        Panel dengan kebijakan pengisian lain (dihitung sekali lalu disimpan)
+
+        Sebaiknya dipanggil pada panel penuh sebelum slice(), supaya pengisian
+        hanya dihitung sekali per versi data dan nilai awal rentang ikut terisi.
+        """
+        if fill == self.fill:
+            return self
+        base = self._base if self._base is not None else self
+        if fill == base.fill:
+            return base
+        if fill not in base._filled:
+            base._filled[fill] = Panel(
+                base.index, base.tickers, apply_fill(base.arrays, fill), base.version, fill, base
+            )
+        return base._filled[fill]
+
+
+def apply_fill(arrays, fill):
+    """Menerapkan kebijakan pengisian pada dict array panel"""
+    if fill == FILL_NONE:
+        return arrays
+    if fill != FILL_FFILL:
+        raise ValueError(f"Kebijakan pengisian tidak dikenal: {fill}")
+
+    hasil = {}
+    for name, arr in arrays.items():
+        if name == KOLOM_VOLUME:
+            # Volume 0 pada hari tanpa transaksi, kecuali sebelum emiten tercatat
+            filled = np.where(np.isnan(arr), 0.0, arr)
+            filled[_before_first_valid(arr)] = np.nan
+        else:
+            filled = _ffill_2d(arr)
+        hasil[name] = filled
+    return hasil
+
+
+def _before_first_valid(arr):
+    """Mask posisi sebelum nilai valid pertama di tiap kolom"""
+    return np.cumsum(~np.isnan(arr), axis=0) == 0
+
+
+def _ffill_2d(arr):
+    """Forward-fill vektor per kolom tanpa loop Python"""
+    n = arr.shape[0]
+    idx = np.where(~np.isnan(arr), np.arange(n)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = np.take_along_axis(arr, idx, axis=0)
+    filled[_before_first_valid(arr)] = np.nan
+    return filled
+
+
+def combine_versions(versions):
+    """Menggabungkan versi beberapa sumber data menjadi satu versi panel"""
+    return hashlib.sha1('|'.join(versions).encode()).hexdigest()[:16]
+
+
+def build_panel(frames, fields=FIELDS, version=None, fill=FILL_NONE):
+    """
+    Membangun panel dari beberapa DataFrame per emiten
+
+    Parameters:
+    frames : dict kode emiten -> DataFrame dengan kolom 'Date' dan field OHLCV
+    fields : field yang dimasukkan ke panel
+    version : versi data; jika None dihitung dari isi frame
+    fill : kebijakan pengisian tanggal kosong ('none' atau 'ffill')
+
+    Returns:
+    Panel dengan kalender gabungan semua emiten
+    """
+    tickers = list(frames)
+    dates = [frames[t]['Date'].to_numpy(dtype='datetime64[ns]') for t in tickers]
+    calendar = np.unique(np.concatenate(dates)) if dates else np.array([], dtype='datetime64[ns]')
+
+    arrays = {}
+    for name in fields:
+        arrays[name] = np.full((len(calendar), len(tickers)), np.nan, dtype=np.float64)
+    for j, (t, d) in enumerate(zip(tickers, dates)):
+        pos = np.searchsorted(calendar, d)
+        for name in fields:
+            arrays[name][pos, j] = frames[t][name].to_numpy(dtype=np.float64)
+
+    if version is None:
+        h = hashlib.sha1()
+        for t in tickers:
+            h.update(t.encode())
+            h.update(pd.util.hash_pandas_object(frames[t][['Date', *fields]], index=False).values.tobytes())
+        version = h.hexdigest()[:16]
+
+    panel = Panel(pd.DatetimeIndex(calendar, name='Date'), tickers, arrays, version, FILL_NONE)
+    return panel.with_fill(fill)
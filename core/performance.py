@@ -0,0 +1,214 @@
+"""
+Analitik return dan risiko berbasis indeks total return (dividen diinvestasikan kembali).
+
+Semua metrik dihitung sekaligus untuk semua emiten pada array 2D (tanggal x
+emiten), tanpa loop Python per emiten:
+
+- return harian dan return kumulatif
+- volatilitas bergulir (disetahunkan) memakai running sums
+- drawdown, max drawdown dan durasi drawdown terpanjang
+- Sharpe, Sortino dan beta terhadap indeks sektor equal-weight (rata-rata
+  return harian semua emiten di panel)
+
+Return dihitung antar hari perdagangan emiten itu sendiri, seperti log return
+di core.correlation: hari tanpa transaksi bernilai NaN dan tidak ikut dalam
+statistik. Hasil disimpan di ComputeCache per (jenis, emiten, rentang, versi)
+sehingga rerun tampilan perbandingan hanya membaca hasil.
+"""
+import numpy as np
+import pandas as pd
+
+from core.cache import ComputeCache
+from core.panel import FILL_NONE
+from core.periode import range_slice
+
+HARI_PER_TAHUN = 252  # hari perdagangan per tahun untuk menyetahunkan volatilitas dan rasio
+
+KOLOM_RINGKASAN = ['Total Return (%)', 'CAGR (%)', 'Volatilitas (%)', 'Max Drawdown (%)',
+                   'Durasi Drawdown (hari)', 'Sharpe', 'Sortino', 'Beta']
+
+
+def daily_returns(panel, tr):
+    """
+    Return harian dari indeks total return (DataFrame tanggal x emiten)
+
+    Parameters:
+    panel : Panel sumber indeks (untuk menandai hari tanpa transaksi)
+    tr : indeks total return (lihat core.dividends.total_return)
+    """
+    raw = panel.with_fill(FILL_NONE).arrays['Close']
+    nilai = tr.to_numpy(dtype=np.float64)
+    ret = np.full_like(nilai, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ret[1:] = nilai[1:] / nilai[:-1] - 1
+    ret[np.isnan(raw)] = np.nan
+    return pd.DataFrame(ret, index=tr.index, columns=tr.columns)
+
+
+def sector_returns(returns):
+    """Return harian indeks sektor equal-weight: rata-rata return emiten yang diperdagangkan hari itu"""
+    arr = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(arr)
+    n = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.Series(np.where(valid, arr, 0.0).sum(axis=1) / n, index=returns.index, name='Sektor')
+
+
+def cumulative_returns(tr):
+    """Return kumulatif (%) sejak data valid pertama tiap emiten dalam rentang tr"""
+    arr = tr.to_numpy(dtype=np.float64)
+    if not arr.size:
+        return tr.copy()
+    pertama = np.argmax(~np.isnan(arr), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hasil = (arr / arr[pertama, np.arange(arr.shape[1])] - 1) * 100
+    return pd.DataFrame(hasil, index=tr.index, columns=tr.columns)
+
+
+def rolling_volatility(returns, window, min_periods=None):
+    """
+    Volatilitas bergulir yang disetahunkan (%), std sampel return dalam `window`
+    hari terakhir; hari tanpa transaksi dilewati
+    """
+    min_periods = max(2, window // 2 if min_periods is None else min_periods)
+    arr = returns.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(arr)
+    x = np.where(valid, arr, 0.0)
+
+    def bergulir(a):
+        cs = np.cumsum(a, axis=0)
+        cs[window:] -= cs[:-window].copy()
+        return cs
+
+    n = bergulir(valid.astype(np.float64))
+    s = bergulir(x)
+    ss = bergulir(x * x)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (ss - s * s / n) / (n - 1)
+    vol = np.sqrt(np.maximum(var, 0.0) * HARI_PER_TAHUN) * 100
+    vol[n < min_periods] = np.nan
+    return pd.DataFrame(vol, index=returns.index, columns=returns.columns)
+
+
+def drawdown(tr):
+    """Drawdown (%) terhadap puncak tertinggi sebelumnya dalam rentang tr"""
+    arr = tr.to_numpy(dtype=np.float64)
+    puncak = np.fmax.accumulate(arr, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame((arr / puncak - 1) * 100, index=tr.index, columns=tr.columns)
+
+
+def drawdown_duration(dd):
+    """Durasi drawdown terpanjang (hari kalender) dari puncak hingga pulih atau akhir rentang, per emiten"""
+    arr = dd.to_numpy(dtype=np.float64)
+    if not len(arr):
+        return pd.Series(np.nan, index=dd.columns)
+    hari = dd.index.to_numpy().astype('datetime64[D]').astype(np.int64)
+    # posisi puncak terakhir (drawdown 0) di atau sebelum setiap tanggal
+    di_puncak = arr >= 0
+    puncak = np.maximum.accumulate(np.where(di_puncak, np.arange(len(arr))[:, None], -1), axis=0)
+    durasi = np.where(puncak >= 0, hari[:, None] - hari[np.maximum(puncak, 0)], 0)
+    return pd.Series(durasi.max(axis=0), index=dd.columns, dtype=np.float64)
+
+
+def beta(returns, acuan):
+    """Beta tiap emiten terhadap return acuan, hanya pada hari keduanya valid"""
+    r = returns.to_numpy(dtype=np.float64)
+    m = acuan.to_numpy(dtype=np.float64)[:, None]
+    valid = ~np.isnan(r) & ~np.isnan(m)
+    n = valid.sum(axis=0)
+    r0, m0 = np.where(valid, r, 0.0), np.where(valid, m, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_r, mean_m = r0.sum(axis=0) / n, m0.sum(axis=0) / n
+        cov = (r0 * m0).sum(axis=0) / n - mean_r * mean_m
+        var = (m0 * m0).sum(axis=0) / n - mean_m * mean_m
+        hasil = cov / var
+    hasil[n < 2] = np.nan
+    return pd.Series(hasil, index=returns.columns)
+
+
+def ringkasan_performa(tr, returns, risk_free=0.0):
+    """
+    Tabel metrik return dan risiko per emiten dalam rentang tr/returns
+
+    Parameters:
+    tr : indeks total return dalam rentang
+    returns : return harian dalam rentang yang sama (lihat daily_returns)
+    risk_free : suku bunga bebas risiko per tahun (desimal, mis. 0.06)
+
+    Returns:
+    DataFrame indeks Emiten dengan kolom KOLOM_RINGKASAN
+    """
+    arr = returns.to_numpy(dtype=np.float64)
+    if len(arr):
+        arr = arr.copy()
+        arr[0] = np.nan  # return hari pertama berasal dari sebelum rentang
+    ret = pd.DataFrame(arr, index=returns.index, columns=returns.columns)
+    lebih = arr - risk_free / HARI_PER_TAHUN
+    n = (~np.isnan(arr)).sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        kumulatif = cumulative_returns(tr)
+        total = kumulatif.ffill().iloc[-1].to_numpy() if len(tr) else np.full(tr.shape[1], np.nan)
+        tahun = n / HARI_PER_TAHUN
+        cagr = ((1 + total / 100) ** (1 / tahun) - 1) * 100
+        std = np.nanstd(arr, axis=0, ddof=1) if len(arr) > 1 else np.full(arr.shape[1], np.nan)
+        mean_lebih = np.nanmean(lebih, axis=0) if len(arr) else np.full(arr.shape[1], np.nan)
+        turun = np.sqrt(np.nanmean(np.minimum(lebih, 0.0) ** 2, axis=0)) if len(arr) else mean_lebih
+        sharpe = mean_lebih / std * np.sqrt(HARI_PER_TAHUN)
+        sortino = mean_lebih / turun * np.sqrt(HARI_PER_TAHUN)
+
+    dd = drawdown(tr)
+    hasil = pd.DataFrame({
+        'Total Return (%)': total,
+        'CAGR (%)': cagr,
+        'Volatilitas (%)': std * np.sqrt(HARI_PER_TAHUN) * 100,
+        'Max Drawdown (%)': dd.min().to_numpy(),
+        'Durasi Drawdown (hari)': drawdown_duration(dd).to_numpy(),
+        'Sharpe': sharpe,
+        'Sortino': sortino,
+        'Beta': beta(ret, sector_returns(ret)).to_numpy(),
+    }, index=pd.Index(tr.columns, name='Emiten'))
+    return hasil.replace([np.inf, -np.inf], np.nan)
+
+
+class PerformanceEngine:
+    """
+    Metrik return dan risiko dengan cache per (jenis, emiten, rentang, versi)
+
+    version adalah versi indeks total return (harga + dividen). Return harian
+    dan volatilitas bergulir dihitung atas histori penuh lalu dipotong;
+    drawdown dan ringkasan dihitung ulang per rentang karena puncak dan
+    statistiknya bergantung pada awal rentang.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else ComputeCache()
+
+    def returns(self, panel, tr, version):
+        return self.cache.get_or_compute(
+            ('return_harian', tuple(tr.columns), version), lambda: daily_returns(panel, tr)
+        )
+
+    def volatility(self, panel, tr, version, window, start=None, end=None):
+        """Volatilitas bergulir yang disetahunkan (%)"""
+        full = self.cache.get_or_compute(
+            ('volatilitas', tuple(tr.columns), window, version),
+            lambda: rolling_volatility(self.returns(panel, tr, version), window)
+        )
+        return full.iloc[range_slice(full.index, start, end)]
+
+    def drawdown(self, panel, tr, version, start=None, end=None):
+        return self.cache.get_or_compute(
+            ('drawdown', tuple(tr.columns), start, end, version),
+            lambda: drawdown(tr.iloc[range_slice(tr.index, start, end)])
+        )
+
+    def summary(self, panel, tr, version, start=None, end=None, risk_free=0.0):
+        """Tabel ringkasan (lihat ringkasan_performa) untuk rentang [start, end]"""
+        def hitung():
+            posisi = range_slice(tr.index, start, end)
+            return ringkasan_performa(tr.iloc[posisi], self.returns(panel, tr, version).iloc[posisi], risk_free)
+        return self.cache.get_or_compute(
+            ('performa', tuple(tr.columns), start, end, risk_free, version), hitung
+        )
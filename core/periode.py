@@ -0,0 +1,102 @@
+"""
+Penentuan rentang tanggal dari pilihan periode di panel kontrol.
+
+Periode preset ('10y', '5y', ..., '1mo') dihitung mundur dari hari ini
+dengan kalender (10 tahun = tanggal yang sama 10 tahun lalu, termasuk tahun
+kabisat), dinormalisasi ke awal hari agar kunci cache stabil sepanjang hari.
+'custom' memakai tanggal pilihan pengguna, dan 'max' berarti semua data.
+
+Rentang diterapkan dengan binary search pada kolom tanggal yang terurut
+(range_slice), sehingga hasilnya berupa potongan tanpa salinan dan tanpa
+mask boolean per baris.
+"""
+import numpy as np
+import pandas as pd
+
+# Panjang periode preset dalam satuan kalender
+PERIODE = {
+    '10y': pd.DateOffset(years=10),
+    '5y': pd.DateOffset(years=5),
+    '3y': pd.DateOffset(years=3),
+    '1y': pd.DateOffset(years=1),
+    '6mo': pd.DateOffset(months=6),
+    '3mo': pd.DateOffset(months=3),
+    '1mo': pd.DateOffset(months=1)
+}
+
+# Semua periode preset pada panel kontrol ('max' = semua data)
+PRESET = ('max', *PERIODE)
+
+
+def hari_ini():
+    """Tanggal hari ini (awal hari)"""
+    return pd.Timestamp.now().normalize()
+
+
+def rentang_periode(period, start_date=None, end_date=None, now=None):
+    """
+    Rentang tanggal (start, end) untuk periode yang dipilih
+
+    Parameters:
+    period : 'max', 'custom', atau salah satu kunci PERIODE
+    start_date, end_date : tanggal pilihan pengguna (hanya untuk 'custom')
+    now : tanggal acuan periode preset (default: hari ini)
+
+    Returns:
+    tuple (start, end); None berarti tanpa batas di sisi tersebut
+    """
+    if period == 'custom':
+        return _timestamp(start_date), _timestamp(end_date)
+    if period == 'max':
+        return None, None
+    now = hari_ini() if now is None else pd.Timestamp(now)
+    return now - PERIODE[period], None
+
+
+def rentang_tahun(period, start_date=None, end_date=None, now=None):
+    """
+    Rentang tahun (start, end) untuk data tahunan seperti dividen
+
+    Periode preset di bawah satu tahun tetap mencakup tahun lalu, agar data
+    tahunan terakhir yang lengkap ikut tampil.
+
+    Returns:
+    tuple (tahun awal, tahun akhir); None berarti tanpa batas
+    """
+    start, end = rentang_periode(period, start_date, end_date, now)
+    if period not in ('custom', 'max'):
+        now = hari_ini() if now is None else pd.Timestamp(now)
+        start = min(start, now - PERIODE['1y'])
+    return (None if start is None else start.year), (None if end is None else end.year)
+
+
+def filter_tahun(df, rentang, kolom='Tahun'):
+    """Baris DataFrame tahunan yang tahunnya berada dalam rentang (start, end)"""
+    start, end = rentang
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df[kolom] >= start
+    if end is not None:
+        mask &= df[kolom] <= end
+    return df[mask]
+
+
+def _timestamp(tanggal):
+    return None if tanggal is None else pd.Timestamp(tanggal)
+
+
+def range_slice(dates, start=None, end=None):
+    """
+    Posisi baris dengan start <= tanggal <= end, memakai binary search
+
+    Parameters:
+    dates : tanggal terurut naik (DatetimeIndex, Series atau array datetime64)
+    start, end : batas rentang (inklusif); None berarti tanpa batas
+
+    Returns:
+    slice posisi, untuk .iloc atau indeks array (tanpa salinan data)
+    """
+    values = np.asarray(dates, dtype='datetime64[ns]')
+    lo = 0 if start is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(start), 'ns'), side='left'))
+    hi = len(values) if end is None else int(np.searchsorted(values, np.datetime64(pd.Timestamp(end), 'ns'), side='right'))
+    return slice(lo, hi)
@@ -0,0 +1,422 @@
+"""
+Price store kolumnar untuk data historis saham.
+
+File CSV (misalnya adro_fix.csv) dikonversi sekali menjadi array NumPy per kolom
+(.npy) yang ringkas: tanggal sebagai nomor hari int32, harga float32 dan volume
+uint32 (uint64 hanya jika ada volume yang tidak muat). Kolom *_normalized di
+CSV tidak disimpan; cukup min/max-nya di meta.json, dan nilainya dihitung saat
+diminta (load(..., normalized=True)). Saat dibaca, array di-memory-map sehingga
+DataFrame yang dikembalikan tidak perlu parsing ulang dan kolom harga/volume
+tidak disalin (zero-copy); hanya kolom tanggal yang diubah kembali menjadi
+datetime64, sekali per versi data.
+
+Konversi ulang hanya dilakukan jika mtime/ukuran file CSV berubah DAN hash
+isinya juga berubah.
+
+Bar baru (dari updater) ditambahkan sebagai segmen kecil tersendiri sehingga
+biaya penulisan sebanding dengan jumlah bar baru; segmen digabung kembali
+(compaction) jika jumlahnya melebihi MAX_SEGMENTS.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.periode import range_slice
+from core.profiler import traced
+
+DEFAULT_ROOT = '.price_store'
+
+# Tipe data per kolom; kolom yang tidak dikenal disimpan sebagai float32
+KOLOM_VOLUME = 'Volume'
+DTYPE_HARGA = np.float32
+DTYPE_TANGGAL = np.int32    # jumlah hari sejak 1970-01-01
+DTYPE_VOLUME = (np.uint32, np.uint64)   # dipilih yang terkecil yang muat
+SUFFIX_NORMALIZED = '_normalized'
+FORMAT_VERSION = 3  # naikkan jika struktur store berubah agar store lama dibangun ulang
+MAX_SEGMENTS = 16
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Menghitung hash SHA-1 isi file"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@traced('load/csv_parse')
+def parse_price_csv(path):
+    """
+    Membaca dan mem-parsing CSV harga menjadi DataFrame bertipe
+
+    Parameters:
+    path : path file CSV dengan kolom 'Date' dan kolom OHLCV
+
+    Returns:
+    DataFrame dengan 'Date' datetime64[ns] (tanpa timezone), harga float32,
+    volume uint32/uint64 (lihat volume_dtype)
+    """
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_localize(None).astype('datetime64[ns]')
+    for col in df.columns:
+        if col == 'Date':
+            continue
+        if col == KOLOM_VOLUME:
+            df[col] = as_volume(df[col])
+        else:
+            df[col] = df[col].astype(DTYPE_HARGA)
+    return df.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def volume_dtype(values):
+    """Tipe unsigned terkecil (lihat DTYPE_VOLUME) yang memuat volume terbesar"""
+    maks = int(np.max(values)) if len(values) else 0
+    for dtype in DTYPE_VOLUME:
+        if maks <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Volume terlalu besar untuk disimpan: {maks}")
+
+
+def as_volume(values):
+    """Volume sebagai bilangan bulat tak bertanda bertipe terkecil (kosong/negatif menjadi 0)"""
+    volume = np.asarray(pd.Series(values).fillna(0).clip(lower=0), dtype=np.uint64)
+    return volume.astype(volume_dtype(volume))
+
+
+def encode_dates(dates):
+    """Tanggal (datetime64) menjadi nomor hari int32 untuk disimpan"""
+    return np.asarray(dates, dtype='datetime64[ns]').astype('datetime64[D]').astype(DTYPE_TANGGAL)
+
+
+def decode_dates(days):
+    """Nomor hari int32 dari store menjadi datetime64[ns]"""
+    return np.asarray(days).astype('datetime64[D]').astype('datetime64[ns]')
+
+
+def coerce_frame(df, columns):
+    """Menyamakan kolom dan tipe data frame baru dengan skema store"""
+    hasil = pd.DataFrame({'Date': pd.to_datetime(df['Date']).astype('datetime64[ns]').to_numpy()})
+    for col in columns:
+        if col == 'Date' or col.endswith(SUFFIX_NORMALIZED):
+            continue
+        if col == KOLOM_VOLUME:
+            hasil[col] = as_volume(df[col])
+        elif col in df:
+            hasil[col] = df[col].astype(DTYPE_HARGA).to_numpy()
+        else:
+            # Misalnya 'Adj Close' yang tidak tersedia dari sumber data baru
+            hasil[col] = df['Close'].astype(DTYPE_HARGA).to_numpy()
+    return hasil
+
+
+def normalized_columns(columns):
+    """Pasangan (kolom asli, kolom *_normalized) yang ada di skema"""
+    return [(col[:-len(SUFFIX_NORMALIZED)], col) for col in columns if col.endswith(SUFFIX_NORMALIZED)]
+
+
+def column_stats(df, columns):
+    """Min/max kolom yang punya versi *_normalized (dasar normalisasi min-max)"""
+    return {raw: {'min': float(df[raw].min()), 'max': float(df[raw].max())} for raw in columns}
+
+
+def normalize(values, stat):
+    """Normalisasi min-max memakai statistik yang tersimpan"""
+    rentang = stat['max'] - stat['min']
+    if rentang == 0:
+        return np.zeros(len(values), dtype=DTYPE_HARGA)
+    return ((np.asarray(values, dtype=np.float64) - stat['min']) / rentang).astype(DTYPE_HARGA)
+
+
+class PriceStore:
+    """
+    Penyimpanan kolumnar untuk CSV harga saham.
+
+    Struktur direktori:
+        <root>/<nama>/meta.json            -> versi aktif, daftar segmen, tipe kolom, min/max, fingerprint sumber
+        <root>/<nama>/<segmen>/<kolom>.npy  (Date sebagai nomor hari int32)
+
+    <nama> adalah nama file CSV ditambah hash direktorinya, sehingga dua CSV
+    bernama sama dari direktori berbeda tidak berbagi store.
+
+    Setiap segmen ditulis ke direktori baru lalu meta.json diganti secara
+    atomik, sehingga pembaca tidak pernah melihat data setengah jadi.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._lock = threading.Lock()
+        self._locks = {}    # nama -> RLock, agar sumber berbeda bisa dibangun paralel
+        self._frames = {}   # nama -> (versi, DataFrame)
+
+    # ------------------------------------------------------------------
+    # Helper path dan metadata
+    # ------------------------------------------------------------------
+    def _name(self, source):
+        folder = os.path.dirname(os.path.abspath(source))
+        return f"{os.path.splitext(os.path.basename(source))[0]}-{hashlib.sha1(folder.encode()).hexdigest()[:8]}"
+
+    def _source_lock(self, source):
+        name = self._name(source)
+        with self._lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.RLock()
+            return lock
+
+    def _dir(self, source):
+        return os.path.join(self.root, self._name(source))
+
+    def _meta_path(self, source):
+        return os.path.join(self._dir(source), 'meta.json')
+
+    def read_meta(self, source):
+        """Membaca meta.json untuk sumber tertentu (None jika belum ada)"""
+        try:
+            with open(self._meta_path(source)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self, source, meta):
+        path = self._meta_path(source)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, path)
+
+    def _cleanup(self, source, keep):
+        """Menghapus direktori segmen lama (mmap yang masih terbuka tetap valid di POSIX)"""
+        base = self._dir(source)
+        for entry in os.listdir(base):
+            full = os.path.join(base, entry)
+            if entry not in keep and os.path.isdir(full):
+                shutil.rmtree(full, ignore_errors=True)
+
+    def _write_segment(self, source, name, df):
+        target = os.path.join(self._dir(source), name)
+        if not os.path.isdir(target):
+            tmp = f"{target}.tmp-{os.getpid()}"
+            os.makedirs(tmp, exist_ok=True)
+            for col in df.columns:
+                values = encode_dates(df[col]) if col == 'Date' else df[col].to_numpy()
+                np.save(os.path.join(tmp, f"{col}.npy"), values)
+            os.replace(tmp, target)
+
+    # ------------------------------------------------------------------
+    # Build dan validasi
+    # ------------------------------------------------------------------
+    def is_fresh(self, source, meta=None):
+        """Mengecek apakah store masih sesuai dengan file CSV sumber"""
+        meta = meta if meta is not None else self.read_meta(source)
+        if meta is None or meta.get('format') != FORMAT_VERSION:
+            return False
+        st = os.stat(source)
+        src = meta['source']
+        if src['mtime_ns'] == st.st_mtime_ns and src['size'] == st.st_size:
+            return True
+        # mtime berubah (misalnya checkout ulang) tapi isi bisa saja sama
+        if hash_file(source) == src['sha1']:
+            src['mtime_ns'], src['size'] = st.st_mtime_ns, st.st_size
+            self._write_meta(source, meta)
+            return True
+        return False
+
+    def write_frame(self, source, df, meta_extra=None):
+        """
+        Menulis DataFrame bertipe sebagai versi baru dan mengaktifkannya
+
+        Kolom *_normalized tidak ditulis; hanya min/max kolom aslinya yang
+        disimpan agar bisa dihitung ulang saat dibaca. Volume disimpan dengan
+        tipe unsigned terkecil yang muat.
+
+        Returns:
+        string versi yang baru ditulis
+        """
+        with self._source_lock(source):
+            meta = self.read_meta(source) or {}
+            normalized = [raw for raw, _ in normalized_columns(df.columns)] or meta.get('normalized', [])
+            df = pd.DataFrame({col: df[col].to_numpy() for col in df.columns if not col.endswith(SUFFIX_NORMALIZED)},
+                              copy=False)
+            if KOLOM_VOLUME in df:
+                df[KOLOM_VOLUME] = as_volume(df[KOLOM_VOLUME])
+            versi = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()[:16]
+            self._write_segment(source, versi, df)
+
+            st = os.stat(source)
+            meta.update(meta_extra or {})
+            meta.update({
+                'format': FORMAT_VERSION,
+                'version': versi,
+                'segments': [versi],
+                'columns': list(df.columns),
+                'dtypes': {col: str(df[col].dtype) for col in df.columns if col != 'Date'},
+                'rows': len(df),
+                'last_date': str(df['Date'].iloc[-1]) if len(df) else None,
+                'normalized': normalized,
+                'stats': column_stats(df, normalized),
+            })
+            meta.setdefault('source', {})
+            meta['source'].update({'path': source, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size})
+            if 'sha1' not in meta['source']:
+                meta['source']['sha1'] = hash_file(source)
+            self._write_meta(source, meta)
+            self._cleanup(source, meta['segments'])
+            self._frames.pop(self._name(source), None)
+            return versi
+
+    def append(self, source, bars):
+        """
+        Menambahkan bar baru (tanggal setelah bar terakhir) ke store secara atomik
+
+        Min/max dasar normalisasi cukup diperbarui di meta.json karena kolom
+        *_normalized tidak disimpan. Jika volume bar baru tidak muat di tipe
+        volume yang tersimpan, semua segmen ditulis ulang dengan tipe yang
+        lebih lebar.
+
+        Parameters:
+        source : path CSV sumber (kunci store)
+        bars : DataFrame dengan kolom 'Date' dan OHLCV
+
+        Returns:
+        jumlah bar yang benar-benar ditambahkan
+        """
+        with self._source_lock(source):
+            meta = self.ensure(source)
+            bars = coerce_frame(bars, meta['columns'])
+            if meta['last_date'] is not None:
+                bars = bars[bars['Date'] > pd.Timestamp(meta['last_date'])]
+            bars = bars.drop_duplicates('Date', keep='last').sort_values('Date').reset_index(drop=True)
+            if bars.empty:
+                return 0
+
+            bars = bars[meta['columns']]
+
+            tipe = meta['dtypes'].get(KOLOM_VOLUME)
+            if tipe is not None:
+                if np.dtype(volume_dtype(bars[KOLOM_VOLUME])).itemsize > np.dtype(tipe).itemsize:
+                    # Volume tidak muat di tipe lama: tulis ulang satu segmen utuh dengan tipe yang lebih lebar
+                    df = self.load(source)
+                    self.write_frame(source, pd.concat([df, bars], ignore_index=True))
+                    return len(bars)
+                bars[KOLOM_VOLUME] = bars[KOLOM_VOLUME].astype(tipe)
+
+            segmen = hashlib.sha1(
+                (meta['version'] + str(bars['Date'].iloc[-1]) + str(len(bars))).encode()
+            ).hexdigest()[:16]
+            self._write_segment(source, segmen, bars)
+            meta['segments'].append(segmen)
+            meta['version'] = segmen
+            meta['rows'] += len(bars)
+            meta['last_date'] = str(bars['Date'].iloc[-1])
+            meta['stats'] = {
+                raw: {'min': min(stat['min'], float(bars[raw].min())),
+                      'max': max(stat['max'], float(bars[raw].max()))}
+                for raw, stat in meta['stats'].items()
+            }
+            self._write_meta(source, meta)
+            self._frames.pop(self._name(source), None)
+
+            if len(meta['segments']) > MAX_SEGMENTS:
+                self.compact(source)
+            return len(bars)
+
+    def compact(self, source):
+        """Menggabungkan semua segmen menjadi satu segmen"""
+        with self._source_lock(source):
+            meta = self.ensure(source)
+            if len(meta['segments']) > 1:
+                df = self.load(source)
+                self.write_frame(source, pd.DataFrame({col: df[col].to_numpy() for col in df.columns}))
+
+    def build(self, source):
+        """Mengonversi CSV menjadi store kolumnar (selalu membangun ulang)"""
+        with self._source_lock(source):
+            os.makedirs(self._dir(source), exist_ok=True)
+            df = parse_price_csv(source)
+            meta = self.read_meta(source) or {}
+            meta['source'] = {'sha1': hash_file(source)}
+            self._write_meta(source, meta)
+            return self.write_frame(source, df)
+
+    def ensure(self, source):
+        """Membangun store jika belum ada atau sumbernya berubah, lalu mengembalikan meta"""
+        with self._source_lock(source):
+            meta = self.read_meta(source)
+            if not self.is_fresh(source, meta):
+                self.build(source)
+                meta = self.read_meta(source)
+            return meta
+
+    # ------------------------------------------------------------------
+    # Pembacaan
+    # ------------------------------------------------------------------
+    def version(self, source):
+        """Versi data (hash) yang aktif untuk sumber tertentu"""
+        return self.ensure(source)['version']
+
+    def last_date(self, source):
+        """Tanggal bar terakhir yang tersimpan (tanpa membaca data)"""
+        last = self.ensure(source)['last_date']
+        return pd.Timestamp(last) if last is not None else None
+
+    @traced('load/store')
+    def load(self, source, normalized=False):
+        """
+        Mengambil DataFrame harga yang sudah di-parse dari store
+
+        Kolom harga dan volume adalah array read-only hasil memory-map, jadi
+        jangan diubah in-place; gunakan .copy() bila perlu memodifikasi.
+
+        Parameters:
+        normalized : tambahkan kolom *_normalized (min-max, float32) seperti
+            di CSV sumber, dihitung dari min/max yang tersimpan
+        """
+        meta = self.ensure(source)
+        name = self._name(source)
+        cached = self._frames.get(name)
+        if cached is not None and cached[0] == meta['version']:
+            df = cached[1]
+        else:
+            folders = [os.path.join(self._dir(source), seg) for seg in meta['segments']]
+            columns = {}
+            for col in meta['columns']:
+                parts = [np.load(os.path.join(folder, f"{col}.npy"), mmap_mode='r') for folder in folders]
+                # Satu segmen: langsung memory-map (zero-copy); lebih dari satu: digabung sekali per versi
+                columns[col] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            columns['Date'] = decode_dates(columns['Date'])
+            df = pd.DataFrame(columns, copy=False)
+            self._frames[name] = (meta['version'], df)
+
+        if not normalized or not meta['normalized']:
+            return df
+        hasil = pd.DataFrame({col: df[col].to_numpy() for col in df.columns}, copy=False)
+        for raw in meta['normalized']:
+            hasil[f"{raw}{SUFFIX_NORMALIZED}"] = normalize(df[raw].to_numpy(), meta['stats'][raw])
+        return hasil
+
+    def load_range(self, source, start=None, end=None):
+        """
+        Baris dengan start <= Date <= end (inklusif; None = tanpa batas)
+
+        Kolom Date di store selalu terurut, jadi rentang dicari dengan binary
+        search dan hasilnya potongan baris tanpa salinan dari load().
+        """
+        df = self.load(source)
+        return df.iloc[range_slice(df['Date'], start, end)]
+
+
+if __name__ == '__main__':
+    # Konversi semua CSV harga di direktori kerja: python -m core.price_store [file.csv ...]
+    import glob
+    import sys
+
+    sources = sys.argv[1:] or sorted(glob.glob('*_fix.csv'))
+    store = PriceStore()
+    for src in sources:
+        print(f"{src}: versi {store.version(src)}")
@@ -0,0 +1,255 @@
+"""
+Instrumentasi ringan untuk melihat ke mana waktu satu rerun dashboard habis.
+
+Setiap tahap (muat, hitung, gambar) dibungkus span bernama, baik lewat
+context manager maupun dekorator:
+
+    with span('render/sidebar'):
+        ...
+
+    @traced('load/csv_parse')
+    def parse_price_csv(path): ...
+
+Span yang terjadi di dalam `Profiler.rerun()` dicatat ke rekaman rerun
+tersebut (per thread, karena setiap sesi Streamlit berjalan di thread
+sendiri); span di thread background (updater, warmer) hanya masuk ke
+total kumulatif. Waktu span bersifat inklusif: span bersarang ikut terhitung
+di span induknya. Rekaman N rerun terakhir bisa diekspor dalam format teks
+Prometheus atau JSONL, dan satu rerun bisa diprofil penuh dengan cProfile
+(atau pyinstrument jika terpasang).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RERUNS = 50
+TOTAL = 'rerun'             # nama tahap untuk durasi total satu rerun
+
+MESIN_CPROFILE = 'cprofile'
+MESIN_PYINSTRUMENT = 'pyinstrument'
+MESIN_PROFIL = (MESIN_CPROFILE, MESIN_PYINSTRUMENT)
+
+KOLOM_STATISTIK = ['Rerun', 'Panggilan', 'Rata-rata (ms)', 'p50 (ms)', 'p95 (ms)', 'Maks (ms)', 'Terakhir (ms)']
+
+
+def pyinstrument_tersedia():
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Profiler:
+    """
+    Pencatat span per rerun dengan riwayat `max_reruns` rerun terakhir
+
+    sinks : fungsi yang dipanggil dengan rekaman setiap rerun yang selesai
+    (lihat jsonl_sink dan prometheus_sink)
+    """
+
+    def __init__(self, max_reruns=DEFAULT_MAX_RERUNS, sinks=None):
+        self.sinks = list(sinks or [])
+        self.last_profile = None    # {'mulai', 'mesin', 'laporan'}
+        self._runs = deque(maxlen=max_reruns)
+        self._totals = {}           # tahap -> [panggilan, detik] sejak proses mulai
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _record(self, nama, detik):
+        run = getattr(self._local, 'run', None)
+        if run is not None:
+            total, jumlah = run['spans'].get(nama, (0.0, 0))
+            run['spans'][nama] = (total + detik, jumlah + 1)
+        with self._lock:
+            total = self._totals.setdefault(nama, [0, 0.0])
+            total[0] += 1
+            total[1] += detik
+
+    @contextmanager
+    def span(self, nama):
+        """Mencatat durasi blok sebagai tahap `nama`"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(nama, time.perf_counter() - t0)
+
+    def traced(self, nama=None):
+        """Dekorator span; nama default adalah qualname fungsi"""
+        def dekorator(fungsi):
+            label = nama or fungsi.__qualname__
+
+            @wraps(fungsi)
+            def wrapper(*args, **kwargs):
+                with self.span(label):
+                    return fungsi(*args, **kwargs)
+            return wrapper
+        return dekorator
+
+    @contextmanager
+    def rerun(self, label=''):
+        """
+        Mengumpulkan span satu rerun; rekaman (dict yang di-yield, label boleh
+        diubah di dalam blok) disimpan juga saat rerun berhenti lewat exception
+        seperti st.stop() atau st.rerun()
+        """
+        run = {'mulai': time.time(), 'label': label, 'total': None, 'spans': {}}
+        sebelumnya = getattr(self._local, 'run', None)
+        self._local.run = run
+        t0 = time.perf_counter()
+        try:
+            yield run
+        finally:
+            run['total'] = time.perf_counter() - t0
+            self._local.run = sebelumnya
+            self._record(TOTAL, run['total'])
+            with self._lock:
+                self._runs.append(run)
+            for sink in self.sinks:
+                try:
+                    sink(self, run)
+                except Exception as e:
+                    logger.warning("Gagal mengekspor rekaman profiler: %s", e)
+
+    @contextmanager
+    def capture(self, mesin=MESIN_CPROFILE, top=40):
+        """
+        Memprofil blok (satu rerun) dengan cProfile atau pyinstrument dan
+        menyimpan laporan teksnya di `last_profile`; pyinstrument yang tidak
+        terpasang diganti cProfile
+        """
+        if mesin == MESIN_PYINSTRUMENT and not pyinstrument_tersedia():
+            logger.warning("pyinstrument tidak terpasang, memakai cProfile")
+            mesin = MESIN_CPROFILE
+        mulai = time.time()
+        if mesin == MESIN_PYINSTRUMENT:
+            from pyinstrument import Profiler as Pyinstrument
+
+            profil = Pyinstrument()
+            profil.start()
+            try:
+                yield
+            finally:
+                profil.stop()
+                laporan = profil.output_text(unicode=True, color=False)
+        else:
+            import cProfile
+            import io
+            import pstats
+
+            profil = cProfile.Profile()
+            profil.enable()
+            try:
+                yield
+            finally:
+                profil.disable()
+                buffer = io.StringIO()
+                pstats.Stats(profil, stream=buffer).sort_stats('cumulative').print_stats(top)
+                laporan = buffer.getvalue()
+        self.last_profile = {'mulai': mulai, 'mesin': mesin, 'laporan': laporan}
+
+    def runs(self):
+        """Rekaman rerun terakhir, terlama lebih dulu"""
+        with self._lock:
+            return list(self._runs)
+
+    def totals(self):
+        """dict tahap -> (panggilan, detik) sejak proses mulai, termasuk thread background"""
+        with self._lock:
+            return {nama: tuple(nilai) for nama, nilai in self._totals.items()}
+
+    def stage_stats(self):
+        """
+        Latensi per tahap atas rerun yang tersimpan (DataFrame indeks Tahap,
+        kolom KOLOM_STATISTIK); persentil dihitung dari total tahap per rerun
+        """
+        runs = self.runs()
+        per_tahap = {}
+        for run in runs:
+            per_tahap.setdefault(TOTAL, []).append((run['total'], 1))
+            for nama, nilai in run['spans'].items():
+                per_tahap.setdefault(nama, []).append(nilai)
+        baris = {}
+        for nama, nilai in per_tahap.items():
+            detik = np.array([d for d, _ in nilai]) * 1000
+            baris[nama] = [len(nilai), sum(n for _, n in nilai), detik.mean(), np.percentile(detik, 50),
+                           np.percentile(detik, 95), detik.max(), detik[-1]]
+        hasil = pd.DataFrame.from_dict(baris, orient='index', columns=KOLOM_STATISTIK).rename_axis('Tahap')
+        return hasil.sort_values('Rata-rata (ms)', ascending=False)
+
+    def to_prometheus(self, prefix='dashboard'):
+        """
+        Teks exposition format Prometheus: summary `<prefix>_stage_seconds`
+        per tahap (kuantil dari rerun tersimpan, _sum/_count kumulatif)
+        """
+        nama_metrik = f"{prefix}_stage_seconds"
+        per_tahap = {}
+        for run in self.runs():
+            per_tahap.setdefault(TOTAL, []).append(run['total'])
+            for nama, (detik, _) in run['spans'].items():
+                per_tahap.setdefault(nama, []).append(detik)
+        baris = [f"# HELP {nama_metrik} Durasi tahap dashboard per rerun (detik)",
+                 f"# TYPE {nama_metrik} summary"]
+        for nama, (panggilan, detik) in sorted(self.totals().items()):
+            label = nama.replace('\\', '\\\\').replace('"', '\\"')
+            for q in (0.5, 0.95):
+                if nama in per_tahap:
+                    baris.append(f'{nama_metrik}{{stage="{label}",quantile="{q}"}} '
+                                 f"{np.quantile(per_tahap[nama], q):.6f}")
+            baris.append(f'{nama_metrik}_sum{{stage="{label}"}} {detik:.6f}')
+            baris.append(f'{nama_metrik}_count{{stage="{label}"}} {panggilan}')
+        return '\n'.join(baris) + '\n'
+
+    def to_jsonl(self):
+        """Satu baris JSON per rerun tersimpan"""
+        return ''.join(json_line(run) for run in self.runs())
+
+
+def json_line(run):
+    """Rekaman satu rerun sebagai satu baris JSON (detik per tahap)"""
+    return json.dumps({
+        'mulai': pd.Timestamp(run['mulai'], unit='s').isoformat(),
+        'label': run['label'],
+        'total': run['total'],
+        'spans': {nama: detik for nama, (detik, _) in run['spans'].items()},
+    }) + '\n'
+
+
+def jsonl_sink(path):
+    """Sink yang menambahkan setiap rerun sebagai satu baris ke file JSONL"""
+    kunci = threading.Lock()
+
+    def tulis(profiler, run):
+        with kunci, open(path, 'a', encoding='utf-8') as f:
+            f.write(json_line(run))
+    return tulis
+
+
+def prometheus_sink(path):
+    """Sink yang menulis ulang file teks Prometheus (mis. untuk textfile collector node_exporter)"""
+    kunci = threading.Lock()
+
+    def tulis(profiler, run):
+        with kunci:
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(profiler.to_prometheus())
+            os.replace(tmp, path)
+    return tulis
+
+
+# Profiler proses yang dipakai dekorator di modul core dan oleh dashboard
+PROFILER = Profiler()
+span = PROFILER.span
+traced = PROFILER.traced
@@ -0,0 +1,199 @@
+"""
+Layanan harga real-time untuk beberapa emiten sekaligus.
+
+Semua emiten diambil dalam satu permintaan batch (atau paralel lewat thread
+pool untuk sumber yang hanya mendukung satu emiten per panggilan), lalu
+disimpan di cache TTL yang dipakai bersama oleh semua sesi. Data yang sudah
+kedaluwarsa tetap dikembalikan sambil diperbarui di background
+(stale-while-revalidate).
+
+Lapisan jaringan berupa callable `fetcher(tickers, period, start=None)` yang
+mengembalikan dict kode -> DataFrame OHLCV (start, jika diberikan, menggantikan
+period), sehingga bisa diganti stub lokal saat pengujian.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core.profiler import traced
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300           # detik, sama dengan cache lama (5 menit)
+DEFAULT_MAX_STALE = 3600    # setelah ini data lama tidak lagi ditampilkan
+
+
+def yahoo_fetcher(tickers, period='1d', interval='1d', start=None):
+    """
+    Mengambil OHLCV semua emiten dari Yahoo Finance dalam satu batch download
+    (interval '1m'/'5m' untuk bar intraday); jika start diberikan, bar sejak
+    tanggal tersebut yang diambil, bukan `period`
+
+    Returns:
+    dict kode emiten -> DataFrame (index tanggal, kolom Open/High/Low/Close/Volume)
+    """
+    import yfinance as yf
+
+    symbols = [f"{t}.JK" for t in tickers]  # Menambahkan .JK untuk saham Indonesia
+    rentang = {'start': pd.Timestamp(start).strftime('%Y-%m-%d')} if start is not None else {'period': period}
+    data = yf.download(symbols, interval=interval, group_by='ticker', auto_adjust=False,
+                       progress=False, threads=True, **rentang)
+    hasil = {}
+    for kode, symbol in zip(tickers, symbols):
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            df = data[symbol]
+        else:
+            df = data
+        hasil[kode] = df.dropna(how='all')
+    return hasil
+
+
+def concurrent_fetcher(fetch_one, max_workers=8):
+    """
+    Membungkus fungsi pengambil satu emiten `fetch_one(kode, period, start=None)`
+    menjadi fetcher batch yang berjalan paralel di thread pool
+    """
+    def fetch(tickers, period='1d', start=None):
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frames = pool.map(lambda kode: fetch_one(kode, period, start=start), tickers)
+            return {kode: df for kode, df in zip(tickers, frames) if df is not None}
+    return fetch
+
+
+def _ringkas(kode, hist_day, harga_awal_bulan):
+    """Menyusun dict kuotasi dengan format yang dipakai kartu metrik dashboard"""
+    if hist_day is None or hist_day.empty:
+        return {'sukses': False, 'pesan': 'Data tidak tersedia'}
+    if harga_awal_bulan is None or not harga_awal_bulan:
+        return {'sukses': False, 'pesan': f'Harga awal bulan untuk {kode} tidak tersedia'}
+
+    current_price = float(hist_day['Close'].iloc[-1])
+    monthly_change = ((current_price - harga_awal_bulan) / harga_awal_bulan) * 100
+    return {
+        'harga': current_price,
+        'perubahan': monthly_change,  # Perubahan dari awal bulan
+        'volume': int(hist_day['Volume'].iloc[-1]),
+        'tertinggi': float(hist_day['High'].iloc[-1]),
+        'terendah': float(hist_day['Low'].iloc[-1]),
+        'sukses': True
+    }
+
+
+class QuoteService:
+    """
+    Cache kuotasi real-time bersama dengan stale-while-revalidate
+
+    Parameters:
+    fetcher : callable(tickers, period, start=None) -> dict kode -> DataFrame OHLCV
+    month_start_price : callable(kode, tanggal_awal_bulan) -> harga atau None,
+        biasanya membaca histori di price store. Emiten yang tidak punya histori
+        bulan berjalan diambil dengan satu permintaan batch sejak tanggal 1
+        bulan ini, sehingga acuannya sama: Close hari perdagangan pertama bulan ini.
+    ttl : umur data (detik) sebelum dianggap kedaluwarsa
+    max_stale : umur maksimum data kedaluwarsa yang masih boleh ditampilkan
+    clock : sumber waktu (bisa diganti saat pengujian)
+    """
+
+    def __init__(self, fetcher=yahoo_fetcher, month_start_price=None, ttl=DEFAULT_TTL,
+                 max_stale=DEFAULT_MAX_STALE, clock=time.monotonic):
+        self.fetcher = fetcher
+        self.month_start_price = month_start_price
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self._cache = {}        # kode -> (waktu, kuotasi)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    @traced('load/quotes_fetch')
+    def _fetch(self, tickers):
+        """Mengambil kuotasi terbaru untuk sekumpulan emiten (satu batch)"""
+        try:
+            harian = self.fetcher(list(tickers), period='1d')
+        except Exception as e:
+            logger.warning("Gagal mengambil data real-time: %s", e)
+            return {kode: {'sukses': False, 'pesan': f"Gagal mengambil data untuk {kode}: {e}"}
+                    for kode in tickers}
+
+        awal_bulan = pd.Timestamp.now().normalize().replace(day=1)
+        referensi = {}
+        for kode in tickers:
+            if self.month_start_price is not None:
+                referensi[kode] = self.month_start_price(kode, awal_bulan)
+
+        # Fallback: hanya emiten tanpa histori bulan ini yang diminta lagi, sekaligus satu batch
+        kurang = [kode for kode in tickers if referensi.get(kode) is None and kode in harian]
+        if kurang:
+            try:
+                bulanan = self.fetcher(kurang, start=awal_bulan)
+                for kode, df in bulanan.items():
+                    df = df.dropna(subset=['Close'])
+                    if not df.empty:
+                        referensi[kode] = float(df['Close'].iloc[0])
+            except Exception as e:
+                logger.warning("Gagal mengambil harga awal bulan: %s", e)
+
+        return {kode: _ringkas(kode, harian.get(kode), referensi.get(kode)) for kode in tickers}
+
+    def _store(self, quotes):
+        now = self.clock()
+        with self._lock:
+            for kode, quote in quotes.items():
+                lama = self._cache.get(kode)
+                # Jangan timpa data valid dengan kegagalan sementara
+                if not quote['sukses'] and lama is not None and lama[1]['sukses']:
+                    continue
+                self._cache[kode] = (now, quote)
+
+    def _refresh_background(self, tickers):
+        with self._lock:
+            tickers = [kode for kode in tickers if kode not in self._refreshing]
+            self._refreshing.update(tickers)
+        if not tickers:
+            return
+
+        def run():
+            try:
+                self._store(self._fetch(tickers))
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(tickers)
+
+        threading.Thread(target=run, name='quote-refresh', daemon=True).start()
+
+    def get_quotes(self, tickers):
+        """
+        Mengambil kuotasi untuk beberapa emiten
+
+        Returns:
+        dict kode -> {'harga', 'perubahan', 'volume', 'tertinggi', 'terendah', 'sukses'}
+        atau {'sukses': False, 'pesan': ...}
+        """
+        now = self.clock()
+        hasil, basi, hilang = {}, [], []
+        with self._lock:
+            for kode in tickers:
+                entry = self._cache.get(kode)
+                if entry is None or now - entry[0] >= self.max_stale:
+                    hilang.append(kode)
+                    continue
+                hasil[kode] = entry[1]
+                if now - entry[0] >= self.ttl:
+                    basi.append(kode)
+
+        if hilang:
+            baru = self._fetch(hilang)
+            self._store(baru)
+            hasil.update(baru)
+        if basi:
+            self._refresh_background(basi)
+        return {kode: hasil[kode] for kode in tickers}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
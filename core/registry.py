@@ -0,0 +1,49 @@
+"""
+Daftar emiten yang dianalisis, dibaca dari file registry (default: emiten.csv).
+
+Setiap baris berisi kode emiten, nama perusahaan, path CSV harga harian dan
+path CSV dividen tahunan (boleh kosong jika emiten tidak punya data dividen).
+Path relatif dihitung dari folder file registry. Menambah emiten cukup
+dengan menambah satu baris; tampilan dan pipeline mengikuti urutan registry.
+"""
+import os
+from collections import namedtuple
+
+import pandas as pd
+
+DEFAULT_REGISTRY = 'emiten.csv'
+
+KOLOM = ['kode', 'nama', 'harga', 'dividen']
+
+Emiten = namedtuple('Emiten', KOLOM)
+
+
+def load_registry(path=DEFAULT_REGISTRY):
+    """
+    Membaca registry emiten
+
+    Returns:
+    dict kode -> Emiten (urutan sesuai file); path harga dan dividen sudah
+    digabung dengan folder registry, dividen bernilai None jika kosong
+    """
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    hilang = [kolom for kolom in KOLOM if kolom not in df.columns]
+    if hilang:
+        raise ValueError(f"Kolom registry tidak lengkap ({', '.join(hilang)}): {path}")
+
+    folder = os.path.dirname(path)
+    registry = {}
+    for row in df[KOLOM].itertuples(index=False):
+        kode = row.kode.strip().upper()
+        if not kode:
+            continue
+        if kode in registry:
+            raise ValueError(f"Kode emiten ganda di registry: {kode}")
+        dividen = row.dividen.strip()
+        registry[kode] = Emiten(
+            kode=kode,
+            nama=row.nama.strip() or kode,
+            harga=os.path.join(folder, row.harga.strip()),
+            dividen=os.path.join(folder, dividen) if dividen else None,
+        )
+    return registry
@@ -0,0 +1,291 @@
+"""
+Laporan batch headless: artefak tampilan perbandingan untuk semua emiten dan
+semua periode preset dalam satu kali jalan, tanpa Streamlit maupun browser.
+
+Artefak dihitung dengan fungsi Dataset yang sama dengan dashboard (jadi juga
+memakai dan mengisi ComputeCache yang sama). Deret yang tidak bergantung pada
+awal rentang (harga, moving average, volume, yield TTM, indeks total return,
+volatilitas bergulir) dihitung sekali atas histori penuh lalu dipotong
+bertingkat dari periode terpanjang ke terpendek: setiap periode dipotong dari
+potongan periode sebelumnya. Hanya artefak yang memang bergantung pada awal
+rentang (korelasi, drawdown, ringkasan) yang dihitung per periode.
+
+Keluaran per periode di <out>/<periode>/:
+- html    : satu halaman berisi semua grafik Plotly dan tabel (index.html)
+- parquet : satu file per tabel (butuh pyarrow atau fastparquet)
+- png     : satu file per grafik (butuh kaleido)
+
+Pembangunan grafik dan penulisan file berjalan paralel di process pool (atau
+thread pool). Format yang dependensinya tidak terpasang dilewati dengan peringatan.
+
+    python -m core.report --out laporan --format html parquet
+"""
+import html
+import importlib.util
+import logging
+import os
+import time
+
+import pandas as pd
+
+from core.dividends import rebase
+from core.downsample import lttb_long, sum_buckets, target_points
+from core.loader import MODE_PROCESS, MODES, executor
+from core.panel import FILL_FFILL
+from core.periode import PRESET, range_slice, rentang_periode
+from core.rollup import NAMA_LEVEL
+from core.statistik import ringkasan_emiten
+
+logger = logging.getLogger(__name__)
+
+FORMAT_HTML = 'html'
+FORMAT_PARQUET = 'parquet'
+FORMAT_PNG = 'png'
+FORMATS = (FORMAT_HTML, FORMAT_PARQUET, FORMAT_PNG)
+
+# Modul yang harus terpasang untuk setiap format (salah satu cukup)
+DEPENDENSI = {
+    FORMAT_HTML: ('plotly',),
+    FORMAT_PARQUET: ('pyarrow', 'fastparquet'),
+    FORMAT_PNG: ('kaleido',),
+}
+
+MA_PERIODS = (20, 50)               # pilihan awal dashboard
+WINDOW_KORELASI = 60
+WINDOW_VOLATILITAS = 60
+SEMUA = 'semua'                     # folder artefak yang tidak bergantung periode
+
+
+def formats_tersedia(formats):
+    """Format yang dependensinya terpasang; yang lain dilewati dengan peringatan"""
+    hasil = []
+    for fmt in formats:
+        if any(importlib.util.find_spec(modul) is not None for modul in DEPENDENSI[fmt]):
+            hasil.append(fmt)
+        else:
+            logger.warning("Format %s dilewati: butuh %s", fmt, ' atau '.join(DEPENDENSI[fmt]))
+    return hasil
+
+
+def urutkan_periode(periods, now=None):
+    """
+    Rentang (start, end) per periode, dari yang terpanjang ke terpendek
+
+    Jika now diberikan, semua rentang (termasuk 'max') berakhir pada tanggal
+    itu, sehingga laporan untuk tanggal lampau tidak memuat data sesudahnya
+    dan hasilnya sama walaupun dibuat ulang setelah data bertambah.
+    """
+    end = None if now is None else pd.Timestamp(now)
+    rentang = {period: (rentang_periode(period, now=now)[0], end) for period in periods}
+    return sorted(rentang.items(), key=lambda item: pd.Timestamp.min if item[1][0] is None else item[1][0])
+
+
+def potong_bertingkat(frame, rentang_urut):
+    """
+    Memotong frame (indeks tanggal terurut) untuk setiap rentang bersarang;
+    setiap potongan diambil dari potongan rentang sebelumnya (lihat urutkan_periode)
+
+    Returns:
+    dict periode -> potongan (view tanpa salinan)
+    """
+    hasil = {}
+    for period, (start, end) in rentang_urut:
+        frame = frame.iloc[range_slice(frame.index, start, end)]
+        hasil[period] = frame
+    return hasil
+
+
+def build_tables(ds, periods=PRESET, tickers=None, ma_periods=MA_PERIODS, window_korelasi=WINDOW_KORELASI,
+                 window_volatilitas=WINDOW_VOLATILITAS, now=None):
+    """
+    Menghitung semua tabel laporan
+
+    now : tanggal acuan; periode preset dihitung mundur darinya dan data
+        sesudahnya tidak dipakai (default: hari ini, tanpa batas akhir)
+
+    Returns:
+    dict periode -> dict nama tabel -> DataFrame, plus kunci SEMUA untuk
+    tabel dividen yang tidak bergantung periode
+    """
+    tickers = tuple(ds.tickers if tickers is None else tickers)
+    rentang_urut = urutkan_periode(periods, now)
+    panel = ds.panel(tickers)
+    harga = panel.with_fill(FILL_FFILL)
+
+    # Deret histori penuh, dihitung sekali lalu dipotong bertingkat per periode
+    ma = ds.indicators.compute(harga, [('sma', p) for p in ma_periods], tickers=tickers)
+    penuh = {
+        'harga': pd.concat([harga.field('Close', tickers),
+                            *[ma[f'SMA{p}'].add_suffix(f'_MA{p}') for p in ma_periods]], axis=1),
+        'volume': harga.field('Volume', tickers),
+        'yield_ttm': ds.ttm_yield(tickers),
+        'total_return': ds.total_return(tickers),
+        'volatilitas': ds.volatility(tickers, window_volatilitas),
+        'korelasi_bergulir': ds.correlation.rolling(panel, window_korelasi),
+    }
+    potongan = {nama: potong_bertingkat(frame, rentang_urut) for nama, frame in penuh.items()}
+
+    tabel = {}
+    view = panel
+    for period, rentang in rentang_urut:
+        view = view.slice(*rentang)
+        level, perubahan = ds.price_changes(tickers, *rentang, target_points(period))
+        tabel[period] = {
+            **{nama: per_periode[period] for nama, per_periode in potongan.items()},
+            'total_return': rebase(potongan['total_return'][period]),
+            f"perubahan_{NAMA_LEVEL[level].lower()}": perubahan,
+            'korelasi': ds.correlation.matrix(panel, *rentang),
+            'ringkasan': ringkasan_emiten(view, tickers),
+            'drawdown': ds.drawdown(tickers, *rentang),
+            'performa': ds.performance_summary(tickers, *rentang),
+        }
+    akhir = None if now is None else pd.Timestamp(now)
+    tabel[SEMUA] = {
+        'dividen_tahunan': ds.combined_dividends(tickers, end=akhir),
+        'statistik_dividen': ds.dividend_stats(tickers, end=akhir),
+    }
+    return tabel
+
+
+def _garis(px, df, n_titik, value_name, judul, var_name='Emiten'):
+    return px.line(lttb_long(df, n_titik, var_name=var_name, value_name=value_name),
+                   x='Tanggal', y=value_name, color=var_name, title=judul)
+
+
+def build_figures(tabel, period):
+    """Grafik Plotly untuk tabel satu periode (lihat build_tables), dengan judul seperti di dashboard"""
+    import plotly.express as px
+
+    if period == SEMUA:
+        return {
+            'dividen_tahunan': px.bar(tabel['dividen_tahunan'], x='Tahun', y='Jumlah Dividen', color='Emiten',
+                                      barmode='group', title="Perbandingan Total Dividen per Emiten"),
+            'dividend_yield': px.line(tabel['dividen_tahunan'], x='Tahun', y='Yield Percentage', color='Emiten',
+                                      title="Tren Dividend Yield"),
+        }
+    n_titik = target_points(period)
+    perubahan = next(nama for nama in tabel if nama.startswith('perubahan_'))
+    return {
+        'harga': _garis(px, tabel['harga'], n_titik, 'Harga', f"Perbandingan Harga Saham ({period})"),
+        'volume': px.area(sum_buckets(tabel['volume'], n_titik), title='Volume Transaksi',
+                          labels={'Date': 'Tanggal', 'value': 'Volume', 'variable': 'Emiten'}),
+        perubahan: _garis(px, tabel[perubahan], n_titik, 'Perubahan (%)',
+                          f"Persentase Perubahan Harga {perubahan.split('_', 1)[1].title()}"),
+        'korelasi': px.imshow(tabel['korelasi'], color_continuous_scale='RdBu', zmin=-1, zmax=1,
+                              labels=dict(x='Emiten', y='Emiten', color='Korelasi'),
+                              title="Matriks Korelasi Return Harian (log return)"),
+        'korelasi_bergulir': _garis(px, tabel['korelasi_bergulir'], n_titik, 'Korelasi', "Korelasi Bergulir",
+                                    var_name='Pasangan').update_yaxes(range=[-1, 1]),
+        'yield_ttm': _garis(px, tabel['yield_ttm'], n_titik, 'Yield TTM (%)', "Dividend Yield Trailing 12 Bulan"),
+        'total_return': _garis(px, tabel['total_return'], n_titik, 'Total Return',
+                               "Indeks Total Return (awal rentang = 100)"),
+        'drawdown': _garis(px, tabel['drawdown'], n_titik, 'Drawdown (%)', "Drawdown dari Puncak Sebelumnya"),
+        'volatilitas': _garis(px, tabel['volatilitas'], n_titik, 'Volatilitas (%)',
+                              "Volatilitas Bergulir (disetahunkan)"),
+    }
+
+
+def _halaman(judul, grafik, tabel):
+    """Halaman HTML mandiri: semua grafik (plotly.js dari CDN, sekali) lalu semua tabel"""
+    bagian = [fig.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False)
+              for i, fig in enumerate(grafik.values())]
+    for nama, df in tabel.items():
+        if df.index.nlevels == 1 and isinstance(df.index, pd.DatetimeIndex):
+            continue  # deret harian panjang hanya ditulis sebagai Parquet
+        bagian.append(f"<h2>{html.escape(nama)}</h2>" + df.to_html(float_format=lambda x: f"{x:,.2f}", na_rep=''))
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(judul)}</title></head>"
+            f"<body><h1>{html.escape(judul)}</h1>{''.join(bagian)}</body></html>")
+
+
+def _tulis_grafik(out, period, tabel, formats):
+    """Membangun grafik satu periode sekali lalu menulis halaman HTML dan/atau PNG-nya"""
+    folder = os.path.join(out, period)
+    grafik = build_figures(tabel, period)
+    hasil = []
+    if FORMAT_HTML in formats:
+        path = os.path.join(folder, 'index.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_halaman(f"Laporan {period}", grafik, tabel))
+        hasil.append(path)
+    if FORMAT_PNG in formats:
+        for nama, fig in grafik.items():
+            path = os.path.join(folder, f"{nama}.png")
+            fig.write_image(path)
+            hasil.append(path)
+    return hasil
+
+
+def _tulis_parquet(path, df):
+    df = df.copy()
+    df.columns = df.columns.map(str)
+    df.to_parquet(path)
+    return [path]
+
+
+def _tulis(tugas):
+    # Fungsi level modul agar bisa dikirim ke process pool
+    fungsi, *argumen = tugas
+    t0 = time.perf_counter()
+    paths = fungsi(*argumen)
+    return paths, time.perf_counter() - t0
+
+
+def write_report(tabel, out, formats=(FORMAT_HTML, FORMAT_PARQUET), max_workers=None, mode=MODE_PROCESS):
+    """
+    Menulis tabel (lihat build_tables) dan grafiknya ke folder `out` secara paralel
+
+    Satu tugas per periode membangun grafik (bagian terberat, Python murni,
+    sehingga process pool lebih cepat daripada thread pool di mesin multi-core)
+    dan menulis HTML/PNG-nya; setiap tabel Parquet ditulis sebagai tugas sendiri.
+
+    Returns:
+    dict path file -> detik tugas yang menulisnya
+    """
+    formats = formats_tersedia(formats)
+    grafik = [fmt for fmt in formats if fmt in (FORMAT_HTML, FORMAT_PNG)]
+    # tugas grafik (terlama) lebih dulu agar tidak tersisa di akhir
+    tugas_grafik, tugas_parquet = [], []
+    for period, per_periode in tabel.items():
+        folder = os.path.join(out, period)
+        os.makedirs(folder, exist_ok=True)
+        if grafik:
+            tugas_grafik.append((_tulis_grafik, out, period, per_periode, grafik))
+        if FORMAT_PARQUET in formats:
+            tugas_parquet += [(_tulis_parquet, os.path.join(folder, f"{nama}.parquet"), df)
+                              for nama, df in per_periode.items()]
+
+    if FORMAT_HTML in formats:
+        daftar = ''.join(f"<li><a href='{html.escape(period)}/index.html'>{html.escape(period)}</a></li>"
+                         for period in tabel)
+        with open(os.path.join(out, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Laporan</title></head>"
+                    f"<body><h1>Laporan Perbandingan Emiten</h1><ul>{daftar}</ul></body></html>")
+
+    with executor(mode, max_workers) as pool:
+        return {path: detik for paths, detik in pool.map(_tulis, tugas_grafik + tugas_parquet) for path in paths}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core.dataset import Dataset
+    from core.registry import DEFAULT_REGISTRY
+
+    parser = argparse.ArgumentParser(description='Laporan statis semua emiten untuk semua periode preset')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY)
+    parser.add_argument('--out', default='laporan', help='folder keluaran')
+    parser.add_argument('--periode', nargs='*', default=list(PRESET), choices=PRESET)
+    parser.add_argument('--format', nargs='*', default=[FORMAT_HTML, FORMAT_PARQUET], choices=FORMATS)
+    parser.add_argument('--ma', type=int, nargs='*', default=list(MA_PERIODS), help='periode moving average')
+    parser.add_argument('--workers', type=int, help='jumlah worker penulisan (default: jumlah CPU)')
+    parser.add_argument('--mode', choices=MODES, default=MODE_PROCESS)
+    parser.add_argument('--tanggal', help='tanggal acuan dan batas akhir data, YYYY-MM-DD (default: hari ini)')
+    args = parser.parse_args()
+
+    ds = Dataset(args.registry)
+    t0 = time.perf_counter()
+    tabel = build_tables(ds, args.periode, ma_periods=args.ma, now=args.tanggal)
+    t1 = time.perf_counter()
+    files = write_report(tabel, args.out, args.format, args.workers, args.mode)
+    t2 = time.perf_counter()
+    print(f"hitung {t1 - t0:.2f} s, tulis {len(files)} file {t2 - t1:.2f} s -> {args.out}")
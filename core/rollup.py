@@ -0,0 +1,116 @@
+"""
+Piramida OHLCV multi-resolusi (harian, mingguan, bulanan, tahunan).
+
+Bar mingguan/bulanan/tahunan dibangun sekali per versi data dengan semantik
+OHLCV yang benar: Open pertama, High maksimum, Low minimum, Close terakhir,
+Volume dijumlah. Level tahunan juga menyimpan rata-rata Close per tahun
+(pengganti kolom 'Rata-rata Close' di dataset_dividen/).
+"""
+import pandas as pd
+
+# Level piramida: kode periode -> alias resample pandas (None = harian)
+LEVELS = {'D': None, 'W': 'W', 'M': 'ME', 'Y': 'YE'}
+
+# Perkiraan jumlah hari perdagangan per bar, untuk memilih level
+HARI_PER_BAR = {'D': 1, 'W': 5, 'M': 21, 'Y': 250}
+
+NAMA_LEVEL = {'D': 'Harian', 'W': 'Mingguan', 'M': 'Bulanan', 'Y': 'Tahunan'}
+
+AGREGASI = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def rollup(df, level):
+    """
+    Membangun bar OHLCV untuk satu level
+
+    Parameters:
+    df : DataFrame harian dengan kolom 'Date' dan OHLCV
+    level : salah satu dari ['D', 'W', 'M', 'Y']
+
+    Returns:
+    DataFrame dengan kolom 'Date' (akhir periode) dan OHLCV; level 'Y' juga
+    berisi 'Rata-rata Close'
+    """
+    harian = df[['Date', *AGREGASI]].set_index('Date')
+    if level == 'D':
+        return harian.reset_index()
+    grouped = harian.resample(LEVELS[level])
+    bars = grouped.agg(AGREGASI)
+    if level == 'Y':
+        bars['Rata-rata Close'] = grouped['Close'].mean()
+    # Periode tanpa transaksi (misalnya minggu libur) tidak menjadi bar
+    return bars.dropna(subset=['Close']).reset_index()
+
+
+class Pyramid:
+    """Kumpulan bar OHLCV per level untuk satu emiten dan satu versi data"""
+
+    def __init__(self, levels, version=''):
+        self.levels = levels
+        self.version = version
+
+    def __getitem__(self, level):
+        return self.levels[level]
+
+    def slice(self, level, start=None, end=None):
+        """
+        Bar pada level tertentu yang mencakup rentang [start, end], memakai binary search
+
+        Label bar mingguan/bulanan/tahunan adalah akhir periode, jadi bar yang
+        memuat tanggal `end` ikut disertakan.
+        """
+        df = self.levels[level]
+        dates = df['Date']
+        lo = 0 if start is None else dates.searchsorted(pd.Timestamp(start), side='left')
+        if end is None:
+            hi = len(df)
+        elif level == 'D':
+            hi = dates.searchsorted(pd.Timestamp(end), side='right')
+        else:
+            hi = min(dates.searchsorted(pd.Timestamp(end), side='left') + 1, len(df))
+        return df.iloc[lo:hi]
+
+
+def build_pyramid(df, version=''):
+    """Membangun semua level piramida dari data harian"""
+    return Pyramid({level: rollup(df, level) for level in LEVELS}, version)
+
+
+def choose_level(n_hari, max_points):
+    """
+    Memilih level paling rinci yang jumlah barnya masih muat dalam max_points
+    (artinya level paling kasar yang diperlukan untuk rentang tersebut)
+
+    Parameters:
+    n_hari : jumlah bar harian dalam rentang
+    max_points : jumlah titik maksimum (0 = tanpa batas, selalu harian)
+    """
+    if not max_points:
+        return 'D'
+    for level in ('D', 'W', 'M'):
+        if n_hari / HARI_PER_BAR[level] <= max_points:
+            return level
+    return 'Y'
+
+
+def hitung_perubahan_harga(df, periode='D', pyramid=None):
+    """
+    Menghitung persentase perubahan harga berdasarkan periode yang dipilih
+
+    Parameters:
+    df : DataFrame dengan kolom 'Close' dan 'Date' (sudah terurut)
+    periode : string, salah satu dari ['D', 'W', 'M', 'Y'] untuk harian, mingguan, bulanan, tahunan
+    pyramid : Pyramid emiten (opsional); jika ada, bar periode dibaca dari piramida
+        yang sudah dihitung sehingga tidak perlu resample ulang
+
+    Returns:
+    Series dengan persentase perubahan harga (index tanggal)
+    """
+    if df.empty:
+        return pd.Series(dtype=float)
+
+    if pyramid is not None:
+        bars = pyramid.slice(periode, df['Date'].iloc[0], df['Date'].iloc[-1])
+    else:
+        bars = rollup(df, periode)
+    return bars.set_index('Date')['Close'].pct_change() * 100
@@ -0,0 +1,38 @@
+"""
+Ringkasan statistik harga dan volume untuk kartu metrik dan grafik ringkasan.
+"""
+import pandas as pd
+
+OHLCV = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def ringkasan_harga(df):
+    """Metrik utama satu emiten: harga terakhir, volume rata-rata, harga tertinggi dan terendah"""
+    return {
+        'Harga Terakhir': df['Close'].iloc[-1],
+        'Volume Rata-rata': df['Volume'].mean(),
+        'Harga Tertinggi': df['High'].max(),
+        'Harga Terendah': df['Low'].min()
+    }
+
+
+def ringkasan_emiten(panel, tickers=None):
+    """
+    Harga tertinggi, harga terendah dan volume rata-rata per emiten
+
+    Parameters:
+    panel : Panel (sudah dipotong ke rentang yang dipilih)
+
+    Returns:
+    DataFrame dengan index 'Emiten'
+    """
+    return pd.DataFrame({
+        'Harga Tertinggi': panel.field('High', tickers).max(),
+        'Harga Terendah': panel.field('Low', tickers).min(),
+        'Volume Rata-rata': panel.field('Volume', tickers).mean(),
+    }).rename_axis('Emiten')
+
+
+def korelasi_ohlcv(df):
+    """Matriks korelasi antar kolom OHLCV satu emiten"""
+    return df[OHLCV].corr()
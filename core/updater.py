@@ -0,0 +1,132 @@
+"""
+Updater histori inkremental.
+
+Untuk setiap emiten, updater membaca tanggal bar terakhir di price store,
+mengambil hanya bar setelah tanggal tersebut dari sumber data, lalu
+menambahkannya ke store secara atomik (lihat PriceStore.append). Biaya
+pembaruan sebanding dengan jumlah bar baru, bukan panjang histori.
+
+Sumber data berupa callable `fetch(kode, start)` -> DataFrame dengan kolom
+'Date' dan OHLCV, sehingga bisa diganti sumber palsu untuk pengujian offline.
+"""
+import logging
+import threading
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 6 * 60 * 60  # detik; data harian cukup diperbarui beberapa kali sehari
+ZONA_WAKTU = 'Asia/Jakarta'
+JAM_TUTUP = pd.Timedelta(hours=16, minutes=15)  # setelah closing auction BEI
+
+
+def bar_selesai(bars, now=None):
+    """
+    Membuang bar sesi yang sedang berjalan (tanggal hari ini sebelum bursa
+    tutup), karena bar yang sudah tersimpan tidak pernah direvisi
+
+    now : waktu Jakarta tanpa zona waktu (default: sekarang)
+    """
+    if now is None:
+        now = pd.Timestamp.now(tz=ZONA_WAKTU).tz_localize(None)
+    if now - now.normalize() >= JAM_TUTUP:
+        return bars
+    return bars[bars['Date'] < now.normalize()]
+
+
+def yahoo_history_source(kode, start):
+    """Mengambil bar harian yang sudah selesai sejak tanggal `start` dari Yahoo Finance"""
+    import yfinance as yf
+
+    hist = yf.Ticker(f"{kode}.JK").history(start=start.strftime('%Y-%m-%d'), auto_adjust=False)
+    if hist.empty:
+        return pd.DataFrame(columns=['Date', 'Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume'])
+    hist = hist.reset_index()
+    # Bar harian Yahoo bertanggal tengah malam waktu Jakarta; tanggal bursa diambil di zona itu
+    hist['Date'] = pd.to_datetime(hist['Date'], utc=True).dt.tz_convert(ZONA_WAKTU).dt.tz_localize(None).dt.normalize()
+    return bar_selesai(hist)
+
+
+def csv_history_source(paths):
+    """
+    Sumber data dari file CSV lokal (misalnya hasil unduhan manual atau data
+    palsu untuk pengujian offline)
+
+    Parameters:
+    paths : dict kode emiten -> path CSV dengan kolom 'Date' dan OHLCV
+    """
+    def fetch(kode, start):
+        df = pd.read_csv(paths[kode])
+        df['Date'] = pd.to_datetime(df['Date'], utc=True).dt.tz_localize(None)
+        return df[df['Date'] >= start]
+    return fetch
+
+
+class HistoryUpdater:
+    """
+    Menambahkan bar baru ke price store untuk sekumpulan emiten
+
+    Parameters:
+    store : PriceStore
+    sources : dict kode emiten -> path CSV sumber di store
+    fetch : callable(kode, start) -> DataFrame bar sejak `start`
+    on_update : callback opsional dipanggil dengan dict kode -> jumlah bar baru
+        setelah ada pembaruan (misalnya untuk menghangatkan cache)
+    """
+
+    def __init__(self, store, sources, fetch=yahoo_history_source, on_update=None):
+        self.store = store
+        self.sources = dict(sources)
+        self.fetch = fetch
+        self.on_update = on_update
+        self._thread = None
+        self._stop = threading.Event()
+
+    def update(self, kode):
+        """Mengambil dan menambahkan bar yang belum tersimpan untuk satu emiten"""
+        source = self.sources[kode]
+        last = self.store.last_date(source)
+        start = (last + pd.Timedelta(days=1)) if last is not None else pd.Timestamp('1990-01-01')
+        if start.normalize() > pd.Timestamp.now().normalize():
+            return 0
+        bars = self.fetch(kode, start)
+        if bars is None or len(bars) == 0:
+            return 0
+        return self.store.append(source, bars)
+
+    def update_all(self):
+        """
+        Memperbarui semua emiten; kegagalan satu emiten tidak menghentikan yang lain
+
+        Returns:
+        dict kode -> jumlah bar baru
+        """
+        hasil = {}
+        for kode in self.sources:
+            try:
+                hasil[kode] = self.update(kode)
+            except Exception as e:
+                logger.warning("Gagal memperbarui histori %s: %s", kode, e)
+                hasil[kode] = 0
+        if self.on_update is not None and any(hasil.values()):
+            self.on_update(hasil)
+        return hasil
+
+    def start(self, interval=DEFAULT_INTERVAL):
+        """Menjalankan update_all secara berkala di thread background (sekali per proses)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        def run():
+            while not self._stop.is_set():
+                self.update_all()
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='history-updater', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
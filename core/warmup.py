@@ -0,0 +1,167 @@
+"""
+Worker precompute yang menghangatkan cache komputasi setelah data diperbarui.
+
+Setelah restart atau pembaruan histori, pengguna pertama tidak perlu lagi
+menanggung parsing CSV, moving average, korelasi dan agregasi dividen:
+worker menghitung artefak standar untuk setiap emiten dan setiap periode
+preset lebih dulu, dengan kunci cache yang sama dengan yang dipakai
+dashboard, sehingga permintaan interaktif hanya membaca hasil.
+
+Dijalankan sebagai thread background (CacheWarmer.start) yang dipicu oleh
+HistoryUpdater(on_update=warmer.trigger), atau headless:
+
+    python -m core.warmup
+"""
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from core.panel import FILL_FFILL
+from core.periode import PRESET, rentang_periode
+
+logger = logging.getLogger(__name__)
+
+# Pilihan yang tersedia di panel kontrol dan tab korelasi
+MA_PERIODS = (5, 20, 50, 200)
+JENDELA_KORELASI = (20, 60, 120, 250)
+METODE_KORELASI = ('rolling', 'ewm')
+JENDELA_VOLATILITAS = (20, 60, 120, 250)
+BACKTEST_TAMPILAN = (('hold',), ('ma', 5, 20))   # acuan dan pilihan awal tab backtest
+
+DEFAULT_INTERVAL = 60 * 60  # detik; menghangatkan ulang rentang preset yang bergeser tiap hari
+
+
+def warm(ds, periods=PRESET, ma_periods=MA_PERIODS, windows=JENDELA_KORELASI, methods=METODE_KORELASI, now=None):
+    """
+    Menghitung artefak standar semua emiten ke cache Dataset
+
+    Parameters:
+    ds : Dataset
+    periods : periode preset yang dihangatkan (lihat core.periode.PRESET)
+    ma_periods : periode moving average
+    windows, methods : window dan metode korelasi bergulir
+    now : tanggal acuan periode preset (default: hari ini)
+
+    Returns:
+    dict jenis artefak -> detik
+    """
+    laporan = {}
+
+    def langkah(nama, fungsi):
+        t0 = time.perf_counter()
+        hasil = fungsi()
+        laporan[nama] = laporan.get(nama, 0.0) + time.perf_counter() - t0
+        return hasil
+
+    specs = [('sma', p) for p in ma_periods]
+    panel = langkah('panel', ds.panel)
+    langkah('indikator', lambda: ds.indicators.compute(panel.with_fill(FILL_FFILL), specs))
+    langkah('korelasi', lambda: ds.correlation.returns(panel))
+
+    for kode in ds.tickers:
+        langkah('piramida', lambda: ds.pyramid(kode))
+        langkah('indikator', lambda: ds.indicators.compute(ds.ticker_panel(kode), specs))
+    for kode in ds.dividend_tickers():
+        langkah('dividen', lambda: ds.dividends(kode))
+    langkah('dividen', ds.dividend_stats)
+    langkah('dividen', ds.total_return)
+
+    for period in periods:
+        rentang = rentang_periode(period, now=now)
+        langkah('korelasi', lambda: ds.correlation.matrix(panel, *rentang))
+        for kode in ds.tickers:
+            langkah('korelasi_ohlcv', lambda: ds.ohlcv_correlation(kode, *rentang))
+        langkah('performa', lambda: ds.performance_summary(None, *rentang))
+        langkah('performa', lambda: ds.drawdown(None, *rentang))
+        for kode in ds.tickers:
+            langkah('backtest', lambda: ds.backtest_sweep([kode], start=rentang[0], end=rentang[1]))
+            for spec in BACKTEST_TAMPILAN:
+                langkah('backtest', lambda: ds.backtest(kode, spec, *rentang))
+
+    for window in windows:
+        for method in methods:
+            langkah('korelasi_bergulir', lambda: ds.correlation.rolling(panel, window, method=method))
+    for window in JENDELA_VOLATILITAS:
+        langkah('performa', lambda: ds.volatility(None, window))
+    return laporan
+
+
+class CacheWarmer:
+    """
+    Thread background yang menjalankan warm() setiap kali dipicu
+
+    Pemicu yang datang saat warm() masih berjalan digabung menjadi satu
+    putaran berikutnya. Tanpa pemicu, cache tetap dihangatkan ulang setiap
+    `interval` detik agar rentang periode preset yang bergeser ikut terisi.
+    """
+
+    def __init__(self, ds, interval=DEFAULT_INTERVAL, **opsi):
+        self.ds = ds
+        self.interval = interval
+        self.opsi = opsi
+        self.last_report = None   # {'mulai', 'detik', 'artefak', 'pesan'}
+        self._event = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self):
+        """Menghangatkan cache sekali (sinkron) dan mencatat laporannya"""
+        mulai = pd.Timestamp.now()
+        t0 = time.perf_counter()
+        try:
+            artefak = warm(self.ds, **self.opsi)
+            pesan = None
+        except Exception as e:
+            logger.warning("Gagal menghangatkan cache: %s", e)
+            artefak, pesan = {}, str(e)
+        self.last_report = {'mulai': mulai, 'detik': time.perf_counter() - t0, 'artefak': artefak, 'pesan': pesan}
+        return self.last_report
+
+    def trigger(self, *_):
+        """Meminta putaran baru; bisa dipakai langsung sebagai on_update HistoryUpdater"""
+        self._event.set()
+
+    def start(self):
+        """Menjalankan worker di thread background (sekali per proses) dan langsung memicu satu putaran"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        def loop():
+            while not self._stop.is_set():
+                self._event.wait(self.interval)
+                if self._stop.is_set():
+                    break
+                self._event.clear()
+                self.run()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name='cache-warmer', daemon=True)
+        self._thread.start()
+        self.trigger()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        self._event.set()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from core.dataset import Dataset
+    from core.registry import DEFAULT_REGISTRY
+
+    parser = argparse.ArgumentParser(description='Menghangatkan cache komputasi untuk semua emiten di registry')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY)
+    parser.add_argument('--ma', type=int, nargs='*', default=list(MA_PERIODS), help='periode moving average')
+    args = parser.parse_args()
+
+    ds = Dataset(args.registry)
+    t0 = time.perf_counter()
+    laporan = warm(ds, ma_periods=args.ma)
+    for nama, detik in laporan.items():
+        print(f"{nama:<18} {detik * 1000:10.1f} ms")
+    stats = ds.cache.stats()
+    print(f"total {time.perf_counter() - t0:.3f} s, {stats['entri']} entri, {stats['memori_mb']:.1f} MB")
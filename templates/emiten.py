@@ -0,0 +1,20 @@
+import streamlit as st
+
+from core.dataset import Dataset
+from core.registry import DEFAULT_REGISTRY
+
+# halaman dividen satu emiten, sama untuk semua emiten di registry (emiten.csv);
+# yield dan rata-rata harga dihitung dari histori harga, bukan dibaca dari CSV
+def show(kode, ds=None):
+    ds = ds if ds is not None else Dataset(DEFAULT_REGISTRY)
+    df = ds.dividends(kode)
+    st.title(f"**Analisa Emiten {kode}**")
+    # total dividen
+    st.subheader(f"**Total dividen {kode} (Rp)**")
+    st.bar_chart(df.set_index('Tahun')['Jumlah Dividen'].rename('total_dividen'))
+    # return yield
+    st.subheader(f"**Persentase Dividen Yield pertahun {kode} (%)**")
+    st.bar_chart(df.set_index('Tahun')['Yield Percentage'].rename('total_dividen'))
+
+    st.subheader("**Harga rata rata saham pertahunnya (Close)**")
+    st.bar_chart(df.set_index('Tahun')['Rata-rata Close'].rename('total_dividen'))
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.backtest import FEE_BELI, dividend_array, positions, run_backtest, statistik
+
+
+def harga_tetap(n, harga=100.0):
+    dates = pd.bdate_range('2024-01-01', periods=n)
+    return dates, np.full(n, harga), np.full(n, harga)
+
+
+def test_buy_and_hold_biaya_dan_lot():
+    dates, open_, close = harga_tetap(5)
+    hasil = run_backtest(dates, open_, close, np.zeros(5), ('hold',), modal=100_000)
+
+    # floor(100.000 / (100 * 100 * 1,0015)) = 9 lot
+    transaksi = hasil['transaksi']
+    assert transaksi['Lembar'].tolist() == [900]
+    assert transaksi['Jual'].isna().all()    # posisi terbuka dinilai dengan Close terakhir tanpa biaya jual
+    ekuitas_awal = 100_000 - 900 * 100 * (1 + FEE_BELI) + 900 * 100
+    np.testing.assert_allclose(hasil['ekuitas'], ekuitas_awal)
+
+    stat = hasil['statistik']
+    assert stat['Total Return (%)'] == pytest.approx((ekuitas_awal / 100_000 - 1) * 100)
+    assert stat['Biaya (Rp)'] == pytest.approx(900 * 100 * FEE_BELI)
+    assert stat['Exposure (%)'] == 100
+    assert stat['Transaksi'] == 1
+
+
+def test_statistik_cagr_drawdown_win_rate():
+    dates = pd.to_datetime(['2020-01-01', '2021-01-01', '2022-01-01'])
+    ekuitas = np.array([100.0, 50.0, 121.0])
+    transaksi = pd.DataFrame({'Lembar': [1, 1], 'Harga Beli': [10.0, 10.0], 'Harga Jual': [12.0, 8.0],
+                              'Jual': dates[1:], 'Dividen': [0.0, 1.0], 'Laba/Rugi': [2.0, -2.0]})
+    stat = statistik(dates, ekuitas, transaksi, np.array([True, True, False]), modal=100, fee_beli=0.0, fee_jual=0.0)
+
+    assert stat['Total Return (%)'] == pytest.approx(21)
+    assert stat['CAGR (%)'] == pytest.approx((1.21 ** (365.25 / 731) - 1) * 100)
+    assert stat['Max Drawdown (%)'] == pytest.approx(-50)
+    assert stat['Win Rate (%)'] == 50
+    assert stat['Dividen (Rp)'] == 1
+    assert stat['Exposure (%)'] == pytest.approx(200 / 3)
+
+
+def test_sinyal_ma_dieksekusi_hari_berikutnya():
+    close = np.r_[np.full(10, 100.0), np.full(10, 200.0)]
+    held = positions(('ma', 2, 5), close, np.zeros(20))
+    # SMA2 > SMA5 mulai Close hari ke-10; dibeli pada Open hari ke-11
+    assert not held[:11].any()
+    assert held[11]
+
+
+def test_dividend_array_hanya_event_ex_date_dalam_histori():
+    dates = pd.bdate_range('2024-01-01', periods=10)     # 1-12 Januari, Sabtu 6 dan Minggu 7 libur
+    events = pd.DataFrame({
+        'Date': pd.to_datetime(['2023-12-15', '2024-01-06', '2024-01-10', '2024-01-11', '2024-03-01']),
+        'Dividen': [50.0, 10.0, 20.0, 99.0, 30.0],
+        'Ex-date': [True, True, True, False, True],
+    })
+    div = dividend_array(dates, events)
+    # Ex-date Sabtu jatuh ke Senin; event sebelum/sesudah histori dan total tahunan diabaikan
+    assert div[dates.get_loc('2024-01-08')] == 10
+    assert div[dates.get_loc('2024-01-10')] == 20
+    assert div.sum() == 30
+
+
+def test_dividen_diterima_jika_dipegang_sehari_sebelum_ex_date():
+    dates, open_, close = harga_tetap(10)
+    div = np.zeros(10)
+    div[5] = 2.0
+    hasil = run_backtest(dates, open_, close, div, ('dividen', 1, 0), modal=100_000, fee_beli=0.0, fee_jual=0.0)
+
+    transaksi = hasil['transaksi']
+    assert transaksi['Beli'].tolist() == [dates[4]]
+    assert transaksi['Jual'].tolist() == [dates[5]]
+    assert transaksi['Dividen'].tolist() == [1000 * 2.0]
+    assert hasil['statistik']['Total Return (%)'] == pytest.approx(2.0)
@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+
+from core.cache import ComputeCache
+
+
+def array_kb(n):
+    return np.zeros(n * 1024, dtype=np.uint8)
+
+
+def test_eviction_lru_menjaga_batas_memori():
+    cache = ComputeCache(max_bytes=3 * 1024)
+    for key in 'abc':
+        cache.put(key, array_kb(1))
+    cache.get('a')                      # 'a' baru dipakai, 'b' paling lama
+    cache.put('d', array_kb(1))
+
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert cache.evictions == 1
+    assert cache._bytes <= cache.max_bytes
+    assert cache.stats()['memori_mb'] * 1024 * 1024 == 3 * 1024
+
+
+def test_nilai_lebih_besar_dari_batas_tidak_disimpan():
+    cache = ComputeCache(max_bytes=1024)
+    cache.put('kecil', array_kb(1))
+    nilai = array_kb(2)
+    assert cache.put('besar', nilai) is nilai
+    assert 'besar' not in cache and 'kecil' in cache
+
+
+def test_ganti_nilai_tidak_menghitung_ukuran_dua_kali():
+    cache = ComputeCache(max_bytes=2 * 1024)
+    cache.put('a', array_kb(1))
+    cache.put('a', array_kb(1))
+    cache.put('b', array_kb(1))
+    assert cache.evictions == 0 and len(cache) == 2
+
+
+def test_get_or_compute_sekali_untuk_permintaan_bersamaan():
+    cache = ComputeCache()
+    mulai = threading.Barrier(4)
+    dihitung = []
+
+    def compute():
+        dihitung.append(1)
+        return 42
+
+    def minta(hasil):
+        mulai.wait()
+        hasil.append(cache.get_or_compute(('fungsi', 1), compute))
+
+    hasil = []
+    threads = [threading.Thread(target=minta, args=(hasil,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert hasil == [42] * 4
+    assert len(dihitung) == 1
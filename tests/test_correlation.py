@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.correlation import CorrelationEngine, correlation_matrix, ewm_correlation, log_returns, rolling_correlation
+from core.panel import build_panel
+
+
+@pytest.fixture
+def returns():
+    """Return tiga emiten yang saling berkorelasi, dengan hari libur acak per emiten"""
+    rng = np.random.default_rng(1)
+    dasar = rng.normal(0, 0.02, (600, 1))
+    x = dasar + rng.normal(0, 0.02, (600, 3))
+    x[rng.random((600, 3)) < 0.05] = np.nan
+    return pd.DataFrame(x, index=pd.bdate_range('2020-01-01', periods=600), columns=['A', 'B', 'C'])
+
+
+def test_matriks_sama_dengan_pandas(returns):
+    pd.testing.assert_frame_equal(correlation_matrix(returns), returns.corr(), atol=1e-12)
+
+
+@pytest.mark.parametrize('min_periods', [None, 60])
+def test_bergulir_sama_dengan_pandas(returns, min_periods):
+    hasil = rolling_correlation(returns, 60, min_periods)
+    harapan = returns['A'].rolling(60, min_periods=min_periods or 30).corr(returns['C'])
+    np.testing.assert_allclose(hasil['A-C'], harapan, atol=1e-9, equal_nan=True)
+
+
+def test_bergulir_default_tidak_dikosongkan_hari_libur(returns):
+    hasil = rolling_correlation(returns, 60)['A-B']
+    assert hasil.iloc[60:].notna().all()
+
+
+def test_ewm_sama_dengan_pandas_tanpa_data_kosong(returns):
+    lengkap = returns.fillna(0.0)
+    hasil = ewm_correlation(lengkap, 20)['A-B']
+    harapan = lengkap['A'].ewm(span=20).corr(lengkap['B'])
+    np.testing.assert_allclose(hasil.iloc[20:], harapan.iloc[20:], atol=1e-9)
+    assert hasil.iloc[:19].isna().all()
+
+
+def test_ewm_melewati_hari_libur(returns):
+    hasil = ewm_correlation(returns, 20)['A-B']
+    bersama = returns[['A', 'B']].dropna()
+    harapan = bersama['A'].ewm(span=20).corr(bersama['B'])
+    np.testing.assert_allclose(hasil.reindex(bersama.index).iloc[20:], harapan.iloc[20:], atol=1e-9)
+
+
+@pytest.mark.parametrize('urutan', ['penuh-dulu', 'potongan-dulu'])
+def test_engine_membedakan_panel_potongan(ohlcv_sintetis, urutan):
+    panel = build_panel({'A': ohlcv_sintetis(300), 'B': ohlcv_sintetis(300, seed=1)})
+    potongan = panel.slice(panel.index[150])
+    engine = CorrelationEngine()
+    for p in ([panel, potongan] if urutan == 'penuh-dulu' else [potongan, panel]):
+        pd.testing.assert_frame_equal(engine.matrix(p), correlation_matrix(log_returns(p)))
+        bergulir = engine.rolling(p, 20)
+        assert bergulir.index.equals(p.index)
+        pd.testing.assert_frame_equal(bergulir, rolling_correlation(log_returns(p), 20))
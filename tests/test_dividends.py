@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.dividends import DividendEngine, event_matrix, read_dividend_events, total_return, ttm_yield, yearly_dividends
+from core.panel import build_panel
+
+
+@pytest.fixture
+def panel():
+    """Dua emiten, Close tetap 100 di hari kerja 2023-2024"""
+    dates = pd.bdate_range('2023-01-02', '2024-12-31')
+    frame = pd.DataFrame({'Date': dates, 'Open': 100.0, 'High': 100.0, 'Low': 100.0, 'Close': 100.0, 'Volume': 1.0})
+    return build_panel({'EVT': frame, 'THN': frame})
+
+
+@pytest.fixture
+def events(tmp_path):
+    (tmp_path / 'evt.csv').write_text('Tanggal,Dividen\n2023-06-10,5\n2024-06-10,8\n2025-06-10,9\n')
+    (tmp_path / 'thn.csv').write_text('Tahun,Jumlah Dividen,Yield Percentage\n2023,5,5\n2024,8,8\n')
+    return {'EVT': read_dividend_events(tmp_path / 'evt.csv'), 'THN': read_dividend_events(tmp_path / 'thn.csv')}
+
+
+def test_format_event_dan_tahunan(events):
+    assert events['EVT']['Ex-date'].all()
+    assert not events['THN']['Ex-date'].any()
+    assert events['THN']['Date'].tolist() == [pd.Timestamp('2023-12-31'), pd.Timestamp('2024-12-31')]
+
+
+def test_event_pada_hari_perdagangan_pertama_setelah_ex_date(panel, events):
+    div = pd.DataFrame(event_matrix(panel, events), index=panel.index, columns=panel.tickers)
+    # 10 Juni 2023 hari Sabtu: jatuh ke Senin 12 Juni; event 2025 di luar histori diabaikan
+    assert div.loc['2023-06-12', 'EVT'] == 5
+    assert div.loc['2024-06-10', 'EVT'] == 8
+    assert div['EVT'].sum() == 13
+    # 31 Desember 2023 hari Minggu: total tahunan jatuh ke 2 Januari 2024
+    assert div.loc['2024-01-01', 'THN'] == 5
+
+
+def test_ttm_yield_hanya_dari_event_ex_date(panel, events):
+    ttm = ttm_yield(panel, events)
+    assert ttm['THN'].isna().all()
+    assert ttm.loc['2023-06-09', 'EVT'] == 0
+    assert ttm.loc['2023-06-12', 'EVT'] == pytest.approx(5)
+    assert ttm.loc['2024-06-07', 'EVT'] == pytest.approx(5)
+    assert ttm.loc['2024-06-12', 'EVT'] == pytest.approx(8)
+
+
+def test_total_return_mengabaikan_total_tahunan(panel, events):
+    tr = total_return(panel, events)
+    np.testing.assert_allclose(tr['THN'], 1.0)
+    assert tr.loc['2023-06-09', 'EVT'] == 1.0
+    assert tr['EVT'].iloc[-1] == pytest.approx(1.05 * 1.08)
+
+
+def test_dividen_tahunan_tetap_memakai_kedua_format(panel, events):
+    tahunan = yearly_dividends(panel, events).set_index(['Emiten', 'Tahun'])
+    assert tahunan.loc[('THN', 2024), 'Jumlah Dividen'] == 8
+    assert tahunan.loc[('EVT', 2024), 'Yield Percentage'] == pytest.approx(8)
+    assert tahunan.loc[('EVT', 2024), 'Pertumbuhan Dividen'] == pytest.approx(60)
+
+
+def test_engine_membedakan_panel_potongan(panel, events):
+    engine = DividendEngine()
+    penuh = engine.total_return(panel, events, 'v1')
+    potongan = engine.total_return(panel.slice('2024-01-01'), events, 'v1')
+    assert potongan.index.equals(panel.slice('2024-01-01').index)
+    assert (potongan.iloc[0] == 1.0).all()
+    assert penuh['EVT'].iloc[-1] == pytest.approx(1.05 * 1.08)
@@ -0,0 +1,101 @@
+import json
+import os
+
+import plotly.graph_objects as go
+import plotly.graph_objs
+import plotly.io
+import plotly.tools
+import pytest
+
+from core.figure_cache import CachedFigure, FigureCache
+
+
+def figure(n=50, judul='uji'):
+    return go.Figure(go.Scatter(x=list(range(n)), y=[i * i for i in range(n)]), layout={'title': judul})
+
+
+def test_cached_figure_tidak_divalidasi_ulang(monkeypatch):
+    """Jalur yang dipakai st.plotly_chart: BaseFigure cukup to_dict(), tanpa Figure(**spec)"""
+    spec = json.loads(figure().to_json())
+    monkeypatch.setattr(plotly.graph_objs, 'Figure', lambda *a, **k: pytest.fail('spesifikasi divalidasi ulang'))
+
+    hasil = plotly.tools.return_figure_from_figure_or_data(CachedFigure(spec), validate_figure=True)
+    assert hasil is spec
+    assert json.loads(plotly.io.to_json(hasil, validate=False)) == spec
+
+
+@pytest.mark.parametrize('akses', [
+    lambda fig: fig.layout,
+    lambda fig: fig.update_layout(title='baru'),
+    lambda fig: fig.data,
+])
+def test_atribut_plotly_lain_memberi_error_jelas(akses):
+    fig = CachedFigure(json.loads(figure().to_json()))
+    with pytest.raises(AttributeError, match='CachedFigure hanya mendukung to_dict'):
+        akses(fig)
+
+
+def test_cached_figure_di_plotly_chart():
+    from streamlit.testing.v1 import AppTest
+
+    def script():
+        import json
+
+        import plotly.graph_objects as go
+        import streamlit as st
+
+        from core.figure_cache import CachedFigure
+
+        fig = go.Figure(go.Scatter(x=[1, 2, 3], y=[3, 1, 2]), layout={'title': 'uji'})
+        st.plotly_chart(CachedFigure(json.loads(fig.to_json())), key='cached')
+        st.plotly_chart(fig, key='asli')
+
+    at = AppTest.from_function(script).run()
+    assert not at.exception
+    cached, asli = (json.loads(el.proto.spec) for el in at.get('plotly_chart'))
+    assert cached == asli
+
+
+def test_get_or_build_hit_dan_miss(tmp_path):
+    cache = FigureCache(str(tmp_path))
+    dibangun = []
+
+    def buat():
+        dibangun.append(1)
+        return figure()
+
+    pertama = cache.get_or_build(('a', 1), buat)
+    kedua = cache.get_or_build(('a', 1), buat)
+    assert isinstance(kedua, CachedFigure)
+    assert kedua.to_dict() == pertama.to_dict()
+    assert len(dibangun) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Cache baru di folder yang sama memakai file yang sudah ada (setelah restart)
+    assert FigureCache(str(tmp_path)).get_or_build(('a', 1), buat).to_dict() == pertama.to_dict()
+    assert len(dibangun) == 1
+
+
+def test_eviction_menjaga_batas_ukuran(tmp_path):
+    ukuran = len(figure().to_json(validate=False))
+    cache = FigureCache(str(tmp_path), max_bytes=3 * ukuran)
+    for i in range(3):
+        cache.put(('fig', i), figure())
+        os.utime(cache.path(('fig', i)), (i, i))    # urutan terakhir dipakai: 0, 1, 2
+    os.utime(cache.path(('fig', 0)), (10, 10))     # fig 0 baru saja dipakai
+
+    cache.put(('fig', 3), figure())
+    assert cache.evictions == 1
+    assert cache.stats()['entri'] == 3
+    assert cache._bytes <= cache.max_bytes
+    assert cache.get(('fig', 1)) is None
+    assert all(cache.get(('fig', i)) is not None for i in (0, 2, 3))
+    assert sum(os.path.getsize(os.path.join(tmp_path, f)) for f in os.listdir(tmp_path)) <= cache.max_bytes
+
+
+def test_entri_lebih_besar_dari_batas_tetap_disimpan(tmp_path):
+    cache = FigureCache(str(tmp_path), max_bytes=1)
+    cache.put('a', figure())
+    cache.put('b', figure())
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from core.indicators import IndicatorEngine, IndicatorState, compute_arrays, label
+from core.panel import build_panel
+
+SPECS = [('sma', 20), ('ema', 12), ('rsi', 14), ('bollinger', 20, 2.0), ('atr', 14), ('vwap',)]
+
+
+@pytest.mark.parametrize('spec', SPECS, ids=lambda spec: label(spec)[0])
+def test_rolling_sama_dengan_batch(harga_adro, spec):
+    df = harga_adro.dropna(subset=['Open', 'High', 'Low', 'Close', 'Volume']).reset_index(drop=True)
+    arrays = {kolom: df[kolom].to_numpy(dtype=np.float64)[:, None] for kolom in ['Open', 'High', 'Low', 'Close', 'Volume']}
+    batch = compute_arrays(arrays, spec)
+
+    state = IndicatorState([spec])
+    baris = [state.update(bar) for bar in df[['Open', 'High', 'Low', 'Close', 'Volume']].to_dict('records')]
+    for nama in label(spec):
+        inkremental = np.array([b[nama] for b in baris])
+        np.testing.assert_array_equal(np.isnan(inkremental), np.isnan(batch[nama][:, 0]), err_msg=nama)
+        np.testing.assert_allclose(inkremental, batch[nama][:, 0], rtol=1e-7, atol=1e-6, equal_nan=True, err_msg=nama)
+
+
+def test_atr_bar_pertama_memakai_high_low():
+    state = IndicatorState([('atr', 1)])
+    assert state.update({'Open': 10, 'High': 12, 'Low': 9, 'Close': 11, 'Volume': 1})['ATR1'] == 3
+
+
+@pytest.mark.parametrize('urutan', ['penuh-dulu', 'potongan-dulu'])
+def test_memo_panel_penuh_dan_potongan_terpisah(ohlcv_sintetis, urutan):
+    panel = build_panel({'A': ohlcv_sintetis(300), 'B': ohlcv_sintetis(300, seed=1)})
+    potongan = panel.slice(panel.index[100])
+    engine = IndicatorEngine()
+    urutan_panel = [panel, potongan] if urutan == 'penuh-dulu' else [potongan, panel]
+    hasil = {id(p): engine.compute(p, [('sma', 20)])['SMA20'] for p in urutan_panel}
+
+    for p in (panel, potongan):
+        harapan = IndicatorEngine().compute(p, [('sma', 20)])['SMA20']
+        assert hasil[id(p)].index.equals(p.index)
+        np.testing.assert_array_equal(hasil[id(p)], harapan)
+    # Rentang lewat start memakai histori penuh: tanpa warm-up di awal rentang
+    rentang = engine.compute(panel, [('sma', 20)], start=panel.index[100])['SMA20']
+    assert rentang.index.equals(potongan.index) and rentang.notna().all().all()
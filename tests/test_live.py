@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from core.indicators import IndicatorState
+from core.live import OHLCV, LiveChart, LiveStream, RingBuffer
+
+
+def bars(n, mulai='2024-06-03 09:00'):
+    """n bar 1 menit dengan Close 1, 2, ..., n"""
+    close = np.arange(1, n + 1, dtype=np.float64)
+    return pd.DataFrame({'Date': pd.date_range(mulai, periods=n, freq='1min'),
+                         'Open': close, 'High': close + 1, 'Low': close - 0.5, 'Close': close, 'Volume': 10.0})
+
+
+def test_ring_buffer_menimpa_bar_terlama():
+    buffer = RingBuffer(3, ['Close'])
+    df = bars(5)
+    for waktu, close in zip(df['Date'], df['Close']):
+        buffer.append(waktu, [close])
+
+    assert len(buffer) == 3 and buffer.count == 5
+    assert buffer.last_time() == df['Date'].iloc[-1]
+    assert buffer.since()['Close'].tolist() == [3, 4, 5]
+    assert list(buffer.since().index) == list(df['Date'].iloc[2:])
+    assert buffer.since(4)['Close'].tolist() == [5]
+    assert buffer.since(1)['Close'].tolist() == [3, 4, 5]     # bar 1 sudah tertimpa
+    assert buffer.since(5).empty
+
+
+def test_ingest_melewati_bar_lama_dan_memori_tetap():
+    stream = LiveStream(lambda tickers, since: {}, ['ADRO'], specs=[('sma', 3)], capacity=4)
+    nbytes = stream.nbytes()
+    df = bars(10)
+    assert stream.ingest('ADRO', df.iloc[:6]) == 6
+    assert stream.ingest('ADRO', df.iloc[4:]) == 4
+
+    frame, seq = stream.since('ADRO')
+    assert seq == 10
+    assert frame['Close'].tolist() == [7, 8, 9, 10]
+    assert frame['SMA3'].tolist() == [6, 7, 8, 9]
+    assert stream.nbytes() == nbytes
+
+
+def test_indikator_sama_dengan_state_inkremental():
+    df = bars(30)
+    stream = LiveStream(lambda tickers, since: {}, ['ADRO'], capacity=50)
+    stream.ingest('ADRO', df)
+
+    state = IndicatorState(stream.specs)
+    harapan = pd.DataFrame([state.update(bar) for bar in df[OHLCV].to_dict('records')])
+    frame = stream.frame('ADRO')
+    np.testing.assert_allclose(frame[harapan.columns].to_numpy(), harapan.to_numpy(), equal_nan=True)
+
+
+def test_poll_meminta_bar_sejak_bar_terakhir():
+    df = bars(5)
+    permintaan = []
+
+    def fetch(tickers, since):
+        permintaan.append(dict(since))
+        mulai = since['ADRO']
+        return {'ADRO': df if mulai is None else df[df['Date'] > mulai]}
+
+    waktu = [0.0]
+    stream = LiveStream(fetch, ['ADRO'], specs=[], refresh=60, clock=lambda: waktu[0])
+    assert stream.poll_if_due() == {'ADRO': 5}
+    assert stream.poll_if_due() == {}           # belum 60 detik
+    waktu[0] = 60.0
+    assert stream.poll_if_due() == {'ADRO': 0}
+    assert permintaan == [{'ADRO': None}, {'ADRO': df['Date'].iloc[-1]}]
+
+
+def test_poll_gagal_dicatat_tanpa_exception():
+    def fetch(tickers, since):
+        raise ConnectionError('offline')
+
+    stream = LiveStream(fetch, ['ADRO'], specs=[])
+    assert stream.poll() == {}
+    assert stream.last_error == 'offline'
+    assert stream.frame('ADRO').empty
+
+
+def test_vwap_dimulai_ulang_setiap_sesi():
+    stream = LiveStream(lambda tickers, since: {}, ['ADRO'], specs=[('vwap',), ('sma', 3)])
+    kemarin, hari_ini = bars(3, '2024-06-03 15:57'), bars(3, '2024-06-04 09:00')
+    hari_ini[['High', 'Low', 'Close']] += 100
+    stream.ingest('ADRO', pd.concat([kemarin, hari_ini], ignore_index=True))
+
+    frame = stream.frame('ADRO')
+    tipikal = (hari_ini['High'] + hari_ini['Low'] + hari_ini['Close']) / 3
+    assert frame['VWAP'].iloc[3] == tipikal.iloc[0]
+    assert frame['VWAP'].iloc[-1] == tipikal.mean()
+    assert frame['SMA3'].iloc[3] == (2 + 3 + 101) / 3     # indikator lain berlanjut lintas sesi
+
+
+def test_live_chart_hanya_menambah_bar_baru():
+    stream = LiveStream(lambda tickers, since: {}, ['ADRO'], specs=[('sma', 2)], capacity=4)
+    chart = LiveChart(stream, 'ADRO', ['SMA2', 'TIDAK_ADA'])
+    assert chart.indikator == ['SMA2'] and not chart.update()
+
+    df = bars(6)
+    stream.ingest('ADRO', df.iloc[:3])
+    assert chart.update()
+    spec = chart.spec
+    assert chart.spec is spec and not chart.update() and chart.spec is spec
+
+    stream.ingest('ADRO', df.iloc[3:])
+    assert chart.update()
+    candle, sma = chart.spec['data']
+    assert len(chart) == 4 and candle['close'] == [3, 4, 5, 6]
+    assert sma['y'] == [2.5, 3.5, 4.5, 5.5]
+    assert chart.last_time == candle['x'][-1] == '2024-06-03T09:05:00'
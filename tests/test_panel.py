@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.panel import FILL_FFILL, build_panel
+from core.periode import range_slice
+
+
+@pytest.fixture
+def frames():
+    """Dua emiten dengan kalender berbeda: B mulai belakangan dan libur di hari ketiga A"""
+    a = pd.DataFrame({'Date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']),
+                      'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': [10.0, 11.0, 12.0, 13.0], 'Volume': 5.0})
+    b = pd.DataFrame({'Date': pd.to_datetime(['2024-01-02', '2024-01-04', '2024-01-05']),
+                      'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': [20.0, 21.0, 22.0], 'Volume': 7.0})
+    return {'A': a, 'B': b}
+
+
+def test_kalender_gabungan_sejajar_per_tanggal(frames):
+    panel = build_panel(frames)
+    assert list(panel.index) == list(pd.date_range('2024-01-01', '2024-01-05'))
+    close = panel.field('Close')
+    np.testing.assert_array_equal(close['A'], [10, 11, 12, 13, np.nan])
+    np.testing.assert_array_equal(close['B'], [np.nan, 20, np.nan, 21, 22])
+    pd.testing.assert_frame_equal(panel.ticker('B'), frames['B'], check_dtype=False)
+
+
+def test_ffill_harga_dan_volume_nol(frames):
+    panel = build_panel(frames, fill=FILL_FFILL)
+    np.testing.assert_array_equal(panel.field('Close')['B'], [np.nan, 20, 20, 21, 22])
+    np.testing.assert_array_equal(panel.field('Volume')['B'], [np.nan, 7, 0, 7, 7])
+    assert panel.with_fill('none').with_fill(FILL_FFILL) is panel
+
+
+def test_slice_inklusif_dan_tanpa_salinan(frames):
+    panel = build_panel(frames)
+    potong = panel.slice('2024-01-02', '2024-01-04')
+    assert list(potong.index) == list(pd.date_range('2024-01-02', '2024-01-04'))
+    assert np.shares_memory(potong.arrays['Close'], panel.arrays['Close'])
+    assert len(panel.slice('2024-02-01')) == 0
+
+
+@pytest.mark.parametrize('start, end', [
+    (None, None), ('2024-01-03', None), (None, '2024-01-03'),
+    ('2024-01-02 12:00', '2024-01-04'), ('2023-01-01', '2023-12-31'), ('2024-01-04', '2024-01-02'),
+])
+def test_range_slice_sama_dengan_mask(start, end):
+    dates = pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-02', '2024-01-03', '2024-01-05'])
+    mask = np.ones(len(dates), dtype=bool)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    np.testing.assert_array_equal(np.arange(len(dates))[range_slice(dates, start, end)], np.flatnonzero(mask))
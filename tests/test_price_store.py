@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.price_store as price_store
+from core.price_store import MAX_SEGMENTS, PriceStore, parse_price_csv
+
+
+@pytest.fixture
+def csv_harga(tmp_path, ohlcv_sintetis):
+    """Tulis CSV OHLCV sintetis; buat(nama='x_fix.csv', n=200, folder=tmp_path)"""
+    def buat(nama='x_fix.csv', n=200, folder=tmp_path, seed=0):
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / nama
+        ohlcv_sintetis(n, seed=seed).to_csv(path, index=False)
+        return str(path)
+    return buat
+
+
+def sama_dengan_csv(df, source):
+    """Isi dan tipe kolom sama dengan hasil parse CSV (array memory-map dibandingkan sebagai ndarray)"""
+    harapan = parse_price_csv(source)
+    assert list(df.columns) == list(harapan.columns)
+    for col in harapan:
+        assert df[col].dtype == harapan[col].dtype, col
+        np.testing.assert_array_equal(np.asarray(df[col]), harapan[col].to_numpy(), err_msg=col)
+
+
+def bar_baru(df, n, mulai=None):
+    """n bar hari kerja setelah bar terakhir df"""
+    tanggal = pd.bdate_range(mulai or df['Date'].iloc[-1] + pd.offsets.BDay(), periods=n)
+    return pd.DataFrame({'Date': tanggal, 'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 100})
+
+
+def test_load_sama_dengan_csv(tmp_path, csv_harga):
+    source = csv_harga()
+    df = PriceStore(tmp_path / 'store').load(source)
+    sama_dengan_csv(df, source)
+
+
+def test_append_hanya_bar_setelah_bar_terakhir(tmp_path, csv_harga):
+    source = csv_harga()
+    store = PriceStore(tmp_path / 'store')
+    awal = store.load(source)
+
+    bars = pd.concat([awal.tail(3), bar_baru(awal, 5)], ignore_index=True)
+    assert store.append(source, bars) == 5
+    assert store.append(source, bars) == 0
+
+    df = store.load(source)
+    assert len(df) == len(awal) + 5
+    assert df['Date'].is_monotonic_increasing
+    assert store.last_date(source) == bars['Date'].iloc[-1]
+    assert len(store.read_meta(source)['segments']) == 2
+
+
+def test_compaction_menjadi_satu_segmen(tmp_path, csv_harga):
+    source = csv_harga()
+    store = PriceStore(tmp_path / 'store')
+    for i in range(MAX_SEGMENTS):
+        store.append(source, bar_baru(store.load(source), 1))
+        assert len(store.read_meta(source)['segments']) == (i + 2 if i + 2 <= MAX_SEGMENTS else 1)
+
+    meta = store.read_meta(source)
+    assert meta['segments'] == [meta['version']]
+    assert meta['rows'] == 200 + MAX_SEGMENTS
+    df = store.load(source)
+    assert len(df) == meta['rows']
+    assert df['Date'].is_unique and df['Date'].is_monotonic_increasing
+
+
+def test_volume_diperlebar_saat_tidak_muat(tmp_path, csv_harga):
+    source = csv_harga()
+    store = PriceStore(tmp_path / 'store')
+    bars = bar_baru(store.load(source), 2)
+    bars['Volume'] = 2 ** 40
+    store.append(source, bars)
+
+    df = store.load(source)
+    assert df['Volume'].dtype == np.uint64
+    assert df['Volume'].iloc[-1] == 2 ** 40
+
+
+def test_csv_bernama_sama_tidak_berbagi_store(tmp_path, csv_harga):
+    a = csv_harga(folder=tmp_path / 'a', seed=1)
+    b = csv_harga(folder=tmp_path / 'b', seed=2)
+    store = PriceStore(tmp_path / 'store')
+
+    sama_dengan_csv(store.load(a), a)
+    sama_dengan_csv(store.load(b), b)
+    assert store.is_fresh(a) and store.is_fresh(b)
+    assert store.version(a) != store.version(b)
+
+
+def test_hash_sumber_tidak_dihitung_ulang_saat_append(tmp_path, csv_harga, monkeypatch):
+    source = csv_harga()
+    store = PriceStore(tmp_path / 'store')
+    store.ensure(source)
+
+    dipanggil = []
+    monkeypatch.setattr(price_store, 'hash_file', lambda path: dipanggil.append(path))
+    for _ in range(MAX_SEGMENTS + 1):
+        store.append(source, bar_baru(store.load(source), 1))
+    assert dipanggil == []
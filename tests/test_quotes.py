@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from core.quotes import QuoteService, concurrent_fetcher
+
+
+def ohlcv(close):
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 10})
+
+
+def test_fallback_awal_bulan_memakai_tanggal_satu():
+    panggilan = []
+
+    def fetcher(tickers, period='1d', start=None):
+        panggilan.append((tuple(tickers), period, start))
+        if start is not None:
+            return {kode: ohlcv([80.0, 90.0]) for kode in tickers}
+        return {kode: ohlcv([100.0]) for kode in tickers}
+
+    service = QuoteService(fetcher, month_start_price=lambda kode, awal: 50.0 if kode == 'ADRO' else None)
+    quotes = service.get_quotes(['ADRO', 'PTBA'])
+
+    awal_bulan = pd.Timestamp.now().normalize().replace(day=1)
+    assert panggilan == [(('ADRO', 'PTBA'), '1d', None), (('PTBA',), '1d', awal_bulan)]
+    assert quotes['ADRO']['perubahan'] == pytest.approx(100)
+    assert quotes['PTBA']['perubahan'] == pytest.approx(25)
+
+
+def test_concurrent_fetcher_meneruskan_start():
+    diminta = []
+
+    def fetch_one(kode, period, start=None):
+        diminta.append((kode, period, start))
+        return ohlcv([1.0])
+
+    concurrent_fetcher(fetch_one, max_workers=2)(['ADRO'], start='2024-06-01')
+    assert diminta == [('ADRO', '1d', '2024-06-01')]
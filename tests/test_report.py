@@ -0,0 +1,22 @@
+import pandas as pd
+
+from core.report import potong_bertingkat, urutkan_periode
+
+
+def test_tanggal_acuan_menjadi_batas_akhir_semua_periode():
+    rentang = dict(urutkan_periode(['1mo', 'max', '1y'], now='2024-06-01'))
+    assert rentang == {
+        'max': (None, pd.Timestamp('2024-06-01')),
+        '1y': (pd.Timestamp('2023-06-01'), pd.Timestamp('2024-06-01')),
+        '1mo': (pd.Timestamp('2024-05-01'), pd.Timestamp('2024-06-01')),
+    }
+    assert [period for period, _ in urutkan_periode(['1mo', 'max', '1y'])] == ['max', '1y', '1mo']
+    assert all(end is None for _, (_, end) in urutkan_periode(['max', '1y']))
+
+
+def test_potong_bertingkat_tanpa_data_sesudah_tanggal_acuan():
+    frame = pd.DataFrame({'x': range(500)}, index=pd.date_range('2023-06-01', periods=500))
+    potongan = potong_bertingkat(frame, urutkan_periode(['max', '1mo'], now='2024-06-01'))
+    assert potongan['max'].index[-1] == pd.Timestamp('2024-06-01')
+    assert potongan['1mo'].index[0] == pd.Timestamp('2024-05-01')
+    assert potongan['1mo'].index[-1] == pd.Timestamp('2024-06-01')
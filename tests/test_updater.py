@@ -0,0 +1,56 @@
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from core.price_store import PriceStore
+from core.updater import HistoryUpdater, bar_selesai, csv_history_source, yahoo_history_source
+
+
+def harian(tanggal):
+    return pd.DataFrame({'Date': pd.to_datetime(tanggal), 'Open': 1.0, 'High': 2.0, 'Low': 0.5,
+                         'Close': 1.5, 'Adj Close': 1.5, 'Volume': 100})
+
+
+@pytest.mark.parametrize('jam, jumlah', [('09:30', 2), ('16:00', 2), ('16:15', 3), ('20:00', 3)])
+def test_bar_hari_ini_dibuang_sebelum_bursa_tutup(jam, jumlah):
+    bars = harian(['2024-06-05', '2024-06-06', '2024-06-07'])
+    assert len(bar_selesai(bars, now=pd.Timestamp(f'2024-06-07 {jam}'))) == jumlah
+
+
+def test_yahoo_memakai_tanggal_bursa_jakarta(monkeypatch):
+    # Yahoo mengirim bar harian .JK pada tengah malam WIB (17:00 UTC hari sebelumnya)
+    index = pd.DatetimeIndex(['2024-06-05', '2024-06-06'], name='Date').tz_localize('Asia/Jakarta')
+    hist = harian(index.tz_localize(None)).drop(columns='Date').set_index(index)
+
+    class Ticker:
+        def __init__(self, symbol):
+            assert symbol == 'ADRO.JK'
+
+        def history(self, start, auto_adjust):
+            assert start == '2024-06-01'
+            return hist
+
+    monkeypatch.setitem(sys.modules, 'yfinance', types.SimpleNamespace(Ticker=Ticker))
+    hasil = yahoo_history_source('ADRO', pd.Timestamp('2024-06-01'))
+    assert hasil['Date'].tolist() == [pd.Timestamp('2024-06-05'), pd.Timestamp('2024-06-06')]
+
+
+def test_update_menambahkan_bar_baru_ke_store(tmp_path):
+    source = tmp_path / 'adro_fix.csv'
+    harian(pd.bdate_range('2024-01-01', periods=20)).to_csv(source, index=False)
+    baru = tmp_path / 'baru.csv'
+    harian(pd.bdate_range('2024-01-20', periods=10)).to_csv(baru, index=False)
+
+    store = PriceStore(tmp_path / 'store')
+    diperbarui = []
+    updater = HistoryUpdater(store, {'ADRO': str(source)}, csv_history_source({'ADRO': baru}),
+                             on_update=diperbarui.append)
+    hasil = updater.update_all()
+
+    # Sumber baru tumpang tindih 22-26 Januari; hanya 29 Januari - 2 Februari yang ditambahkan
+    assert hasil == {'ADRO': 5}
+    assert diperbarui == [hasil]
+    assert store.last_date(str(source)) == pd.Timestamp('2024-02-02')
+    assert updater.update_all() == {'ADRO': 0}